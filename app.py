@@ -8,16 +8,20 @@ st.set_page_config(
 
 import pandas as pd
 import os
+import time
 from datetime import datetime, timedelta
 import json
-from PIL import Image
 import io
-import uuid
-import matplotlib.pyplot as plt
-import plotly.express as px
+import functools
+import plotly.io as pio
 from pathlib import Path
 import db
 import utils
+import evidence_hash
+import device_ingest
+import attachments
+import export_jobs
+import metrics
 
 # 상수 설정
 CONFIG_FILE = Path("config.json")
@@ -72,10 +76,24 @@ def save_config(config):
 if "config" not in st.session_state:
     st.session_state.config = load_config()
 
+@st.cache_resource
+def start_background_services():
+    """프로세스당 1회만 실행되는 백그라운드 작업 시작"""
+    db.start_maintenance_scheduler()
+    if db.READ_REPLICA_ENABLED:
+        db.start_read_replica()
+    export_jobs.recover_interrupted_jobs()
+    if metrics.METRICS_ENABLED:
+        metrics.start_metrics_server()
+    return True
+
+start_background_services()
+
 # 전역 상수
 CATEGORIES = ["A", "B", "C"]
 CATEGORY_LABELS = {"A": "매출 관련 업무", "B": "내부업무", "C": "사건처리"}
 STATUS_OPTIONS = ["진행 중", "완료", "미완료"]
+NAME_OPTIONS = ["신용학", "김경태", "박종찬", "이서영", "유다정", "임기택"]
 
 def main():
     """메인 함수"""
@@ -83,26 +101,100 @@ def main():
         st.title("📝 디지털포렌식 업무 기록")
         menu = st.radio(
             "메뉴",
-            ["📥 일일 업무 입력", "📋 일일 취합 보고", "🗂️ 사건 입력", "🗂️ 사건 관리", "📊 업무 기록"],
+            ["📥 일일 업무 입력", "📋 일일 취합 보고", "🗂️ 사건 입력", "🗂️ 사건 관리", "📊 업무 기록", "📈 통계", "🕒 근무시간",
+             "📤 내보내기 작업", "🛠️ DB 관리"],
             key="menu_radio"
         )
 
-    # 라디오 버튼 값(menu)으로 바로 분기
-    if menu == "📥 일일 업무 입력":
-        show_daily_work_input()
-    elif menu == "📋 일일 취합 보고":
-        show_daily_report()
-    elif menu == "🗂️ 사건 입력":
-        show_case_input()
-    elif menu == "🗂️ 사건 관리":
-        show_case_manage()
-    elif menu == "📊 업무 기록":
-        show_work_category_form()
+    # 전체 화면을 다시 실행하는 중이므로 fragment에서 요청한 전체 갱신은 필요 없음
+    st.session_state.pop("rerun_app_requested", None)
+    # 내보내기 작업 화면을 떠나면 받아 둔 파일 내용도 버림
+    if menu != "📤 내보내기 작업":
+        st.session_state.pop("export_download", None)
+
+    db.begin_query_trace(menu)
+
+    # 이번 실행의 SQL 추적이 진행 중임을 표시 (fragment만 다시 실행되는 경우와 구분)
+    st.session_state.query_trace_running = True
+    try:
+        # 라디오 버튼 값(menu)으로 바로 분기
+        with metrics.page_render(menu):
+            if menu == "📥 일일 업무 입력":
+                show_daily_work_input()
+            elif menu == "📋 일일 취합 보고":
+                show_daily_report()
+            elif menu == "🗂️ 사건 입력":
+                show_case_input()
+            elif menu == "🗂️ 사건 관리":
+                show_case_manage()
+            elif menu == "📊 업무 기록":
+                show_work_category_form()
+            elif menu == "📈 통계":
+                show_statistics()
+            elif menu == "🕒 근무시간":
+                show_timesheet()
+            elif menu == "📤 내보내기 작업":
+                show_export_jobs()
+            elif menu == "🛠️ DB 관리":
+                show_db_admin()
+    finally:
+        st.session_state.query_trace_running = False
+
+    if db.QUERY_TRACE_ENABLED:
+        show_query_trace_panel()
+
+def show_query_trace_panel(container=None):
+    """이번 화면 실행에서 실행된 SQL 목록과 총 DB 시간 (기본값은 사이드바 디버그 패널)"""
+    queries = pd.DataFrame(db.get_query_trace())
+    with (container or st.sidebar).expander("🔍 SQL 추적", expanded=False):
+        if queries.empty:
+            st.caption("이번 실행에서 실행된 SQL이 없습니다. (캐시된 조회는 표시되지 않습니다)")
+            return
+
+        col1, col2 = st.columns(2)
+        col1.metric("SQL 수", f"{len(queries):,}")
+        col2.metric("DB 시간", f"{queries['duration_ms'].sum():,.1f} ms")
+
+        by_caller = (
+            queries.groupby("caller", dropna=False)
+            .agg(횟수=("sql", "size"), 시간_ms=("duration_ms", "sum"), 행수=("rows", "sum"))
+            .sort_values("시간_ms", ascending=False)
+        )
+        st.caption("db 함수별 합계")
+        st.dataframe(by_caller.round(1), use_container_width=True)
+
+        st.caption("실행 순서")
+        st.dataframe(
+            queries[["started_at", "caller", "duration_ms", "rows", "param_count", "sql"]].round(1),
+            use_container_width=True, hide_index=True
+        )
+        st.caption(f"{db.SLOW_QUERY_MS:g} ms 이상 걸린 SQL은 실행 계획과 함께 {db.SLOW_QUERY_LOG_PATH}에 기록됩니다.")
+
+def _trace_fragment(func):
+    """
+    fragment만 다시 실행될 때 SQL 추적을 새로 시작하고 결과를 fragment 안에 표시
+    
+    전체 화면이나 바깥 fragment 실행 중에는 이미 시작한 추적 기록에 그대로 더합니다.
+    (fragment 안에서는 사이드바에 그릴 수 없어 fragment 아래쪽에 표시)
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not db.QUERY_TRACE_ENABLED or st.session_state.get("query_trace_running"):
+            return func(*args, **kwargs)
+        db.begin_query_trace(f"{st.session_state.get('menu_radio')} ({func.__name__})")
+        st.session_state.query_trace_running = True
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            st.session_state.query_trace_running = False
+        show_query_trace_panel(st.container())
+        return result
+    return wrapper
 
 def show_daily_work_input():
     """일일 업무 입력 폼 표시"""
     st.header("📥 일일 업무 입력")
-    name_options = ["신용학", "김경태", "박종찬", "이서영", "유다정", "임기택"]
+    name_options = NAME_OPTIONS
 
     업무_템플릿 = "A. 매출 관련 업무\n\nB. 내부업무\n\nC. 사건처리\n"
 
@@ -134,10 +226,20 @@ def show_daily_work_input():
 def show_daily_report():
     """일일 취합 보고 화면"""
     st.header("📋 일일 취합 보고")
+    mode = st.radio("보기", ["일별 보고", "기간 취합", "제출 현황"], horizontal=True, key="daily_report_mode")
+    if mode == "기간 취합":
+        show_daily_rollup()
+    elif mode == "제출 현황":
+        show_submission_status()
+    else:
+        show_daily_report_of_date()
+
+def show_daily_report_of_date():
+    """한 날짜의 작성자별 일일 업무 취합"""
     report_date = st.date_input("보고 날짜", datetime.now(), key="report_date")
     report_date_str = report_date.strftime("%Y-%m-%d")
-    df = db.get_daily_works(date=report_date_str)
-    name_options = ["신용학", "김경태", "박종찬", "이서영", "유다정", "임기택"]
+    df = db.get_daily_works(date=report_date_str, use_replica=True)
+    name_options = NAME_OPTIONS
     if df.empty:
         st.info("해당 날짜에 입력된 업무가 없습니다.")
         return
@@ -167,20 +269,9 @@ def show_daily_report():
                 txt_lines.append("❌ 미입력")
             txt_lines.append("")  # 한 줄 띄우기
         st.text_area("전체 복사용 텍스트", value="\n".join(txt_lines), height=400)
-    # 아래에는 이름별로 고정 순서로 업무/미입력 표시
+    # 아래에는 이름별로 고정 순서로 업무/미입력 표시 (작성자별 fragment)
     for 이름 in name_options:
-        st.write(f"[{이름}]")
-        if 이름 in 입력자_집합:
-            for row in df[df["name"] == 이름].itertuples():
-                col1, col2 = st.columns([8, 1])
-                with col1:
-                    st.text(f"{row.content}")
-                with col2:
-                    if st.button("삭제", key=f"delete_{row.id}"):
-                        db.delete_daily_work(row.id)
-                        st.rerun()
-        else:
-            st.markdown(":gray[❌ 미입력]")
+        show_daily_works_of(이름, report_date_str)
         st.write("--------------------")
     st.subheader("보고서 다운로드")
     # BytesIO 버퍼에 엑셀 저장
@@ -196,6 +287,158 @@ def show_daily_report():
         key="download_report_btn"
     )
 
+def show_daily_rollup():
+    """기간(주간/월간) 일일 업무 취합 - 복사용 텍스트와 그룹별 시트 Excel"""
+    today = datetime.now()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("시작일", today - timedelta(days=today.weekday()), key="rollup_start_date")
+    with col2:
+        end_date = st.date_input("종료일", today, key="rollup_end_date")
+    with col3:
+        group_label = st.radio("Excel 시트 구분", ["작성자별", "주별"], horizontal=True, key="rollup_group_by")
+    
+    if start_date > end_date:
+        st.warning("시작일이 종료일보다 늦습니다.")
+        return
+    
+    start_str, end_str = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    group_by = "name" if group_label == "작성자별" else "week"
+    signature = (start_str, end_str, group_by)
+    
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("취합 생성", key="build_rollup"):
+            with st.spinner("취합 중..."):
+                rows = db.iter_daily_works(start_str, end_str, order_by=group_by)
+                st.session_state.daily_rollup = (signature, utils.create_daily_rollup(rows, group_by))
+    with col2:
+        # 기간이 길면 화면을 막지 않도록 내보내기 작업으로 Excel만 생성
+        if st.button("백그라운드로 Excel 생성", key="build_rollup_job"):
+            _submit_export_job("daily_rollup", {"start": start_str, "end": end_str, "group_by": group_by})
+    
+    # 조건이 바뀌기 전에 만든 결과만 표시
+    rollup = st.session_state.get("daily_rollup")
+    if not rollup or rollup[0] != signature:
+        return
+    
+    text, excel_data, row_count = rollup[1]
+    if row_count == 0:
+        st.info("해당 기간에 입력된 업무가 없습니다.")
+        return
+    
+    st.caption(f"{start_str} ~ {end_str}, 총 {row_count:,}건")
+    st.text_area("전체 복사용 텍스트", value=text, height=400)
+    st.download_button(
+        label="Excel로 다운로드",
+        data=excel_data,
+        file_name=f"daily_rollup_{start_str}_{end_str}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key="rollup_download"
+    )
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _submission_matrix(generation, start_date, end_date, holidays):
+    """
+    제출 현황 행렬을 기간·공휴일 목록별로 캐시
+    
+    generation(DB 변경 카운터)이 캐시 키에 포함되므로 데이터가 바뀌면 새로 계산됩니다.
+    """
+    metrics.CACHE_MISSES.inc(cache="submission_matrix")
+    submissions = db.get_daily_work_submissions(start_date, end_date)
+    return utils.build_submission_matrix(submissions, start_date, end_date, NAME_OPTIONS, holidays)
+
+def _on_save_holidays():
+    """공휴일 목록 '저장' 버튼 콜백 - 날짜 형식이 맞는 줄만 config.json에 저장"""
+    lines = st.session_state.holidays_text.splitlines()
+    holidays = sorted({utils.get_date_ymd(line.strip()) for line in lines} - {None})
+    st.session_state.config["공휴일"] = holidays
+    save_config(st.session_state.config)
+    st.session_state.holidays_text = "\n".join(holidays)
+
+def show_submission_status():
+    """기간 내 직원 × 영업일 일일 업무 제출 현황"""
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("시작일", datetime.now() - timedelta(days=30), key="submission_start_date")
+    with col2:
+        end_date = st.date_input("종료일", datetime.now(), key="submission_end_date")
+    
+    holidays = tuple(st.session_state.config.get("공휴일", []))
+    with st.expander(f"공휴일 설정 ({len(holidays)}일)"):
+        if "holidays_text" not in st.session_state:
+            st.session_state.holidays_text = "\n".join(holidays)
+        st.text_area("공휴일 (한 줄에 하나, YYYY-MM-DD)", key="holidays_text", height=150)
+        st.button("저장", key="save_holidays", on_click=_on_save_holidays)
+    
+    if start_date > end_date:
+        st.warning("시작일이 종료일보다 늦습니다.")
+        return
+    
+    start_str, end_str = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    metrics.CACHE_REQUESTS.inc(cache="submission_matrix")
+    matrix = _submission_matrix(db.get_change_counter(), start_str, end_str, holidays)
+    if matrix.shape[1] == 0:
+        st.info("해당 기간에 영업일이 없습니다.")
+        return
+    
+    st.subheader("직원별 요약")
+    st.dataframe(utils.summarize_submissions(matrix), use_container_width=True)
+    
+    st.subheader("날짜별 제출 현황")
+    display_df = utils.format_submission_matrix(matrix)
+    st.dataframe(display_df, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="CSV로 다운로드",
+            data=display_df.to_csv().encode("utf-8-sig"),
+            file_name=f"daily_submissions_{start_str}_{end_str}.csv",
+            mime="text/csv",
+            key="submission_csv_download"
+        )
+    with col2:
+        st.download_button(
+            label="Excel로 다운로드",
+            data=utils.create_submission_excel(matrix),
+            file_name=f"daily_submissions_{start_str}_{end_str}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="submission_excel_download"
+        )
+
+def _request_app_rerun():
+    """fragment 밖에 그린 내용도 바뀌는 콜백에서 호출 - 다음 fragment 실행 때 전체 화면을 다시 실행"""
+    st.session_state.rerun_app_requested = True
+
+def _rerun_app_if_requested():
+    if st.session_state.pop("rerun_app_requested", False):
+        st.rerun(scope="app")
+
+def _on_delete_daily_work(work_id):
+    """일일 업무 '삭제' 버튼 콜백"""
+    db.delete_daily_work(work_id)
+    # 상단 입력 완료 목록, 복사용 텍스트, Excel 다운로드도 삭제를 반영해야 함
+    _request_app_rerun()
+
+@st.fragment
+@_trace_fragment
+def show_daily_works_of(name, report_date_str):
+    """작성자 한 명의 일일 업무 목록 (fragment - 삭제하면 화면 전체를 다시 실행)"""
+    _rerun_app_if_requested()
+    st.write(f"[{name}]")
+    works_df = db.get_daily_works(date=report_date_str, name=name, use_replica=True)
+    if works_df.empty:
+        st.markdown(":gray[❌ 미입력]")
+        return
+    
+    for row in works_df.itertuples():
+        col1, col2 = st.columns([8, 1])
+        with col1:
+            st.text(f"{row.content}")
+        with col2:
+            st.button("삭제", key=f"delete_{row.id}", on_click=_on_delete_daily_work, args=(row.id,))
+
 def show_case_input():
     """사건 입력 폼 표시"""
     st.header("🗂️ 사건 입력")
@@ -234,18 +477,46 @@ def show_case_input():
             start_date = st.date_input("시작일", datetime.now())
             end_date = st.date_input("종료일", None, disabled=True if status != "완료" else False)
             
+        # 저장 전에 찾은 비슷한 사건 (확인 후 '그래도 저장'으로 등록)
+        pending = st.session_state.get("case_duplicate_pending")
+        if pending:
+            st.warning("비슷한 사건이 이미 등록되어 있습니다. 중복 등록이 아니면 '그래도 저장'을 누르세요.")
+            similar_df = pending["similar"].copy()
+            similar_df["similarity"] = (similar_df["similarity"] * 100).round().astype(int).astype(str) + "%"
+            st.dataframe(
+                similar_df.rename(columns={
+                    "id": "ID", "title": "사건명", "client": "의뢰인", "manager": "담당자",
+                    "status": "상태", "start_date": "시작일", "similarity": "유사도"
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+        
         submit_button = st.form_submit_button("저장")
+        confirm_button = st.form_submit_button("그래도 저장") if pending else False
         
-        if submit_button:
+        if submit_button or confirm_button:
             if not title or not manager:
                 st.error("사건명과 담당자는 필수 입력 항목입니다.")
             else:
+                # 확인한 내용 그대로 '그래도 저장'을 누른 경우가 아니면 저장 전에 비슷한 사건 검색
+                input_key = (title, client, description)
+                confirmed = confirm_button and pending["key"] == input_key
+                similar_df = None if confirmed else db.find_similar_cases(title, client, description)
+                if similar_df is not None and not similar_df.empty:
+                    st.session_state.case_duplicate_pending = {"key": input_key, "similar": similar_df}
+                    st.rerun()
+                
+                st.session_state.pop("case_duplicate_pending", None)
+                
                 # 사건 정보 저장
                 result = db.add_case(title, manager, client, case_type, status, description, start_date.strftime("%Y-%m-%d"), 
                                      end_date.strftime("%Y-%m-%d") if end_date and status == "완료" else None)
                 
                 if result:
-                    st.success("사건 정보가 저장되었습니다.")
+                    # 확인용으로 표시했던 비슷한 사건 목록을 지우도록 다시 실행해 저장 알림 표시
+                    st.session_state.case_saved = True
+                    st.rerun()
                 else:
                     st.error("사건 정보 저장 중 오류가 발생했습니다.")
 
@@ -253,8 +524,16 @@ def show_case_manage():
     """사건 관리 화면 표시"""
     st.header("🗂️ 사건 관리")
     
+    # 보관 DB로 옮긴 사건은 요청할 때만 함께 조회
+    include_archive = st.checkbox("보관된 사건 포함", value=False, key="include_archived_cases")
+    
+    # 여러 사건/작업/장비를 한 번에 수정하는 편집 그리드
+    if st.toggle("일괄 수정 모드", key="bulk_edit_mode"):
+        show_bulk_edit()
+        return
+    
     # 사건 목록 가져오기
-    df = db.get_cases()
+    df = db.get_cases(include_archive=include_archive)
     
     if df.empty:
         st.info("등록된 사건이 없습니다.")
@@ -289,349 +568,965 @@ def show_case_manage():
         st.warning("조건에 맞는 사건이 없습니다.")
         return
     
-    # 사건별 확장 패널 표시
+    show_dossier_export(filtered_df, include_archive)
+    
+    # 사건별 확장 패널 표시 (패널 내용은 사건별 fragment로 분리되어 해당 사건만 다시 그려짐)
     for i, row in filtered_df.iterrows():
-        case_id = row['id']
+        case_id = int(row['id'])
+        # 보관된 사건은 읽기 전용으로 표시
+        is_archived = bool(row.get('is_archived', 0))
         
         # 우선순위에 따른 아이콘 추가
         priority_icon = "🔴" if row.get('priority') == "높음" else "🟡" if row.get('priority') == "보통" else "🟢"
         expander_title = f"{priority_icon} {row['title']} (담당: {row['manager']}, 상태: {row['status']})"
+        if is_archived:
+            expander_title = f"📦 {expander_title}"
         
         with st.expander(expander_title, expanded=False):
-            # 탭 인터페이스 사용
-            tab1, tab2, tab3, tab4 = st.tabs(["기본 정보", "진행 내역", "세부 작업", "디지털 장비"])
+            show_case_detail(case_id, is_archived)
+
+@st.fragment
+@_trace_fragment
+def show_dossier_export(cases_df, include_archive):
+    """선택한 사건들의 자료 묶음 ZIP 생성을 내보내기 작업으로 등록"""
+    with st.expander("📦 사건 자료 묶음 내보내기"):
+        st.caption("사건마다 개요, 진행 내역, 세부 작업, 디지털 장비(해시 포함), 타임라인을 ZIP으로 묶습니다. "
+                   "생성은 백그라운드에서 진행되며 '📤 내보내기 작업' 메뉴에서 받을 수 있습니다.")
+        titles = {int(row["id"]): f"[{int(row['id'])}] {row['title']}" for _, row in cases_df.iterrows()}
+        case_ids = st.multiselect("대상 사건", list(titles), format_func=titles.get, key="dossier_case_ids")
+        
+        if st.button("자료 묶음 생성", key="dossier_build", disabled=not case_ids):
+            _submit_export_job("dossiers", {"case_ids": case_ids, "include_archive": include_archive})
+
+# 일괄 수정 대상별 표시 컬럼 (수정 가능한 컬럼은 db.BULK_EDIT_COLUMNS)
+BULK_EDIT_TARGETS = {
+    "사건": ("cases", ["id", "title", "manager", "status", "priority", "end_date"]),
+    "세부 작업": ("case_tasks", ["id", "case_title", "content", "writer", "status", "end_date", "hours"]),
+    "디지털 장비": ("digital_devices", ["id", "case_title", "name", "status",
+                                    "examination_start_date", "examination_end_date"])
+}
+BULK_EDIT_LABELS = {
+    "id": "ID", "title": "사건명", "case_title": "사건명", "manager": "담당자", "status": "상태",
+    "priority": "우선순위", "end_date": "종료일", "content": "내용", "writer": "작성자", "hours": "소요시간",
+    "name": "장비명", "examination_start_date": "검토 시작일", "examination_end_date": "검토 완료일"
+}
+DEVICE_STATUS_OPTIONS = ["수집완료", "검토중", "검토완료", "반환"]
+
+def _load_bulk_edit_rows(target, exclude_done):
+    """일괄 수정 그리드에 올릴 행 조회 (편집 전 값 스냅샷)"""
+    table, columns = BULK_EDIT_TARGETS[target]
+    if table == "cases":
+        df = db.get_cases()
+    elif table == "case_tasks":
+        df = db.get_case_tasks()
+    else:
+        df = db.get_digital_devices()
+    
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    if "case_title" in columns:
+        case_titles = db.get_case_labels(with_manager=False)
+        df["case_title"] = df["case_id"].map(case_titles)
+    if exclude_done:
+        df = df[~df["status"].isin(["완료", "검토완료", "반환"])]
+    
+    # sqlite에 그대로 넘길 수 있도록 numpy 값 대신 파이썬 값으로 변환
+    df = df[columns].reset_index(drop=True).astype(object)
+    return df.where(df.notna(), None)
+
+def _on_save_bulk_edits():
+    """일괄 수정 '저장' 버튼 콜백 - 그리드 변경분만 모아 한 트랜잭션으로 반영"""
+    state = st.session_state
+    target, snapshot, editor_key = state.bulk_edit_target, state.bulk_edit_snapshot[1], state.bulk_edit_editor_key
+    table, _ = BULK_EDIT_TARGETS[target]
+    edited_rows = state.get(editor_key, {}).get("edited_rows", {})
+    
+    edits = []
+    for position, changes in edited_rows.items():
+        original = snapshot.iloc[int(position)]
+        edits.append({"id": int(original["id"]), "original": original.to_dict(), "changes": changes})
+    
+    state.bulk_edit_result = db.apply_bulk_edits(table, edits)
+    # 저장 후 최신 값으로 다시 불러오기
+    state.pop("bulk_edit_snapshot", None)
+
+def show_bulk_edit():
+    """사건/세부 작업/디지털 장비 일괄 수정 그리드"""
+    state = st.session_state
+    col1, col2 = st.columns(2)
+    with col1:
+        target = st.radio("대상", list(BULK_EDIT_TARGETS), horizontal=True, key="bulk_edit_target")
+    with col2:
+        exclude_done = st.checkbox("완료/반환 항목 제외", value=True, key="bulk_edit_exclude_done")
+    
+    # 저장 결과 알림 (1회 표시)
+    result = state.pop("bulk_edit_result", None)
+    if result is not None:
+        st.success(f"{len(result['updated'])}건을 저장했습니다.")
+        if result["conflicts"]:
+            st.warning("다른 곳에서 먼저 수정된 항목은 저장하지 않았습니다. 최신 값을 확인한 뒤 다시 수정하세요.")
+            st.dataframe(
+                pd.DataFrame(result["conflicts"]).rename(columns={
+                    "id": "ID", "column": "컬럼", "expected": "편집 전 값", "current": "현재 값"
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    # 대상/필터가 바뀌었거나 저장 후에는 스냅샷을 새로 읽고 그리드 편집 상태 초기화
+    signature = (target, exclude_done)
+    if state.get("bulk_edit_snapshot", (None,))[0] != signature:
+        state.bulk_edit_snapshot = (signature, _load_bulk_edit_rows(target, exclude_done))
+        state.bulk_edit_seq = state.get("bulk_edit_seq", 0) + 1
+    snapshot = state.bulk_edit_snapshot[1]
+    state.bulk_edit_editor_key = f"bulk_editor_{state.bulk_edit_seq}"
+    
+    if snapshot.empty:
+        st.info("수정할 항목이 없습니다.")
+        return
+    
+    table, columns = BULK_EDIT_TARGETS[target]
+    editable = db.BULK_EDIT_COLUMNS[table]
+    status_options = DEVICE_STATUS_OPTIONS if table == "digital_devices" else STATUS_OPTIONS
+    column_config = {column: BULK_EDIT_LABELS[column] for column in columns}
+    column_config["status"] = st.column_config.SelectboxColumn(
+        "상태", options=list(dict.fromkeys(status_options + snapshot["status"].dropna().tolist())), required=True
+    )
+    if "priority" in columns:
+        column_config["priority"] = st.column_config.SelectboxColumn("우선순위", options=["높음", "보통", "낮음"])
+    if "hours" in columns:
+        column_config["hours"] = st.column_config.NumberColumn("소요시간", min_value=0.0, step=0.5, format="%.1f")
+    for column in columns:
+        if column.endswith("_date"):
+            column_config[column] = st.column_config.TextColumn(
+                BULK_EDIT_LABELS[column], validate=r"^(\d{4}-\d{2}-\d{2})?$"
+            )
+    
+    st.caption(f"{len(snapshot):,}건 · 수정한 칸만 저장되며, 저장은 한 번에 처리됩니다.")
+    st.data_editor(
+        snapshot,
+        column_config=column_config,
+        disabled=[column for column in columns if column not in editable],
+        hide_index=True,
+        use_container_width=True,
+        key=state.bulk_edit_editor_key
+    )
+    st.button("변경 사항 저장", key="bulk_edit_save_btn", type="primary", on_click=_on_save_bulk_edits)
+
+def _set_case_message(case_id, message, level="success"):
+    """사건 패널에 1회 표시할 알림 저장"""
+    st.session_state[f"case_message_{case_id}"] = (level, message)
+
+def _on_update_case_status(case_id):
+    """'상태 변경' 버튼 콜백"""
+    state = st.session_state
+    new_status = state[f"status_{case_id}"]
+    update_data = {
+        "status": new_status,
+        "priority": state[f"priority_{case_id}"]
+    }
+    
+    end_date = state.get(f"end_date_{case_id}")
+    if new_status == "완료" and end_date:
+        update_data["end_date"] = end_date.strftime("%Y-%m-%d")
+    elif new_status != "완료":
+        update_data["end_date"] = None
+    
+    if db.update_case(case_id, **update_data):
+        _set_case_message(case_id, "상태가 변경되었습니다.")
+        # 사건 목록 패널 제목의 상태/우선순위도 바뀌므로 전체 화면을 다시 실행
+        _request_app_rerun()
+    else:
+        _set_case_message(case_id, "상태 변경 중 오류가 발생했습니다.", "error")
+
+def _on_add_case_progress(case_id):
+    """진행 내역 '추가' 버튼 콜백"""
+    state = st.session_state
+    new_progress = state[f"progress_{case_id}"]
+    progress_writer = state[f"progress_writer_{case_id}"]
+    
+    if not new_progress:
+        return
+    if not progress_writer:
+        _set_case_message(case_id, "작성자를 입력해주세요.", "error")
+        return
+    
+    db.add_case_progress(case_id, progress_writer, new_progress)
+    state[f"progress_{case_id}"] = ""
+    _set_case_message(case_id, "진행 내역이 추가되었습니다.")
+
+def _on_toggle_add_form(case_id, form_name):
+    """'새 세부 작업 추가'/'새 장비 추가' 버튼 콜백 - 해당 사건의 입력 폼 표시"""
+    st.session_state[f"add_{form_name}_case_id"] = case_id
+    st.session_state[f"show_add_{form_name}_form"] = True
+
+def _on_add_case_task(case_id):
+    """세부 작업 '저장' 버튼 콜백"""
+    state = st.session_state
+    task_writer = state[f"task_writer_{case_id}"]
+    task_content = state[f"task_content_{case_id}"]
+    
+    if not task_writer or not task_content:
+        _set_case_message(case_id, "작성자와 업무 내용은 필수입니다.", "error")
+        return
+    
+    db.add_case_task(
+        case_id=case_id,
+        main_category=state[f"task_main_category_{case_id}"],
+        sub_category=state[f"task_sub_category_{case_id}"],
+        content=task_content,
+        start_date=state[f"task_start_date_{case_id}"].strftime("%Y-%m-%d"),
+        end_date=state[f"task_end_date_{case_id}"].strftime("%Y-%m-%d"),
+        status=state[f"task_status_{case_id}"],
+        writer=task_writer,
+        hours=state[f"task_hours_{case_id}"]
+    )
+    
+    # 폼 숨기기
+    state.show_add_task_form = False
+    _set_case_message(case_id, "세부 작업이 저장되었습니다.")
+
+def _on_add_digital_device(case_id):
+    """장비 '저장' 버튼 콜백"""
+    state = st.session_state
+    device_type = state[f"device_type_{case_id}"]
+    device_name = state[f"device_name_{case_id}"]
+    
+    if not device_name or not device_type:
+        _set_case_message(case_id, "기기명과 기기 종류는 필수입니다.", "error")
+        return
+    
+    db.add_digital_device(
+        case_id=case_id,
+        device_type=device_type,
+        name=device_name,
+        model=state[f"device_model_{case_id}"],
+        serial_number=state[f"device_serial_number_{case_id}"],
+        manufacturer=state[f"device_manufacturer_{case_id}"],
+        storage_size=state[f"device_storage_size_{case_id}"],
+        acquisition_date=state[f"device_acquisition_date_{case_id}"].strftime("%Y-%m-%d"),
+        examination_start_date=state[f"device_examination_start_date_{case_id}"].strftime("%Y-%m-%d"),
+        examination_end_date=state[f"device_examination_end_date_{case_id}"].strftime("%Y-%m-%d"),
+        acquisition_method=state[f"device_acquisition_method_{case_id}"],
+        hash_value=state[f"device_hash_value_{case_id}"],
+        description=state[f"device_description_{case_id}"],
+        status=state[f"device_status_{case_id}"]
+    )
+    
+    # 폼 숨기기
+    state.show_add_device_form = False
+    _set_case_message(case_id, "장비가 저장되었습니다.")
+
+def _on_parse_device_logs(case_id):
+    """'로그 분석' 버튼 콜백 - 폴더의 수집 로그를 병렬 분석해 미리보기로 보관"""
+    directory = st.session_state[f"ingest_dir_{case_id}"].strip().strip('"')
+    if not directory or not os.path.isdir(directory):
+        st.session_state.pop(f"ingest_devices_{case_id}", None)
+        _set_case_message(case_id, "로그 폴더를 찾을 수 없습니다.", "error")
+        return
+    
+    devices, errors = device_ingest.parse_directory(directory)
+    st.session_state[f"ingest_devices_{case_id}"] = (devices, errors)
+    if not devices:
+        _set_case_message(case_id, "등록할 장비 정보를 찾지 못했습니다.", "error")
+
+def _on_save_ingested_devices(case_id):
+    """'장비 N건 등록' 버튼 콜백 - 분석된 장비를 한 트랜잭션으로 저장"""
+    devices, _ = st.session_state.pop(f"ingest_devices_{case_id}", ([], []))
+    inserted, skipped = db.add_digital_devices_bulk(case_id, devices)
+    message = f"장비 {inserted}건이 등록되었습니다."
+    if skipped:
+        message += f" (이미 등록된 장비 {skipped}건 제외)"
+    _set_case_message(case_id, message)
+
+def _on_hash_device_image(case_id, device_id):
+    """장비 '해시 계산' 버튼 콜백 - 백그라운드 스레드에서 계산을 시작하고 결과는 장비 정보에 저장"""
+    path = st.session_state[f"hash_path_{case_id}"].strip().strip('"')
+    if not path or not os.path.isfile(path):
+        _set_case_message(case_id, "이미지 파일을 찾을 수 없습니다.", "error")
+        return
+    
+    if not evidence_hash.start_device_hash(device_id, path):
+        _set_case_message(case_id, "이 장비의 해시 계산이 이미 실행 중입니다.", "error")
+
+# 해시 계산 진행률 갱신 주기(초)
+HASH_POLL_SECONDS = 2
+
+@_trace_fragment
+def show_device_hash_progress(device_id, polling):
+    """장비 이미지 해시 계산 진행률 (계산 중에는 주기적으로 다시 실행되는 fragment)"""
+    job = evidence_hash.get_device_hash_job(device_id)
+    if job is None:
+        return
+    
+    # 계산이 끝나면 전체를 다시 실행해 폴링을 멈추고 장비 정보의 해시 값을 갱신
+    if polling and job["status"] != "실행 중":
+        st.rerun()
+    
+    if job["status"] == "실행 중":
+        ratio = job["done"] / job["total"] if job["total"] else 0.0
+        elapsed = max(time.time() - job["started_at"], 1e-6)
+        st.progress(
+            min(ratio, 1.0),
+            text=f"해시 계산 중: {job['done'] / 1024 / 1024:,.0f} / {job['total'] / 1024 / 1024:,.0f} MB "
+                 f"({job['done'] / 1024 / 1024 / elapsed:.1f} MB/s)"
+        )
+    elif job["status"] == "완료":
+        text = f"해시 계산 완료: {job['result']} ({job['total'] / 1024 / 1024:,.1f} MB, {job['throughput']:.1f} MB/s)"
+        if job["result"] == "불일치":
+            st.error(text)
+        else:
+            st.success(text)
+    else:
+        st.error(f"해시 계산 실패: {job['message']}")
+
+def show_device_hash_tool(case_id, device_id):
+    """선택한 장비의 이미지 해시 계산 입력과 진행률"""
+    job = evidence_hash.get_device_hash_job(device_id)
+    running = job is not None and job["status"] == "실행 중"
+    st.text_input("이미지 파일 경로", key=f"hash_path_{case_id}", disabled=running)
+    st.button(
+        "해시 계산", key=f"hash_device_btn_{case_id}", disabled=running,
+        on_click=_on_hash_device_image, args=(case_id, device_id)
+    )
+    st.fragment(show_device_hash_progress, run_every=HASH_POLL_SECONDS if running else None)(device_id, running)
+
+@st.fragment
+@_trace_fragment
+def show_case_detail(case_id, is_archived=False):
+    """
+    사건 상세 패널 (fragment)
+    
+    패널 안의 버튼/폼은 콜백에서 DB에 저장한 뒤 이 fragment만 다시 실행되므로,
+    전체 사건 목록을 다시 읽지 않고 해당 사건의 데이터만 다시 조회합니다.
+    (상태 변경처럼 패널 제목이 바뀌는 경우만 전체 화면을 다시 실행)
+    """
+    _rerun_app_if_requested()
+    row = db.get_case(case_id, include_archive=is_archived)
+    if row is None:
+        st.warning("사건 정보를 찾을 수 없습니다.")
+        return
+    
+    if is_archived:
+        st.info("보관 DB로 이동된 사건입니다. 조회만 가능합니다.")
+    
+    # 콜백에서 남긴 알림 (1회 표시)
+    message = st.session_state.pop(f"case_message_{case_id}", None)
+    if message:
+        level, text = message
+        if level == "error":
+            st.error(text)
+        else:
+            st.success(text)
+    
+    # 탭 인터페이스 사용
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+        ["기본 정보", "진행 내역", "세부 작업", "디지털 장비", "타임라인", "첨부 파일"]
+    )
+    
+    # 탭 1: 기본 정보
+    with tab1:
+        st.subheader("사건 정보")
+        
+        priority = row.get('priority') or '보통'
+        
+        # 기본 정보 표시
+        info_col1, info_col2 = st.columns(2)
+        
+        with info_col1:
+            st.write(f"**사건명**: {row['title']}")
+            st.write(f"**담당자**: {row['manager']}")
+            st.write(f"**의뢰인**: {row.get('client') or '-'}")
+            st.write(f"**우선순위**: {priority}")
+        
+        with info_col2:
+            st.write(f"**시작일**: {row['start_date']}")
+            st.write(f"**종료일**: {row['end_date'] if row['end_date'] else '-'}")
+            st.write(f"**상태**: {row['status']}")
+            st.write(f"**생성일**: {row.get('created_at') or '-'}")
+        
+        # 사건 설명
+        if row.get("description"):
+            st.subheader("사건 설명")
+            st.write(row["description"])
+        
+        # 상태/종료일 변경
+        st.subheader("상태 변경")
+        status_col1, status_col2, status_col3 = st.columns(3)
+        
+        status_options = ["진행 중", "완료", "미완료"]
+        priority_options = ["높음", "보통", "낮음"]
+        
+        with status_col1:
+            new_status = st.selectbox(
+                "상태", 
+                status_options, 
+                index=status_options.index(row['status']) if row['status'] in status_options else 0, 
+                key=f"status_{case_id}"
+            )
+        
+        with status_col2:
+            if new_status == "완료":
+                st.date_input(
+                    "종료일", 
+                    value=datetime.now() if not row['end_date'] else datetime.strptime(row['end_date'], "%Y-%m-%d"),
+                    key=f"end_date_{case_id}"
+                )
+        
+        with status_col3:
+            st.selectbox(
+                "우선순위", 
+                priority_options,
+                index=priority_options.index(priority) if priority in priority_options else 1,
+                key=f"priority_{case_id}"
+            )
+        
+        st.button(
+            "상태 변경", key=f"update_status_{case_id}", disabled=is_archived,
+            on_click=_on_update_case_status, args=(case_id,)
+        )
+    
+    # 탭 2: 진행 내역
+    with tab2:
+        st.subheader("진행 내역")
+        
+        # 진행 내역 테이블로 표시
+        progresses_df = db.get_case_progresses(case_id=case_id, include_archive=is_archived)
+        
+        if not progresses_df.empty:
+            progress_view = progresses_df[["date", "writer", "content"]]
+            progress_view.columns = ["날짜", "작성자", "내용"]
+            st.dataframe(progress_view, use_container_width=True)
+        else:
+            # 기존 case_logs 호환성 처리
+            logs = db.get_case_logs(case_id)
+            if logs:
+                for log in logs:
+                    st.markdown(f"- {log['date']}: {log['text']}")
+            else:
+                st.info("진행 내역이 없습니다.")
+        
+        # 진행 내역 추가 폼
+        with st.form(f"add_progress_{case_id}"):
+            progress_col1, progress_col2 = st.columns([3, 1])
+            
+            with progress_col1:
+                st.text_area("진행 내역", key=f"progress_{case_id}")
             
-            # 탭 1: 기본 정보
-            with tab1:
-                st.subheader("사건 정보")
+            with progress_col2:
+                st.text_input("작성자", key=f"progress_writer_{case_id}")
+            
+            st.form_submit_button(
+                "추가", disabled=is_archived,
+                on_click=_on_add_case_progress, args=(case_id,)
+            )
+    
+    # 탭 3: 세부 작업 목록
+    with tab3:
+        st.subheader("세부 작업 목록")
+        
+        # 세부 작업 목록 표시
+        tasks_df = db.get_case_tasks(case_id=case_id, include_archive=is_archived)
+        
+        if not tasks_df.empty:
+            # 세부 작업 테이블로 표시
+            task_view = tasks_df[["main_category", "sub_category", "content", "start_date", "end_date", "status", "writer"]]
+            task_view.columns = ["대분류", "소분류", "내용", "시작일", "종료일", "상태", "작성자"]
+            st.dataframe(task_view, use_container_width=True)
+        else:
+            st.info("등록된 세부 작업이 없습니다.")
+        
+        # 세부 작업 추가 버튼
+        st.button(
+            "새 세부 작업 추가", key=f"add_task_btn_{case_id}", disabled=is_archived,
+            on_click=_on_toggle_add_form, args=(case_id, "task")
+        )
+        
+        # 세부 작업 추가 폼 (session_state로 표시 제어)
+        if st.session_state.get("show_add_task_form", False) and st.session_state.get("add_task_case_id") == case_id:
+            st.subheader("새 세부 작업 추가")
+            
+            with st.form(f"add_task_form_{case_id}"):
+                # 폼 외부에서는 session_state 변수만 초기화
+                if "selected_main_category" not in st.session_state:
+                    st.session_state.selected_main_category = list(CATEGORY_MAPPING.keys())[0]
                 
-                # 기본 정보 표시
-                info_col1, info_col2 = st.columns(2)
+                # 작성자 입력
+                st.text_input("작성자", key=f"task_writer_{case_id}")
                 
-                with info_col1:
-                    st.write(f"**사건명**: {row['title']}")
-                    st.write(f"**담당자**: {row['manager']}")
-                    st.write(f"**의뢰인**: {row.get('client', '-')}")
-                    st.write(f"**우선순위**: {row.get('priority', '보통')}")
+                # 대분류 선택
+                main_category = st.selectbox(
+                    "대분류 선택", 
+                    list(CATEGORY_MAPPING.keys()),
+                    key=f"task_main_category_{case_id}",
+                    index=list(CATEGORY_MAPPING.keys()).index(st.session_state.selected_main_category)
+                )
                 
-                with info_col2:
-                    st.write(f"**시작일**: {row['start_date']}")
-                    st.write(f"**종료일**: {row['end_date'] if row['end_date'] else '-'}")
-                    st.write(f"**상태**: {row['status']}")
-                    st.write(f"**생성일**: {row.get('created_at', '-')}")
+                # 소분류 선택
+                st.selectbox(
+                    "소분류 선택",
+                    CATEGORY_MAPPING[main_category],
+                    key=f"task_sub_category_{case_id}"
+                )
                 
-                # 사건 설명
-                if "description" in row and row["description"]:
-                    st.subheader("사건 설명")
-                    st.write(row["description"])
+                # 업무 내용 입력
+                st.text_area("업무 내용", height=100, key=f"task_content_{case_id}")
                 
-                # 상태/종료일 변경
-                st.subheader("상태 변경")
-                status_col1, status_col2, status_col3 = st.columns(3)
+                # 날짜 및 상태 입력
+                task_col1, task_col2, task_col3 = st.columns(3)
                 
-                with status_col1:
-                    new_status = st.selectbox(
-                        "상태", 
-                        ["진행 중", "완료", "미완료"], 
-                        index=["진행 중", "완료", "미완료"].index(row['status']), 
-                        key=f"status_{case_id}"
-                    )
+                with task_col1:
+                    st.date_input("시작일", value=datetime.now(), key=f"task_start_date_{case_id}")
                 
-                with status_col2:
-                    end_date = None
-                    if new_status == "완료":
-                        end_date = st.date_input(
-                            "종료일", 
-                            value=datetime.now() if not row['end_date'] else datetime.strptime(row['end_date'], "%Y-%m-%d"),
-                            key=f"end_date_{case_id}"
-                        )
+                with task_col2:
+                    st.date_input("종료일", value=datetime.now(), key=f"task_end_date_{case_id}")
                 
-                with status_col3:
-                    new_priority = st.selectbox(
-                        "우선순위", 
-                        ["높음", "보통", "낮음"],
-                        index=["높음", "보통", "낮음"].index(row.get('priority', '보통')),
-                        key=f"priority_{case_id}"
+                with task_col3:
+                    st.number_input(
+                        "소요 시간", 
+                        min_value=0.0,
+                        value=0.0, 
+                        step=0.5,
+                        format="%.1f",
+                        help="0.5 = 30분, 1.0 = 1시간, 1.5 = 1시간 30분 ...",
+                        key=f"task_hours_{case_id}"
                     )
                 
-                if st.button("상태 변경", key=f"update_status_{case_id}"):
-                    update_data = {
-                        "status": new_status,
-                        "priority": new_priority
-                    }
-                    
-                    if new_status == "완료" and end_date:
-                        update_data["end_date"] = end_date.strftime("%Y-%m-%d")
-                    elif new_status != "완료":
-                        update_data["end_date"] = None
-                    
-                    if db.update_case(case_id, **update_data):
-                        st.success("상태가 변경되었습니다.")
-                        st.session_state.update_case = True
-                        st.rerun()
-                    else:
-                        st.error("상태 변경 중 오류가 발생했습니다.")
-            
-            # 탭 2: 진행 내역
-            with tab2:
-                st.subheader("진행 내역")
+                st.selectbox("진행 상태", ["진행 중", "완료", "미완료"], key=f"task_status_{case_id}")
                 
-                # 진행 내역 테이블로 표시
-                progresses_df = db.get_case_progresses(case_id=case_id)
+                st.form_submit_button("저장", on_click=_on_add_case_task, args=(case_id,))
+    
+    # 탭 4: 디지털 장비
+    with tab4:
+        st.subheader("디지털 장비 목록")
+        
+        # 디지털 장비 목록 표시
+        devices_df = db.get_digital_devices(case_id=case_id, include_archive=is_archived)
+        
+        if not devices_df.empty:
+            # 장비 목록 테이블로 표시
+            device_view = devices_df[["name", "device_type", "model", "acquisition_date", "status"]]
+            device_view.columns = ["장비명", "유형", "모델명", "수집일자", "상태"]
+            st.dataframe(device_view, use_container_width=True)
+        
+            # 장비 세부 정보 선택 드롭다운 (ID → 장비명 dict 조회)
+            device_labels = db.get_device_labels(case_id, include_archive=is_archived)
+            selected_device_id = st.selectbox(
+                "장비 세부 정보 보기", 
+                list(device_labels),
+                format_func=device_labels.get,
+                key=f"device_select_{case_id}"
+            )
+            
+            if selected_device_id:
+                selected_device = devices_df.set_index("id").loc[selected_device_id]
                 
-                if not progresses_df.empty:
-                    progress_view = progresses_df[["date", "writer", "content"]]
-                    progress_view.columns = ["날짜", "작성자", "내용"]
-                    st.dataframe(progress_view, use_container_width=True)
-                else:
-                    # 기존 case_logs 호환성 처리
-                    logs = db.get_case_logs(case_id)
-                    if logs:
-                        for log in logs:
-                            st.markdown(f"- {log['date']}: {log['text']}")
-                    else:
-                        st.info("진행 내역이 없습니다.")
+                # 세부 정보 표시
+                st.write("### 장비 세부 정보")
+                detail_col1, detail_col2 = st.columns(2)
                 
-                # 진행 내역 추가 폼
-                with st.form(f"add_progress_{case_id}"):
-                    progress_col1, progress_col2 = st.columns([3, 1])
-                    
-                    with progress_col1:
-                        new_progress = st.text_area("진행 내역", key=f"progress_{case_id}")
-                    
-                    with progress_col2:
-                        progress_writer = st.text_input("작성자", key=f"progress_writer_{case_id}")
-                    
-                    progress_submit = st.form_submit_button("추가")
-                    
-                    if progress_submit and new_progress:
-                        if not progress_writer:
-                            st.error("작성자를 입력해주세요.")
-                        else:
-                            # 새 진행 내역 추가
-                            db.add_case_progress(case_id, progress_writer, new_progress)
-                            st.success("진행 내역이 추가되었습니다. 새로고침 해주세요.")
-                            st.rerun()
-            
-            # 탭 3: 세부 작업 목록
-            with tab3:
-                st.subheader("세부 작업 목록")
+                with detail_col1:
+                    st.write(f"**장비명**: {selected_device['name']}")
+                    st.write(f"**장비 유형**: {selected_device['device_type']}")
+                    st.write(f"**제조사**: {selected_device['manufacturer'] or '-'}")
+                    st.write(f"**모델명**: {selected_device['model'] or '-'}")
+                    st.write(f"**시리얼번호**: {selected_device['serial_number'] or '-'}")
                 
-                # 세부 작업 목록 표시
-                tasks_df = db.get_case_tasks(case_id=case_id)
+                with detail_col2:
+                    st.write(f"**저장용량**: {selected_device['storage_size'] or '-'}")
+                    st.write(f"**수집일자**: {selected_device['acquisition_date'] or '-'}")
+                    st.write(f"**수집방법**: {selected_device['acquisition_method'] or '-'}")
+                    st.write(f"**해시값**: {selected_device['hash_value'] or '-'}")
+                    st.write(f"**상태**: {selected_device['status']}")
                 
-                if not tasks_df.empty:
-                    # 세부 작업 테이블로 표시
-                    task_view = tasks_df[["main_category", "sub_category", "content", "start_date", "end_date", "status", "writer"]]
-                    task_view.columns = ["대분류", "소분류", "내용", "시작일", "종료일", "상태", "작성자"]
-                    st.dataframe(task_view, use_container_width=True)
-                else:
-                    st.info("등록된 세부 작업이 없습니다.")
+                if selected_device['description']:
+                    st.write("**설명**:")
+                    st.write(selected_device['description'])
                 
-                # 세부 작업 추가 버튼
-                if st.button("새 세부 작업 추가", key=f"add_task_btn_{case_id}"):
-                    st.session_state.add_task_case_id = case_id
-                    st.session_state.show_add_task_form = True
+                # 이미지 파일 해시 계산/검증 결과
+                if selected_device.get('hash_sha256'):
+                    st.write(f"**해시 검증**: {selected_device['hash_status']} ({selected_device['hash_verified_at']})")
+                    st.code(
+                        f"MD5     {selected_device['hash_md5']}\n"
+                        f"SHA-1   {selected_device['hash_sha1']}\n"
+                        f"SHA-256 {selected_device['hash_sha256']}"
+                    )
                 
-                # 세부 작업 추가 폼 (session_state로 표시 제어)
-                if st.session_state.get("show_add_task_form", False) and st.session_state.get("add_task_case_id") == case_id:
-                    st.subheader("새 세부 작업 추가")
-                    
-                    with st.form(f"add_task_form_{case_id}"):
-                        # 폼 외부에서는 session_state 변수만 초기화
-                        if "selected_main_category" not in st.session_state:
-                            st.session_state.selected_main_category = list(CATEGORY_MAPPING.keys())[0]
-                        
-                        # 작성자 입력
-                        task_writer = st.text_input("작성자")
-                        
-                        # 대분류 선택
-                        main_category = st.selectbox(
-                            "대분류 선택", 
-                            list(CATEGORY_MAPPING.keys()),
-                            key=f"task_main_category_{case_id}",
-                            index=list(CATEGORY_MAPPING.keys()).index(st.session_state.selected_main_category)
-                        )
-                        
-                        # 소분류 선택
-                        sub_category = st.selectbox(
-                            "소분류 선택",
-                            CATEGORY_MAPPING[main_category],
-                            key=f"task_sub_category_{case_id}"
-                        )
-                        
-                        # 업무 내용 입력
-                        task_content = st.text_area("업무 내용", height=100)
-                        
-                        # 날짜 및 상태 입력
-                        task_col1, task_col2, task_col3 = st.columns(3)
-                        
-                        with task_col1:
-                            task_start_date = st.date_input("시작일", value=datetime.now())
-                        
-                        with task_col2:
-                            task_end_date = st.date_input("종료일", value=datetime.now())
-                        
-                        with task_col3:
-                            task_hours = st.number_input(
-                                "소요 시간", 
-                                min_value=0.0,
-                                value=0.0, 
-                                step=0.5,
-                                format="%.1f",
-                                help="0.5 = 30분, 1.0 = 1시간, 1.5 = 1시간 30분 ..."
-                            )
-                        
-                        task_status = st.selectbox("진행 상태", ["진행 중", "완료", "미완료"])
-                        
-                        task_submit = st.form_submit_button("저장")
-                        
-                        if task_submit:
-                            if not task_writer or not task_content:
-                                st.error("작성자와 업무 내용은 필수입니다.")
-                            else:
-                                # DB에 저장
-                                db.add_case_task(
-                                    case_id=case_id,
-                                    main_category=main_category,
-                                    sub_category=sub_category,
-                                    content=task_content,
-                                    start_date=task_start_date.strftime("%Y-%m-%d"),
-                                    end_date=task_end_date.strftime("%Y-%m-%d"),
-                                    status=task_status,
-                                    writer=task_writer,
-                                    hours=task_hours
-                                )
-                                
-                                # 폼 숨기기
-                                st.session_state.show_add_task_form = False
-                                st.success("세부 작업이 저장되었습니다.")
-                                st.rerun()
+                # 해시 계산 도구는 켠 사건에서만 그림 (사건 목록 전체에 위젯을 만들지 않도록)
+                if not is_archived and st.toggle("이미지 해시 계산", key=f"hash_tool_{case_id}"):
+                    show_device_hash_tool(case_id, int(selected_device_id))
+        else:
+            st.info("등록된 디지털 장비가 없습니다.")
+        
+        # 장비 추가 버튼
+        st.button(
+            "새 장비 추가", key=f"add_device_btn_{case_id}", disabled=is_archived,
+            on_click=_on_toggle_add_form, args=(case_id, "device")
+        )
+        
+        # 수집 로그 디렉터리에서 장비 일괄 등록 (켠 사건에서만 입력 위젯을 그림)
+        if not is_archived and st.toggle("수집 로그로 일괄 등록", key=f"ingest_tool_{case_id}"):
+            st.caption("이미징 도구 로그(.txt/.log, E01 동반 로그)와 장비 목록 CSV가 있는 폴더를 분석합니다.")
+            st.text_input("로그 폴더 경로", key=f"ingest_dir_{case_id}")
+            st.button("로그 분석", key=f"ingest_parse_btn_{case_id}", on_click=_on_parse_device_logs, args=(case_id,))
+            
+            parsed = st.session_state.get(f"ingest_devices_{case_id}")
+            if parsed:
+                devices, errors = parsed
+                if devices:
+                    preview_df = pd.DataFrame(devices)[
+                        ["source_file", "name", "device_type", "model", "serial_number", "acquisition_date", "hash_value"]
+                    ]
+                    preview_df.columns = ["로그 파일", "장비명", "유형", "모델명", "시리얼번호", "수집일자", "해시값"]
+                    st.dataframe(preview_df, use_container_width=True, hide_index=True)
+                    st.button(
+                        f"장비 {len(devices)}건 등록", key=f"ingest_save_btn_{case_id}",
+                        on_click=_on_save_ingested_devices, args=(case_id,)
+                    )
+                for path, error in errors:
+                    st.caption(f"⚠️ {os.path.basename(path)}: {error}")
+        
+        # 장비 추가 폼 (session_state로 표시 제어)
+        if st.session_state.get("show_add_device_form", False) and st.session_state.get("add_device_case_id") == case_id:
+            st.subheader("새 장비 추가")
             
-            # 탭 4: 디지털 장비
-            with tab4:
-                st.subheader("디지털 장비 목록")
+            with st.form(f"add_device_form_{case_id}"):
+                device_col1, device_col2 = st.columns(2)
+                
+                with device_col1:
+                    st.selectbox(
+                        "기기 종류",
+                        ["휴대폰", "PC", "블랙박스", "저장장치", "CCTV", "기타"],
+                        key=f"device_type_{case_id}"
+                    )
+                    st.text_input("기기명", key=f"device_name_{case_id}")
+                    st.text_input("모델명 (예: 아이폰 14pro, 갤럭시 S21)", key=f"device_model_{case_id}")
+                    st.text_input("제조사", key=f"device_manufacturer_{case_id}")
+                    st.text_input("시리얼 번호", key=f"device_serial_number_{case_id}")
+                
+                with device_col2:
+                    st.text_input("저장용량", key=f"device_storage_size_{case_id}")
+                    st.date_input("수집일자", value=datetime.now(), key=f"device_acquisition_date_{case_id}")
+                    st.text_input("수집방법", key=f"device_acquisition_method_{case_id}")
+                    st.selectbox("상태", ["수집완료", "검토중", "검토완료", "반환"], key=f"device_status_{case_id}")
+                    st.text_input("해시값", key=f"device_hash_value_{case_id}")
                 
-                # 디지털 장비 목록 표시
-                devices_df = db.get_digital_devices(case_id=case_id)
+                # 검토 일정 섹션
+                st.subheader("검토 일정")
+                date_col1, date_col2 = st.columns(2)
                 
-                if not devices_df.empty:
-                    # 장비 목록 테이블로 표시
-                    device_view = devices_df[["name", "device_type", "model", "acquisition_date", "status"]]
-                    device_view.columns = ["장비명", "유형", "모델명", "수집일자", "상태"]
-                    st.dataframe(device_view, use_container_width=True)
+                with date_col1:
+                    st.date_input("검토 시작일", value=datetime.now(), key=f"device_examination_start_date_{case_id}")
                 
-                    # 장비 세부 정보 선택 드롭다운
-                    selected_device_id = st.selectbox(
-                        "장비 세부 정보 보기", 
-                        devices_df["id"].tolist(),
-                        format_func=lambda x: devices_df[devices_df["id"] == x]["name"].iloc[0],
-                        key=f"device_select_{case_id}"
+                with date_col2:
+                    st.date_input(
+                        "검토 완료일", value=datetime.now() + timedelta(days=3),
+                        key=f"device_examination_end_date_{case_id}"
                     )
-                    
-                    if selected_device_id:
-                        selected_device = devices_df[devices_df["id"] == selected_device_id].iloc[0]
-                        
-                        # 세부 정보 표시
-                        st.write("### 장비 세부 정보")
-                        detail_col1, detail_col2 = st.columns(2)
-                        
-                        with detail_col1:
-                            st.write(f"**장비명**: {selected_device['name']}")
-                            st.write(f"**장비 유형**: {selected_device['device_type']}")
-                            st.write(f"**제조사**: {selected_device['manufacturer'] or '-'}")
-                            st.write(f"**모델명**: {selected_device['model'] or '-'}")
-                            st.write(f"**시리얼번호**: {selected_device['serial_number'] or '-'}")
-                        
-                        with detail_col2:
-                            st.write(f"**저장용량**: {selected_device['storage_size'] or '-'}")
-                            st.write(f"**수집일자**: {selected_device['acquisition_date'] or '-'}")
-                            st.write(f"**수집방법**: {selected_device['acquisition_method'] or '-'}")
-                            st.write(f"**해시값**: {selected_device['hash_value'] or '-'}")
-                            st.write(f"**상태**: {selected_device['status']}")
-                        
-                        if selected_device['description']:
-                            st.write("**설명**:")
-                            st.write(selected_device['description'])
-                else:
-                    st.info("등록된 디지털 장비가 없습니다.")
                 
-                # 장비 추가 버튼
-                if st.button("새 장비 추가", key=f"add_device_btn_{case_id}"):
-                    st.session_state.add_device_case_id = case_id
-                    st.session_state.show_add_device_form = True
+                st.text_area("설명", height=100, key=f"device_description_{case_id}")
                 
-                # 장비 추가 폼 (session_state로 표시 제어)
-                if st.session_state.get("show_add_device_form", False) and st.session_state.get("add_device_case_id") == case_id:
-                    st.subheader("새 장비 추가")
-                    
-                    with st.form(f"add_device_form_{case_id}"):
-                        device_col1, device_col2 = st.columns(2)
-                        
-                        with device_col1:
-                            device_type = st.selectbox(
-                                "기기 종류",
-                                ["휴대폰", "PC", "블랙박스", "저장장치", "CCTV", "기타"]
-                            )
-                            device_name = st.text_input("기기명")
-                            model = st.text_input("모델명 (예: 아이폰 14pro, 갤럭시 S21)")
-                            manufacturer = st.text_input("제조사")
-                            serial_number = st.text_input("시리얼 번호")
-                        
-                        with device_col2:
-                            storage_size = st.text_input("저장용량")
-                            acquisition_date = st.date_input("수집일자", value=datetime.now())
-                            acquisition_method = st.text_input("수집방법")
-                            status = st.selectbox("상태", ["수집완료", "검토중", "검토완료", "반환"])
-                            hash_value = st.text_input("해시값")
-                        
-                        # 검토 일정 섹션
-                        st.subheader("검토 일정")
-                        date_col1, date_col2 = st.columns(2)
-                        
-                        with date_col1:
-                            examination_start_date = st.date_input("검토 시작일", value=datetime.now())
-                        
-                        with date_col2:
-                            examination_end_date = st.date_input("검토 완료일", value=datetime.now() + timedelta(days=3))
-                        
-                        description = st.text_area("설명", height=100)
-                        
-                        device_submit = st.form_submit_button("저장")
-                        
-                        if device_submit:
-                            if not device_name or not device_type:
-                                st.error("기기명과 기기 종류는 필수입니다.")
-                            else:
-                                # DB에 저장
-                                db.add_digital_device(
-                                    case_id=case_id,
-                                    device_type=device_type,
-                                    name=device_name,
-                                    model=model,
-                                    serial_number=serial_number,
-                                    manufacturer=manufacturer,
-                                    storage_size=storage_size,
-                                    acquisition_date=acquisition_date.strftime("%Y-%m-%d"),
-                                    examination_start_date=examination_start_date.strftime("%Y-%m-%d"),
-                                    examination_end_date=examination_end_date.strftime("%Y-%m-%d"),
-                                    acquisition_method=acquisition_method,
-                                    hash_value=hash_value,
-                                    description=description,
-                                    status=status
-                                )
-                                
-                                # 폼 숨기기
-                                st.session_state.show_add_device_form = False
-                                st.success("장비가 저장되었습니다.")
-                                st.rerun()
+                st.form_submit_button("저장", on_click=_on_add_digital_device, args=(case_id,))
+    
+    with tab5:
+        # st.tabs는 모든 탭을 그리므로 타임라인 조회는 펼친 사건에서 요청할 때만 실행
+        if st.toggle("타임라인 불러오기", key=f"timeline_open_{case_id}"):
+            show_case_timeline(case_id, is_archived)
+    
+    with tab6:
+        # 첨부 목록/썸네일 조회와 업로드 위젯은 요청한 사건에서만 그림
+        if st.toggle("첨부 파일 불러오기", key=f"attachments_open_{case_id}"):
+            show_case_attachments(case_id, is_archived)
+
+# 첨부 파일 목록 한 페이지 분량 (열 수의 배수)
+ATTACHMENT_PAGE_SIZE = 24
+ATTACHMENT_COLUMNS = 6
+
+def _on_add_attachments(case_id):
+    """첨부 '저장' 버튼 콜백 - 업로드한 파일을 저장소에 저장 (썸네일은 백그라운드 생성)"""
+    state = st.session_state
+    upload_key = f"attach_upload_{case_id}_{state.get(f'attach_upload_seq_{case_id}', 0)}"
+    files = state.get(upload_key) or []
+    if not files:
+        _set_case_message(case_id, "첨부할 파일을 선택하세요.", "error")
+        return
+    
+    device_id = state.get(f"attach_device_{case_id}")
+    for uploaded in files:
+        attachments.save_attachment(
+            case_id, uploaded.name, uploaded.getvalue(),
+            device_id=device_id, description=state.get(f"attach_description_{case_id}") or None
+        )
+    
+    # 업로더 키를 바꿔 선택한 파일 목록 비우기
+    state[f"attach_upload_seq_{case_id}"] = state.get(f"attach_upload_seq_{case_id}", 0) + 1
+    _set_case_message(case_id, f"파일 {len(files)}개가 첨부되었습니다.")
+
+def _on_prepare_attachment_download(case_id, attachment_id, sha256):
+    """'원본 받기' 버튼 콜백 - 원본 파일은 받기를 누른 파일만 읽음"""
+    st.session_state[f"attach_download_{case_id}"] = (attachment_id, attachments.read_attachment(sha256))
+
+def _on_delete_attachment(case_id, attachment_id):
+    """첨부 '삭제' 버튼 콜백"""
+    attachments.delete_attachment(attachment_id)
+    _set_case_message(case_id, "첨부 파일이 삭제되었습니다.")
+
+def show_case_attachments(case_id, is_archived=False):
+    """사건 첨부 파일 (썸네일 목록은 미리 만든 작은 이미지만 읽음)"""
+    if not is_archived:
+        with st.expander("파일 첨부"):
+            seq = st.session_state.get(f"attach_upload_seq_{case_id}", 0)
+            st.file_uploader("파일 선택", accept_multiple_files=True, key=f"attach_upload_{case_id}_{seq}")
+            device_labels = db.get_device_labels(case_id)
+            st.selectbox(
+                "연결할 장비 (선택)", [None] + list(device_labels),
+                format_func=lambda device_id: "-" if device_id is None else device_labels[device_id],
+                key=f"attach_device_{case_id}"
+            )
+            st.text_input("설명", key=f"attach_description_{case_id}")
+            st.button("저장", key=f"attach_save_btn_{case_id}", on_click=_on_add_attachments, args=(case_id,))
+    
+    _, total = db.get_attachments(case_id, limit=0)
+    if total == 0:
+        st.info("첨부된 파일이 없습니다.")
+        return
+    
+    page_count = max(1, -(-total // ATTACHMENT_PAGE_SIZE))
+    page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key=f"attach_page_{case_id}")
+    files_df, _ = db.get_attachments(
+        case_id, limit=ATTACHMENT_PAGE_SIZE, offset=(page - 1) * ATTACHMENT_PAGE_SIZE
+    )
+    st.caption(f"총 {total:,}개 ({page}/{page_count} 페이지)")
+    
+    columns = st.columns(ATTACHMENT_COLUMNS)
+    for index, row in enumerate(files_df.itertuples()):
+        with columns[index % ATTACHMENT_COLUMNS]:
+            thumb = attachments.thumbnail_path(row.sha256)
+            if thumb:
+                st.image(str(thumb), caption=row.file_name, use_container_width=True)
+            elif row.thumb_status == "대기":
+                # 재시작 등으로 생성 작업이 사라졌을 때를 대비해 다시 예약 (중복 예약은 무시됨)
+                attachments.schedule_thumbnail(row.sha256)
+                st.markdown(f"⏳ {row.file_name}")
+            else:
+                st.markdown(f"📄 {row.file_name}")
+    
+    # 선택한 파일만 미리보기/원본 다운로드
+    labels = dict(zip(files_df["id"], files_df["file_name"]))
+    selected_id = st.selectbox(
+        "파일 보기", list(labels), format_func=labels.get, key=f"attach_select_{case_id}"
+    )
+    if selected_id is None:
+        return
+    
+    selected = files_df.set_index("id").loc[selected_id]
+    preview = attachments.preview_path(selected["sha256"])
+    if preview:
+        st.image(str(preview))
+    st.write(f"**크기**: {selected['size'] / 1024:,.1f} KB · **등록일시**: {selected['created_at']}")
+    if selected["description"]:
+        st.write(selected["description"])
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        # 준비한 원본은 한 번 그린 뒤 session_state에서 지움 (큰 파일을 세션에 계속 두지 않도록)
+        download = st.session_state.pop(f"attach_download_{case_id}", None)
+        if download and download[0] == selected_id:
+            st.download_button(
+                "원본 다운로드",
+                data=download[1],
+                file_name=selected["file_name"],
+                mime=selected["mime_type"] or "application/octet-stream",
+                key=f"attach_download_btn_{case_id}"
+            )
+        else:
+            st.button(
+                "원본 받기", key=f"attach_prepare_btn_{case_id}",
+                on_click=_on_prepare_attachment_download, args=(case_id, int(selected_id), selected["sha256"])
+            )
+    with col2:
+        st.button(
+            "삭제", key=f"attach_delete_btn_{case_id}", disabled=is_archived,
+            on_click=_on_delete_attachment, args=(case_id, int(selected_id))
+        )
+
+def show_case_timeline(case_id, is_archived=False):
+    """사건 활동 타임라인 (최신순, 현재 페이지 분량만 조회)"""
+    total = db.count_case_timeline(case_id, include_archive=is_archived)
+    if total == 0:
+        st.info("기록된 활동이 없습니다.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("표시 개수", GRID_PAGE_SIZES, key=f"timeline_page_size_{case_id}")
+    page_count = max(1, -(-total // page_size))
+    with col2:
+        page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key=f"timeline_page_{case_id}")
+    
+    events = db.get_case_timeline(
+        case_id, limit=page_size, offset=(page - 1) * page_size, include_archive=is_archived
+    )
+    for event in events.itertuples():
+        writer = f" · {event.writer}" if pd.notna(event.writer) and event.writer else ""
+        st.markdown(f"**{event.date}** `{event.label}`{writer}")
+        st.text(event.content)
+    
+    st.caption(f"총 {total:,}건 ({page}/{page_count} 페이지)")
+
+# 페이지 그리드 설정
+GRID_PAGE_SIZES = [20, 50, 100]
+
+# 상태 표시 (셀별 Styler 대신 현재 페이지 값에만 배지 적용)
+STATUS_BADGES = {"완료": "🟢 완료", "진행 중": "🟡 진행 중", "미완료": "🔴 미완료"}
+
+# 정렬 옵션 (표시 이름 → 컬럼, None은 기본 정렬)
+WORK_GRID_SORT_OPTIONS = {
+    "최근 등록순": None, "시작일": "start_date", "종료일": "end_date",
+    "작성자": "writer", "대분류": "main_category", "상태": "status"
+}
+TASK_GRID_SORT_OPTIONS = {
+    "시작일 최신순": None, "종료일": "end_date", "작성자": "writer",
+    "대분류": "main_category", "소요시간": "hours", "상태": "status"
+}
+
+def _grid_query_args(key, sort_options, filters):
+    """
+    페이지 그리드의 정렬/페이지 위젯 값을 session_state에서 읽어 조회 인자 생성
+    
+    필터, 정렬, 페이지 크기가 바뀌면 1페이지로 돌아갑니다.
+    """
+    state = st.session_state
+    sort_label = state.get(f"{key}_sort", next(iter(sort_options)))
+    page_size = state.get(f"{key}_page_size", GRID_PAGE_SIZES[0])
+    ascending = state.get(f"{key}_ascending", False)
+    
+    signature = repr((sorted(filters.items()), sort_label, ascending, page_size))
+    if state.get(f"{key}_signature") != signature:
+        state[f"{key}_signature"] = signature
+        state[f"{key}_page"] = 1
+    
+    # 다른 메뉴로 이동했다 돌아오면 렌더되지 않았던 페이지 위젯 값은 Streamlit이 지우므로 기본값 사용
+    page = state.get(f"{key}_page", 1)
+    return {
+        "sort_by": sort_options.get(sort_label),
+        "ascending": ascending,
+        "limit": page_size,
+        "offset": (page - 1) * page_size
+    }
+
+def show_paged_grid(key, display_df, total, sort_options):
+    """현재 페이지의 행만 표시하는 그리드와 정렬/페이지 이동 컨트롤"""
+    state = st.session_state
+    page_size = state.get(f"{key}_page_size", GRID_PAGE_SIZES[0])
+    page_count = max(1, -(-total // page_size))
+    
+    # 삭제 등으로 현재 페이지가 범위를 벗어나면 마지막 페이지로 이동
+    if state.get(f"{key}_page", 1) > page_count:
+        state[f"{key}_page"] = page_count
+        st.rerun()
+    
+    display_df = display_df.copy()
+    display_df["상태"] = display_df["상태"].map(STATUS_BADGES).fillna(display_df["상태"])
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "ID": st.column_config.NumberColumn("ID", width="small"),
+            "업무내용": st.column_config.TextColumn("업무내용", width="large"),
+            "상태": st.column_config.TextColumn("상태", width="small"),
+            "소요시간": st.column_config.NumberColumn("소요시간", format="%.1f")
+        }
+    )
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        st.selectbox("정렬", list(sort_options), key=f"{key}_sort")
+    with col2:
+        st.checkbox("오름차순", key=f"{key}_ascending")
+    with col3:
+        st.selectbox("페이지당", GRID_PAGE_SIZES, key=f"{key}_page_size")
+    with col4:
+        page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+    
+    start = (page - 1) * page_size + 1
+    st.caption(f"총 {total:,}건 중 {start:,}–{min(start + len(display_df) - 1, total):,} ({page}/{page_count} 페이지)")
+
+def show_excel_export(key, filters, load_df, file_prefix, job=None):
+    """
+    버튼을 누를 때만 전체 조회 결과로 Excel 파일을 만들어 다운로드 버튼 표시
+    
+    job=(작업 종류, 작업 인자)를 주면 내보내기 작업으로 등록하는 버튼도 함께 표시합니다.
+    """
+    state = st.session_state
+    filter_signature = repr(sorted(filters.items()))
+    
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("Excel 파일 생성", key=f"{key}_build"):
+            with st.spinner("Excel 파일 생성 중..."):
+                state[key] = (filter_signature, utils.create_excel_report(load_df()))
+    if job:
+        with col2:
+            if st.button("백그라운드로 생성", key=f"{key}_job"):
+                _submit_export_job(*job)
+    
+    # 필터가 바뀌기 전에 만든 파일만 다운로드 가능
+    if key in state and state[key][0] == filter_signature:
+        st.download_button(
+            label="Excel로 다운로드",
+            data=state[key][1],
+            file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"{key}_download"
+        )
+
+def _work_category_filters_from_state(name_options):
+    """
+    업무 기록 화면의 필터 위젯 값을 session_state에서 읽어 조회 조건 생성
+    
+    위젯을 그리기 전에 조회를 시작하기 위해 사용하며, 위젯 기본값('전체')과 같은 규칙을 따릅니다.
+    
+    Returns:
+        tuple: (일반 업무 필터 dict, 사건 ID 필터, 사건 관련 업무 필터 dict)
+    """
+    state = st.session_state
+    main_options = list(CATEGORY_MAPPING.keys())
+    
+    def category_filter(main_key, sub_key):
+        main = state.get(main_key, "전체")
+        if main not in main_options:
+            return {}
+        result = {"main_category": main}
+        # 대분류가 바뀌어 소분류 옵션에 없는 값이면 위젯이 '전체'로 초기화됨
+        sub = state.get(sub_key, "전체")
+        if sub in CATEGORY_MAPPING[main]:
+            result["sub_category"] = sub
+        return result
+    
+    filter_dict = category_filter("filter_main_general", "filter_sub_general")
+    if state.get("filter_status_general", "전체") in STATUS_OPTIONS:
+        filter_dict["status"] = state.filter_status_general
+    if state.get("filter_writer_general", "전체") in name_options:
+        filter_dict["writer"] = state.filter_writer_general
+    
+    case_filter_dict = category_filter("filter_main_case", "filter_sub_case")
+    if state.get("filter_writer_case", "전체") in name_options:
+        case_filter_dict["writer"] = state.filter_writer_case
+    
+    case_id_filter = state.get("selected_case_filter", "전체")
+    if case_id_filter == "전체":
+        case_id_filter = None
+    
+    return filter_dict, case_id_filter, case_filter_dict
 
 def show_work_category_form():
     """업무 기록 폼 표시"""
     st.header("📊 업무 기록")
     
     # 작성자 옵션 목록
-    name_options = ["신용학", "김경태", "박종찬", "이서영", "유다정", "임기택"]
+    name_options = NAME_OPTIONS
     
     # 세션 상태 초기화
     if "work_category_saved" not in st.session_state:
@@ -645,22 +1540,47 @@ def show_work_category_form():
         st.success("✅ 업무 기록이 저장되었습니다.")
         st.session_state.work_category_saved = False
     
+    # 이 화면에 필요한 조회를 미리 선언하고 스레드 풀에서 동시에 실행
+    # (필터 값은 위젯을 그리기 전에 session_state에서 읽어옴)
+    filter_dict, case_id_filter, case_filter_dict = _work_category_filters_from_state(name_options)
+    work_page_args = _grid_query_args("work_grid", WORK_GRID_SORT_OPTIONS, filter_dict)
+    tasks_page_args = _grid_query_args("tasks_grid", TASK_GRID_SORT_OPTIONS, {"case_id": case_id_filter, **case_filter_dict})
+    queries = {
+        "case_titles": (db.get_case_labels, {"with_manager": False}),
+        "work_categories": (db.get_work_categories_page, {"filter_dict": filter_dict, "use_replica": True, **work_page_args}),
+        "case_tasks": (db.get_case_tasks_page, {
+            "case_id": case_id_filter, "filter_dict": case_filter_dict, "use_replica": True, **tasks_page_args
+        })
+    }
+    if st.session_state.get("link_to_case"):
+        queries["active_case_labels"] = (
+            db.search_case_labels, {"prefix": st.session_state.get("case_search_prefix", ""), "status": "진행 중"}
+        )
+    data = db.load_concurrently(queries)
+    
     # 사건 연결 여부 선택
     link_to_case = st.checkbox("사건에 연결하기", value=False, key="link_to_case")
     
     # 사건 목록 가져오기 (연결 옵션 선택 시)
     selected_case_id = None
     if link_to_case:
-        cases_df = db.get_cases(filter_dict={"status": "진행 중"})
-        if not cases_df.empty:
-            # 사건 선택 드롭다운
-            case_options = cases_df["id"].tolist()
+        case_search_prefix = st.text_input("사건명 검색 (앞글자)", key="case_search_prefix")
+        if "active_case_labels" in data:
+            case_labels = data["active_case_labels"]
+        else:
+            case_labels = db.search_case_labels(case_search_prefix, status="진행 중")
+        
+        if case_labels:
+            # 사건 선택 드롭다운 (ID → 표시 이름 dict 조회)
             selected_case_id = st.selectbox(
                 "연결할 사건 선택",
-                case_options,
-                format_func=lambda x: f"{cases_df[cases_df['id'] == x]['title'].iloc[0]} (담당: {cases_df[cases_df['id'] == x]['manager'].iloc[0]})",
+                list(case_labels),
+                format_func=case_labels.get,
                 key="selected_case"
             )
+        elif case_search_prefix:
+            st.warning("검색어로 시작하는 진행 중인 사건이 없습니다.")
+            link_to_case = False
         else:
             st.warning("진행 중인 사건이 없습니다.")
             link_to_case = False
@@ -750,16 +1670,6 @@ def show_work_category_form():
     # 기록된 데이터 조회 및 표시
     st.subheader("기록된 업무 내역")
     
-    # 상태에 따른 스타일링 적용 함수 - 함수를 여기로 옮겨서 모든 탭에서 접근 가능하게 함
-    def highlight_status(val):
-        if val == "완료":
-            return "background-color: lightgreen"
-        elif val == "진행 중":
-            return "background-color: lightyellow"
-        elif val == "미완료":
-            return "background-color: lightcoral"
-        return ""
-    
     # 필터링 옵션 (탭으로 구분)
     tab1, tab2 = st.tabs(["일반 업무 기록", "사건 관련 업무"])
     
@@ -786,43 +1696,25 @@ def show_work_category_form():
             
             filter_writer = st.selectbox("작성자 필터", ["전체"] + name_options, key="filter_writer_general")
         
-        # 필터 적용하여 데이터 조회
-        filter_dict = {}
-        
-        if filter_main != "전체":
-            filter_dict["main_category"] = filter_main
-        
-        if filter_sub != "전체":
-            filter_dict["sub_category"] = filter_sub
+        # 필터가 적용된 현재 페이지 데이터 (상단에서 동시 조회)
+        df, total = data["work_categories"]
         
-        if filter_status != "전체":
-            filter_dict["status"] = filter_status
-            
-        if filter_writer != "전체":
-            filter_dict["writer"] = filter_writer
-        
-        df = db.get_work_categories(filter_dict)
-        
-        if df.empty:
+        if total == 0:
             st.info("기록된 업무가 없습니다.")
         else:
             # 데이터프레임에서 중요 컬럼만 선택하여 표시
             display_df = df[["id", "writer", "main_category", "sub_category", "content", "start_date", "end_date", "status"]]
             display_df.columns = ["ID", "작성자", "대분류", "소분류", "업무내용", "시작일", "종료일", "상태"]
             
-            # 스타일 적용
-            styled_df = display_df.style.map(highlight_status, subset=["상태"])
+            # 테이블 표시 (현재 페이지만)
+            show_paged_grid("work_grid", display_df, total, WORK_GRID_SORT_OPTIONS)
             
-            # 테이블 표시
-            st.dataframe(styled_df, use_container_width=True)
-            
-            # 엑셀 다운로드 버튼
-            excel_data = utils.create_excel_report(df)
-            st.download_button(
-                label="Excel로 다운로드",
-                data=excel_data,
-                file_name=f"work_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            # 엑셀 다운로드 버튼 (요청 시 필터에 맞는 전체 데이터로 생성)
+            show_excel_export(
+                "work_excel", filter_dict,
+                lambda: db.get_work_categories(filter_dict, use_replica=True),
+                file_prefix="work_report",
+                job=("work_categories", {"filters": filter_dict})
             )
     
     # 탭 2: 사건 관련 업무 (case_tasks 테이블)
@@ -830,13 +1722,13 @@ def show_work_category_form():
         # 필터링 옵션
         with st.expander("필터 옵션", expanded=False):
             # 사건 선택 필터
-            cases_all_df = db.get_cases()
-            if not cases_all_df.empty:
-                case_filter_options = ["전체"] + cases_all_df["id"].tolist()
+            case_titles = data["case_titles"]
+            if case_titles:
+                case_filter_options = ["전체"] + list(case_titles)
                 selected_case_filter = st.selectbox(
                     "사건 필터",
                     case_filter_options,
-                    format_func=lambda x: "전체" if x == "전체" else f"{cases_all_df[cases_all_df['id'] == x]['title'].iloc[0]}",
+                    format_func=lambda x: "전체" if x == "전체" else case_titles[x],
                     key="selected_case_filter"
                 )
             else:
@@ -858,34 +1750,14 @@ def show_work_category_form():
             
             task_filter_writer = st.selectbox("작성자 필터", ["전체"] + name_options, key="filter_writer_case")
         
-        # 필터 적용하여 데이터 조회
-        case_filter_dict = {}
-        case_id_filter = None
-        
-        if selected_case_filter and selected_case_filter != "전체":
-            case_id_filter = selected_case_filter
-        
-        if task_filter_main != "전체":
-            case_filter_dict["main_category"] = task_filter_main
-        
-        if task_filter_sub != "전체":
-            case_filter_dict["sub_category"] = task_filter_sub
+        # 사건 세부 작업의 현재 페이지 데이터 (상단에서 동시 조회)
+        tasks_df, tasks_total = data["case_tasks"]
         
-        if task_filter_writer != "전체":
-            case_filter_dict["writer"] = task_filter_writer
-        
-        # 사건 세부 작업 데이터 가져오기
-        tasks_df = db.get_case_tasks(case_id=case_id_filter, filter_dict=case_filter_dict)
-        
-        if tasks_df.empty:
+        if tasks_total == 0:
             st.info("등록된 사건 관련 업무가 없습니다.")
         else:
-            # 사건 정보 연결
-            if not cases_all_df.empty:
-                # 사건 ID와 사건명을 매핑
-                case_id_to_title = dict(zip(cases_all_df["id"], cases_all_df["title"]))
-                # 사건 ID 컬럼에 사건명 매핑
-                tasks_df["case_title"] = tasks_df["case_id"].map(case_id_to_title)
+            # 사건 ID 컬럼에 사건명 매핑
+            tasks_df["case_title"] = tasks_df["case_id"].map(case_titles)
             
             # 표시할 컬럼 선택 및 정렬
             display_tasks_df = tasks_df[["id", "case_title", "writer", "main_category", "sub_category", 
@@ -893,20 +1765,387 @@ def show_work_category_form():
             display_tasks_df.columns = ["ID", "사건명", "작성자", "대분류", "소분류", "업무내용", 
                                           "시작일", "종료일", "소요시간", "상태"]
             
-            # 스타일 적용
-            styled_tasks_df = display_tasks_df.style.map(highlight_status, subset=["상태"])
-            
-            # 테이블 표시
-            st.dataframe(styled_tasks_df, use_container_width=True)
+            # 테이블 표시 (현재 페이지만)
+            show_paged_grid("tasks_grid", display_tasks_df, tasks_total, TASK_GRID_SORT_OPTIONS)
             
-            # 엑셀 다운로드 버튼
-            tasks_excel_data = utils.create_excel_report(tasks_df)
-            st.download_button(
-                label="Excel로 다운로드",
-                data=tasks_excel_data,
-                file_name=f"case_tasks_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="download_tasks_btn"
+            # 엑셀 다운로드 버튼 (요청 시 필터에 맞는 전체 데이터로 생성)
+            show_excel_export(
+                "tasks_excel", {"case_id": case_id_filter, **case_filter_dict},
+                lambda: db.get_case_tasks(case_id=case_id_filter, filter_dict=case_filter_dict, use_replica=True),
+                file_prefix="case_tasks_report",
+                job=("case_tasks", {"case_id": case_id_filter, "filters": case_filter_dict})
+            )
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _statistics_figures(generation, start_date, end_date, include_archive):
+    """
+    통계 차트를 JSON으로 직렬화해 캐시
+    
+    generation(DB 변경 카운터)이 캐시 키에 포함되므로 데이터가 바뀌면 새로 계산됩니다.
+    """
+    metrics.CACHE_MISSES.inc(cache="statistics_figures")
+    stats = db.get_work_stats(start_date, end_date, include_archive=include_archive)
+    figures = {
+        "category": utils.create_category_chart(stats["by_category"]),
+        "status": utils.create_status_chart(stats["by_status"]),
+        "monthly": utils.create_monthly_chart(stats["by_month"]),
+        "writer": utils.create_writer_hours_chart(stats["by_writer"])
+    }
+    totals = {
+        "count": int(stats["by_status"]["count"].sum()),
+        "hours": float(stats["by_writer"]["hours"].sum())
+    }
+    return {name: fig.to_json() if fig is not None else None for name, fig in figures.items()}, totals
+
+def show_statistics():
+    """통계 대시보드 화면"""
+    st.header("📈 통계")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("시작일", datetime.now() - timedelta(days=365), key="stats_start_date")
+    with col2:
+        end_date = st.date_input("종료일", datetime.now(), key="stats_end_date")
+    
+    # 기간이 보관된 사건의 작업 시기와 겹치면 보관 DB도 함께 집계
+    start_date_str = start_date.strftime("%Y-%m-%d")
+    metrics.CACHE_REQUESTS.inc(cache="statistics_figures")
+    figures, totals = _statistics_figures(
+        db.get_change_counter(), start_date_str, end_date.strftime("%Y-%m-%d"), db.archive_covers_period(start_date_str)
+    )
+    
+    if totals["count"] == 0:
+        st.info("해당 기간에 기록된 업무가 없습니다.")
+        return
+    
+    metric_col1, metric_col2 = st.columns(2)
+    with metric_col1:
+        st.metric("업무 건수", f"{totals['count']:,}")
+    with metric_col2:
+        st.metric("총 소요 시간", f"{totals['hours']:,.1f} 시간")
+    
+    chart_col1, chart_col2 = st.columns(2)
+    for column, names in [(chart_col1, ["category", "monthly"]), (chart_col2, ["status", "writer"])]:
+        with column:
+            for name in names:
+                if figures[name]:
+                    st.plotly_chart(pio.from_json(figures[name]), use_container_width=True)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _timesheet_matrix(generation, start_date, end_date, freq, weekly_target, include_archive):
+    """
+    근무시간 행렬을 기간·단위별로 캐시
+    
+    generation(DB 변경 카운터)이 캐시 키에 포함되므로 데이터가 바뀌면 새로 계산됩니다.
+    """
+    metrics.CACHE_MISSES.inc(cache="timesheet_matrix")
+    hours_df = db.get_hours_by_writer_date(start_date, end_date, include_archive=include_archive)
+    matrix, targets = utils.build_timesheet(
+        hours_df, start_date, end_date, freq=freq, staff=NAME_OPTIONS, weekly_target=weekly_target
+    )
+    return matrix, targets, utils.timesheet_flags(matrix, targets)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _timesheet_excel(generation, start_date, end_date, freq, weekly_target, include_archive):
+    """근무시간 행렬 Excel 파일을 같은 캐시 키로 보관"""
+    metrics.CACHE_MISSES.inc(cache="timesheet_excel")
+    matrix, targets, _ = _timesheet_matrix(generation, start_date, end_date, freq, weekly_target, include_archive)
+    return utils.create_timesheet_excel(matrix, targets)
+
+def show_timesheet():
+    """직원별 근무시간 집계 화면 (업무 기록 + 사건 세부 작업 소요 시간)"""
+    st.header("🕒 근무시간")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        start_date = st.date_input("시작일", datetime.now() - timedelta(days=365), key="timesheet_start_date")
+    with col2:
+        end_date = st.date_input("종료일", datetime.now(), key="timesheet_end_date")
+    with col3:
+        unit = st.radio("집계 단위", ["주", "일"], horizontal=True, key="timesheet_unit")
+    with col4:
+        weekly_target = st.number_input(
+            "주간 목표 시간", min_value=0.0, step=1.0,
+            value=float(st.session_state.config.get("주간목표시간", 40)), key="timesheet_weekly_target"
+        )
+    
+    if start_date > end_date:
+        st.warning("시작일이 종료일보다 늦습니다.")
+        return
+    
+    start_str, end_str = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    # 기간이 보관된 사건의 작업 시기와 겹치면 보관 DB도 함께 집계
+    include_archive = db.archive_covers_period(start_str)
+    metrics.CACHE_REQUESTS.inc(cache="timesheet_matrix")
+    metrics.CACHE_REQUESTS.inc(cache="timesheet_excel")
+    matrix, targets, flags = _timesheet_matrix(
+        db.get_change_counter(), start_str, end_str, "W" if unit == "주" else "D", weekly_target, include_archive
+    )
+    
+    # 직원별 합계와 목표 대비 미달/초과 기간 수
+    summary = pd.DataFrame({
+        "총 근무시간": matrix.sum(axis=1),
+        "목표 시간": float(targets.sum()),
+        "미달 기간": (flags == -1).sum(axis=1),
+        "초과 기간": (flags == 1).sum(axis=1)
+    })
+    st.subheader("직원별 요약")
+    st.dataframe(
+        summary,
+        use_container_width=True,
+        column_config={
+            "총 근무시간": st.column_config.NumberColumn(format="%.1f"),
+            "목표 시간": st.column_config.NumberColumn(format="%.1f")
+        }
+    )
+    
+    st.subheader(f"{unit}별 근무시간")
+    st.caption("🔻 목표 미달, 🔺 목표 초과")
+    
+    # 셀 스타일 대신 기호를 붙인 문자열 행렬로 표시 (1년치 일 단위도 바로 렌더링)
+    display_df = utils.format_timesheet(matrix, flags)
+    st.dataframe(display_df, use_container_width=True)
+    
+    st.download_button(
+        label="Excel로 다운로드",
+        data=_timesheet_excel(
+            db.get_change_counter(), start_str, end_str, "W" if unit == "주" else "D", weekly_target, include_archive
+        ),
+        file_name=f"timesheet_{start_str}_{end_str}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key="timesheet_download"
+    )
+
+def _submit_export_job(kind, params):
+    """내보내기 작업 등록 후 안내 메시지 표시"""
+    try:
+        job_id = export_jobs.submit_job(kind, params)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    st.toast(f"내보내기 작업 #{job_id}을(를) 등록했습니다. '📤 내보내기 작업' 메뉴에서 받을 수 있습니다.")
+    return job_id
+
+# 진행 중인 작업이 있을 때 작업 목록을 다시 그리는 주기(초)
+EXPORT_JOB_POLL_SECONDS = 2
+
+EXPORT_JOB_STATUS_ICONS = {"대기": "⏳", "실행 중": "⚙️", "완료": "✅", "실패": "❌", "만료": "🗑️"}
+
+def _on_prepare_export_download(job_id):
+    st.session_state.export_download = (job_id, export_jobs.read_artifact(job_id))
+
+def _on_export_downloaded():
+    """'다운로드' 버튼 콜백 - 내려받은 파일 내용은 세션에서 지움"""
+    st.session_state.pop("export_download", None)
+
+@_trace_fragment
+def show_export_job_list(polling):
+    """최근 내보내기 작업 목록 (진행률, 완료 파일 다운로드)"""
+    jobs = db.get_export_jobs(limit=30)
+    
+    # 폴링 중이던 작업이 모두 끝나면 전체를 다시 실행해 폴링을 멈춤
+    if polling and not jobs["status"].isin(db.EXPORT_JOB_ACTIVE_STATUSES).any():
+        st.rerun()
+    
+    if jobs.empty:
+        st.info("등록된 내보내기 작업이 없습니다.")
+        return
+    
+    download = st.session_state.get("export_download")
+    # 준비해 둔 작업이 목록에서 사라졌거나 더 이상 완료 상태가 아니면 파일 내용을 버림
+    if download and not ((jobs["id"] == download[0]) & (jobs["status"] == "완료")).any():
+        st.session_state.pop("export_download", None)
+        download = None
+    for _, job in jobs.iterrows():
+        job_id = int(job["id"])
+        message = job["message"] if pd.notna(job["message"]) else ""
+        col1, col2, col3 = st.columns([3, 4, 2])
+        with col1:
+            st.markdown(f"{EXPORT_JOB_STATUS_ICONS.get(job['status'], '')} **#{job_id} {job['label']}**")
+            st.caption(f"등록 {job['created_at']}")
+        with col2:
+            if job["status"] in db.EXPORT_JOB_ACTIVE_STATUSES:
+                st.progress(float(job["progress"]), text=message or job["status"])
+            elif job["status"] == "완료":
+                st.caption(f"{job['file_name']} (보관 기한 {job['expires_at']})")
+            else:
+                st.caption(f"{job['status']}: {message}")
+        with col3:
+            if job["status"] != "완료":
+                continue
+            # 파일 내용은 받기를 누른 작업만 읽음 (목록을 그릴 때마다 모든 파일을 읽지 않도록)
+            if download and download[0] == job_id and download[1] is not None:
+                st.download_button(
+                    "다운로드", data=download[1], file_name=job["file_name"], key=f"export_download_{job_id}",
+                    on_click=_on_export_downloaded
+                )
+            else:
+                st.button("받기", key=f"export_prepare_{job_id}",
+                          on_click=_on_prepare_export_download, args=(job_id,))
+
+def show_export_jobs():
+    """백그라운드 내보내기 작업 등록과 진행 상황 화면"""
+    st.header("📤 내보내기 작업")
+    st.caption(f"작업은 최대 {export_jobs.MAX_CONCURRENT_JOBS}개까지 동시에 실행되며, "
+               f"완료된 파일은 {export_jobs.ARTIFACT_TTL_HOURS}시간 동안 보관됩니다.")
+    
+    with st.expander("새 작업 등록", expanded=True):
+        kinds = {key: label for key, (label, _) in export_jobs.EXPORT_KINDS.items()}
+        kind = st.selectbox("작업 종류", list(kinds), format_func=kinds.get, key="export_job_kind")
+        params = {}
+        
+        if kind in ("daily_rollup", "timesheet"):
+            today = datetime.now()
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("시작일", today.replace(day=1), key="export_job_start")
+            with col2:
+                end_date = st.date_input("종료일", today, key="export_job_end")
+            params = {"start": start_date.strftime("%Y-%m-%d"), "end": end_date.strftime("%Y-%m-%d")}
+            if kind == "daily_rollup":
+                group_label = st.radio("Excel 시트 구분", ["작성자별", "주별"], horizontal=True, key="export_job_group")
+                params["group_by"] = "name" if group_label == "작성자별" else "week"
+            else:
+                unit = st.radio("집계 단위", ["주", "일"], horizontal=True, key="export_job_unit")
+                params["freq"] = "W" if unit == "주" else "D"
+                params["weekly_target"] = float(st.session_state.config.get("주간목표시간", 40))
+        elif kind == "work_categories":
+            writer = st.selectbox("작성자", ["전체"] + NAME_OPTIONS, key="export_job_writer")
+            params = {"filters": {} if writer == "전체" else {"writer": writer}}
+        elif kind in ("case_tasks", "dossiers"):
+            cases_df = db.get_cases()
+            titles = {int(row["id"]): f"[{int(row['id'])}] {row['title']}" for _, row in cases_df.iterrows()}
+            if kind == "dossiers":
+                case_ids = st.multiselect("대상 사건", list(titles), format_func=titles.get, key="export_job_cases")
+                params = {"case_ids": case_ids}
+            else:
+                case_id = st.selectbox("대상 사건", [None] + list(titles),
+                                       format_func=lambda value: "전체" if value is None else titles[value],
+                                       key="export_job_case")
+                params = {"case_id": case_id}
+        
+        invalid = ("start" in params and params["start"] > params["end"]) or (kind == "dossiers" and not params["case_ids"])
+        if st.button("작업 등록", key="export_job_submit", disabled=invalid):
+            _submit_export_job(kind, params)
+    
+    st.subheader("최근 작업")
+    polling = db.count_active_export_jobs() > 0
+    st.fragment(show_export_job_list, run_every=EXPORT_JOB_POLL_SECONDS if polling else None)(polling)
+
+def show_db_admin():
+    """DB 관리 화면 표시"""
+    st.header("🛠️ DB 관리")
+    
+    # 유지보수 실행 결과 알림 (새로고침 후 1회 표시)
+    if st.session_state.get("maintenance_result"):
+        result = st.session_state.maintenance_result
+        st.success(f"유지보수가 완료되었습니다. (반환된 빈 페이지: {result['freed_pages']})")
+        st.session_state.maintenance_result = None
+    
+    stats = db.get_db_stats()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("파일 크기", f"{stats['file_size'] / 1024 / 1024:.2f} MB")
+    with col2:
+        st.metric("전체 페이지", f"{stats['page_count']:,}")
+    with col3:
+        st.metric("빈 페이지", f"{stats['freelist_count']:,}")
+    with col4:
+        st.metric("페이지 크기", f"{stats['page_size']:,} B")
+    
+    st.subheader("유지보수 이력")
+    history_col1, history_col2 = st.columns(2)
+    with history_col1:
+        st.write(f"**마지막 유지보수**: {stats['last_maintenance'] or '-'}")
+        st.write(f"**마지막 optimize**: {stats['last_optimize'] or '-'}")
+    with history_col2:
+        st.write(f"**마지막 ANALYZE**: {stats['last_analyze'] or '-'}")
+        st.write(f"**마지막 vacuum**: {stats['last_vacuum'] or '-'}")
+    
+    if stats["auto_vacuum"] != 2:
+        st.warning("auto_vacuum 모드가 INCREMENTAL이 아닙니다. 앱을 다시 시작하면 전환됩니다.")
+    
+    # 보고서/통계 조회용 읽기 전용 복제본 상태
+    replica_status = db.get_replica_status()
+    if replica_status["enabled"]:
+        freshness = "최신" if replica_status["is_fresh"] else "갱신 대기 중 (운영 DB로 조회)"
+        st.write(f"**읽기 복제본**: {freshness}, 마지막 갱신 {replica_status['refreshed_at']} "
+                 f"(세대 {replica_status['generation']})")
+    else:
+        st.write("**읽기 복제본**: 사용 안 함")
+    
+    st.subheader("테이블/인덱스 크기")
+    objects_df = stats["objects"]
+    if "size" in objects_df.columns:
+        objects_df = objects_df.rename(columns={
+            "type": "유형", "table_name": "테이블", "name": "이름", "pages": "페이지 수", "size": "크기(B)"
+        })
+    else:
+        objects_df = objects_df.rename(columns={"type": "유형", "table_name": "테이블", "name": "이름"})
+        st.info("이 SQLite 빌드는 dbstat을 지원하지 않아 크기 정보를 표시할 수 없습니다.")
+    st.dataframe(objects_df, use_container_width=True, hide_index=True)
+    
+    analyze = st.checkbox("ANALYZE 포함 (통계 정보 전체 갱신)", value=True)
+    if st.button("지금 유지보수 실행", key="run_maintenance_btn"):
+        with st.spinner("유지보수 실행 중..."):
+            st.session_state.maintenance_result = db.run_maintenance(analyze=analyze)
+        st.rerun()
+    
+    # 완료 사건 보관
+    st.subheader("완료 사건 보관")
+    st.caption("완료된 지 오래된 사건과 진행 내역/세부 작업/장비/연결된 업무 기록을 보관 DB로 옮깁니다. "
+               "보관된 사건은 사건 관리 화면에서 '보관된 사건 포함'을 선택하면 조회할 수 있습니다.")
+    
+    if st.session_state.get("archive_result") is not None:
+        moved = st.session_state.archive_result
+        st.success(f"사건 {moved.get('cases', 0)}건을 보관 DB로 이동했습니다.")
+        st.session_state.archive_result = None
+    
+    archive_stats = db.get_archive_stats()
+    if archive_stats:
+        archive_df = pd.DataFrame(
+            [{"테이블": table, "보관된 행 수": count} for table, count in archive_stats.items()]
+        )
+        st.dataframe(archive_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("아직 보관된 사건이 없습니다.")
+    
+    archive_months = st.number_input("보관 기준 (완료 후 경과 개월 수)", min_value=1, value=12, step=1)
+    if st.button("보관 실행", key="run_archive_btn"):
+        with st.spinner("보관 중..."):
+            st.session_state.archive_result = db.archive_completed_cases(months=archive_months)
+        st.rerun()
+    
+    # 중복 등록 의심 사건
+    st.subheader("중복 의심 사건")
+    st.caption("사건명/의뢰인/설명이 비슷한 사건을 유사도 색인(MinHash/LSH)으로 묶어 보여줍니다.")
+    
+    threshold = st.slider("유사도 기준", min_value=0.3, max_value=1.0, value=0.5, step=0.05, key="duplicate_threshold")
+    dup_col1, dup_col2 = st.columns(2)
+    with dup_col1:
+        if st.button("중복 사건 검색", key="find_duplicates_btn"):
+            with st.spinner("검색 중..."):
+                st.session_state.duplicate_clusters = db.find_duplicate_case_clusters(threshold)
+    with dup_col2:
+        if st.button("유사도 색인 재구성", key="rebuild_similarity_btn"):
+            with st.spinner("색인 재구성 중..."):
+                count = db.rebuild_case_similarity_index()
+            st.success(f"사건 {count}건의 유사도 색인을 재구성했습니다.")
+    
+    clusters_df = st.session_state.get("duplicate_clusters")
+    if clusters_df is not None:
+        if clusters_df.empty:
+            st.info("중복 의심 사건이 없습니다.")
+        else:
+            st.write(f"중복 의심 묶음 {clusters_df['cluster'].nunique()}개")
+            st.dataframe(
+                clusters_df.rename(columns={
+                    "cluster": "묶음", "id": "ID", "title": "사건명", "client": "의뢰인",
+                    "manager": "담당자", "status": "상태", "start_date": "시작일"
+                }),
+                use_container_width=True,
+                hide_index=True
             )
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+첨부 파일 저장소
+
+파일 본문은 내용의 sha256을 이름으로 attachments/objects 아래에 한 번만 저장하고
+(같은 사진을 여러 사건에 첨부해도 파일은 하나), 메타 정보는 db의 attachments 테이블에 기록합니다.
+썸네일/미리보기 이미지는 백그라운드 스레드 풀에서 Pillow로 미리 만들어 두므로,
+화면에서는 원본을 디코딩하지 않고 작은 JPEG 파일만 읽습니다.
+"""
+import os
+import sqlite3
+import hashlib
+import mimetypes
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import db
+
+ATTACHMENT_DIR = Path("attachments")
+OBJECT_DIR = ATTACHMENT_DIR / "objects"
+THUMB_DIR = ATTACHMENT_DIR / "thumbs"
+PREVIEW_DIR = ATTACHMENT_DIR / "previews"
+
+# 썸네일(목록)과 미리보기(선택 시) 최대 크기
+THUMB_SIZE = (256, 256)
+PREVIEW_SIZE = (1280, 1280)
+
+THUMB_WORKERS = 2
+
+_thumb_pool = None
+_thumb_pool_lock = threading.Lock()
+_pending = set()
+_pending_lock = threading.Lock()
+
+def object_path(sha256):
+    """원본 파일 경로 (앞 2글자 하위 폴더로 분산)"""
+    return OBJECT_DIR / sha256[:2] / sha256
+
+def thumbnail_path(sha256):
+    """썸네일 경로 (아직 생성되지 않았으면 None)"""
+    path = THUMB_DIR / f"{sha256}.jpg"
+    return path if path.exists() else None
+
+def preview_path(sha256):
+    """미리보기 경로 (아직 생성되지 않았으면 None)"""
+    path = PREVIEW_DIR / f"{sha256}.jpg"
+    return path if path.exists() else None
+
+def store_bytes(data):
+    """
+    파일 내용을 저장소에 저장 (이미 같은 내용이 있으면 다시 쓰지 않음)
+
+    Returns:
+        str: sha256
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = object_path(sha256)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{sha256}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+    return sha256
+
+def _get_thumb_pool():
+    global _thumb_pool
+    with _thumb_pool_lock:
+        if _thumb_pool is None:
+            _thumb_pool = ThreadPoolExecutor(max_workers=THUMB_WORKERS, thread_name_prefix="attachment-thumb")
+        return _thumb_pool
+
+def _render_images(sha256):
+    """원본에서 썸네일과 미리보기 JPEG 생성 (이미지가 아니면 '없음'으로 기록)"""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(object_path(sha256)) as image:
+            # JPEG는 디코딩 단계에서 축소해 대용량 사진도 빠르게 처리
+            image.draft("RGB", PREVIEW_SIZE)
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+            for directory, size in [(PREVIEW_DIR, PREVIEW_SIZE), (THUMB_DIR, THUMB_SIZE)]:
+                directory.mkdir(parents=True, exist_ok=True)
+                image.thumbnail(size)
+                temp_path = directory / f"{sha256}.tmp.jpg"
+                image.save(temp_path, "JPEG", quality=85)
+                os.replace(temp_path, directory / f"{sha256}.jpg")
+        status = "완료"
+    except Exception:
+        status = "없음"
+
+    # 상태 기록에 실패해도(예: 일괄 저장 중 잠금) 예약 목록에서는 빼서 다음 화면 표시 때 다시 예약되게 함
+    try:
+        db.set_attachment_thumb_status(sha256, status)
+    except sqlite3.Error as e:
+        print(f"썸네일 상태 기록 중 오류 발생 ({sha256[:12]}): {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(sha256)
+
+def schedule_thumbnail(sha256):
+    """썸네일 생성 예약 (이미 생성 중이면 무시)"""
+    with _pending_lock:
+        if sha256 in _pending:
+            return
+        _pending.add(sha256)
+    _get_thumb_pool().submit(_render_images, sha256)
+
+def save_attachment(case_id, file_name, data, device_id=None, description=None):
+    """
+    첨부 파일 저장 후 메타 정보 기록, 썸네일은 백그라운드에서 생성
+
+    Returns:
+        int: 첨부 ID
+    """
+    sha256 = store_bytes(data)
+    mime_type = mimetypes.guess_type(file_name)[0]
+    is_image = bool(mime_type and mime_type.startswith("image/"))
+    thumb_status = "완료" if thumbnail_path(sha256) else ("대기" if is_image else "없음")
+
+    attachment_id = db.add_attachment(
+        sha256, case_id, file_name, len(data), mime_type=mime_type,
+        device_id=device_id, description=description, thumb_status=thumb_status
+    )
+    if thumb_status == "대기":
+        schedule_thumbnail(sha256)
+    return attachment_id
+
+def read_attachment(sha256):
+    """원본 파일 내용"""
+    return object_path(sha256).read_bytes()
+
+def delete_attachment(attachment_id):
+    """첨부 삭제 (다른 첨부가 참조하지 않는 파일은 원본/썸네일까지 삭제)"""
+    sha256 = db.delete_attachment(attachment_id)
+    if sha256:
+        for path in [object_path(sha256), THUMB_DIR / f"{sha256}.jpg", PREVIEW_DIR / f"{sha256}.jpg"]:
+            if path.exists():
+                path.unlink()
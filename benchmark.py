@@ -0,0 +1,709 @@
+"""
+db.py / utils.py 마이크로 벤치마크
+
+시드를 고정한 합성 데이터 생성기로 규모별 DB를 만든 뒤, db의 get_*/add_* 함수와 utils의 create_* 함수를
+반복 실행해 소요 시간을 JSON 보고서로 저장합니다. 저장해 둔 기준(baseline) 보고서를 주면
+항목별 배율을 비교해 느려진 항목을 표시합니다.
+
+합성 데이터는 같은 시드와 기준일이면 항상 같은 내용으로 만들어지므로 변경 전후를 같은 조건에서 비교할 수 있습니다.
+
+사용 예:
+    python benchmark.py generate --scale medium --db demo.db
+    python benchmark.py run --scales small medium -o bench_baseline.json
+    python benchmark.py run --scales small medium -o bench.json --baseline bench_baseline.json
+    python benchmark.py coldstart -o bench_coldstart.json --baseline bench_coldstart_baseline.json
+"""
+import os
+import ast
+import gc
+import sys
+import json
+import time
+import random
+import sqlite3
+import inspect
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# 규모별 합성 데이터 양 (years: 일일 업무/업무 기록을 만드는 기간)
+SCALES = {
+    "small": {"years": 1, "cases": 300, "case_progresses": 3000, "case_tasks": 3000,
+              "digital_devices": 1000, "work_categories": 3000},
+    "medium": {"years": 3, "cases": 2000, "case_progresses": 20000, "case_tasks": 20000,
+               "digital_devices": 6000, "work_categories": 15000},
+    "large": {"years": 5, "cases": 5000, "case_progresses": 60000, "case_tasks": 60000,
+              "digital_devices": 15000, "work_categories": 40000}
+}
+
+DEFAULT_SEED = 20240501
+
+# 합성 데이터의 마지막 날짜 (오늘 날짜에 따라 결과가 달라지지 않도록 고정)
+DEFAULT_END_DATE = "2026-06-30"
+
+DEFAULT_REPEAT = 5
+
+# 기준 대비 이 비율 이상 느려지면 느려짐으로 표시
+DEFAULT_THRESHOLD = 0.2
+
+# 중앙값 차이가 이보다 작으면 측정 오차로 보고 비교하지 않음(ms)
+NOISE_FLOOR_MS = 1.0
+
+# 측정 대상에서 빼는 함수 (DB를 조회하지 않고 메모리의 SQL 추적 기록만 읽음)
+UNCOVERED_EXCLUDED = {"db.get_query_history", "db.get_query_trace"}
+
+CASE_TYPES = ["아전범", "명예훼손", "사기", "횡령", "기술유출", "이혼소송", "노동분쟁"]
+CLIENT_SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+CLIENT_GIVEN_NAMES = ["민준", "서연", "도윤", "하은", "시우", "지민", "예준", "수아", "주원", "지호"]
+COMPANIES = ["한빛전자", "대성물산", "미래테크", "누리소프트", "청솔건설", "동해무역"]
+CASE_TITLE_TEMPLATES = [
+    "{client} 휴대폰 포렌식 분석 의뢰",
+    "{client} {case_type} 사건 디지털 증거 분석",
+    "{company} 기술유출 PC 포렌식",
+    "{client} 카카오톡 대화 복원",
+    "{company} 내부 감사 이메일 검토",
+    "{client} 블랙박스 영상 분석"
+]
+PROGRESS_TEMPLATES = [
+    "의뢰인과 통화, 자료 제출 일정 협의", "{device} 이미징 완료", "분석 결과 중간 보고",
+    "추가 자료 요청", "변호사 회의 참석", "최종 보고서 발송"
+]
+DEVICE_MODELS = {
+    "휴대폰": [("Samsung", "갤럭시 S21"), ("Samsung", "갤럭시 S23"), ("Apple", "아이폰 14pro"), ("Apple", "아이폰 12")],
+    "PC": [("Samsung", "SSD 860 EVO 500GB"), ("WD", "Blue 1TB"), ("LG", "그램 15")],
+    "블랙박스": [("아이나비", "QXD8000"), ("파인뷰", "X3000")],
+    "CCTV": [("한화", "XRN-410S")],
+    "저장장치": [("SanDisk", "Ultra USB 64GB"), ("Seagate", "Expansion 2TB")]
+}
+DEVICE_STORAGE = ["64GB", "128GB", "256GB", "500GB", "1TB", "2TB"]
+ACQUISITION_METHODS = ["FTK Imager (E01)", "ewfacquire (E01)", "Cellebrite UFED", "dd"]
+
+def _app_constants(*names):
+    """
+    app.py의 모듈 상수를 Streamlit 실행 없이 읽기
+
+    app을 import하면 유지보수/복제본 스레드가 시작되어 측정에 영향을 주므로 소스에서 값만 읽습니다.
+    """
+    tree = ast.parse(Path(__file__).with_name("app.py").read_text(encoding="utf-8"))
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id in names:
+                values[node.targets[0].id] = ast.literal_eval(node.value)
+    return [values[name] for name in names]
+
+CATEGORY_MAPPING, NAME_OPTIONS, STATUS_OPTIONS, DEVICE_STATUS_OPTIONS = _app_constants(
+    "CATEGORY_MAPPING", "NAME_OPTIONS", "STATUS_OPTIONS", "DEVICE_STATUS_OPTIONS"
+)
+
+def _date_str(day):
+    return day.strftime("%Y-%m-%d")
+
+def _random_day(rng, start, end):
+    """start~end(포함) 사이 임의 날짜"""
+    return start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+def generate_dataset(conn, scale="small", seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE):
+    """
+    빈 DB에 합성 데이터 입력 (한 트랜잭션)
+
+    같은 시드/기준일이면 항상 같은 데이터가 만들어집니다.
+
+    Args:
+        conn: db.init_db()로 테이블을 만든 DB 연결
+        scale: SCALES 키
+
+    Returns:
+        dict: 테이블별 입력 행 수
+    """
+    sizes = SCALES[scale]
+    rng = random.Random(seed)
+    last_day = datetime.strptime(end_date, "%Y-%m-%d")
+    first_day = last_day - timedelta(days=365 * sizes["years"] - 1)
+    case_subs = CATEGORY_MAPPING["사건처리"]
+    other_mains = [main for main in CATEGORY_MAPPING if main != "사건처리"]
+    counts = {}
+
+    def timestamp(day):
+        return f"{_date_str(day)} {rng.randint(8, 19):02d}:{rng.randint(0, 59):02d}:00"
+
+    # 사건 (일부는 같은 의뢰인의 2차 의뢰로 제목이 비슷하게 만들어 유사도 검색도 실제와 비슷하게 함)
+    cases = []
+    for case_id in range(1, sizes["cases"] + 1):
+        client = rng.choice(CLIENT_SURNAMES) + rng.choice(CLIENT_GIVEN_NAMES)
+        case_type = rng.choice(CASE_TYPES)
+        if cases and rng.random() < 0.03:
+            title = rng.choice(cases)[1] + " (2차)"
+        else:
+            title = rng.choice(CASE_TITLE_TEMPLATES).format(client=client, case_type=case_type,
+                                                            company=rng.choice(COMPANIES))
+        start = _random_day(rng, first_day, last_day)
+        status = rng.choices(STATUS_OPTIONS, weights=[3, 6, 1])[0]
+        end = _date_str(min(start + timedelta(days=rng.randint(7, 120)), last_day)) if status == "완료" else None
+        cases.append((
+            case_id, title, rng.choice(NAME_OPTIONS), client, case_type, status,
+            rng.choices(["높음", "보통", "낮음"], weights=[2, 5, 3])[0],
+            f"{client} 의뢰 {case_type} 관련 디지털 증거 분석", _date_str(start), end, timestamp(start)
+        ))
+    conn.executemany('''
+        INSERT INTO cases (id, title, manager, client, case_type, status, priority, description,
+                           start_date, end_date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', cases)
+    counts["cases"] = len(cases)
+
+    def case_day(case):
+        """사건 진행 기간 안의 임의 날짜"""
+        start = datetime.strptime(case[8], "%Y-%m-%d")
+        end = datetime.strptime(case[9], "%Y-%m-%d") if case[9] else min(start + timedelta(days=180), last_day)
+        return _random_day(rng, start, end)
+
+    # 디지털 장비
+    devices = []
+    for _ in range(sizes["digital_devices"]):
+        case = rng.choice(cases)
+        device_type = rng.choices(list(DEVICE_MODELS), weights=[5, 3, 1, 1, 2])[0]
+        manufacturer, model = rng.choice(DEVICE_MODELS[device_type])
+        acquired = case_day(case)
+        exam_start = acquired + timedelta(days=rng.randint(0, 5))
+        exam_end = exam_start + timedelta(days=rng.randint(1, 14))
+        devices.append((
+            case[0], device_type, f"{device_type}-{rng.randint(1, 9)}", model, _date_str(acquired),
+            _date_str(exam_start), _date_str(exam_end) if exam_end <= last_day else None,
+            rng.choice(DEVICE_STATUS_OPTIONS), f"SN{rng.getrandbits(40):010X}", manufacturer,
+            rng.choice(DEVICE_STORAGE), rng.choice(ACQUISITION_METHODS),
+            f"SHA256: {rng.getrandbits(256):064x}", timestamp(acquired)
+        ))
+    conn.executemany('''
+        INSERT INTO digital_devices (case_id, device_type, name, model, acquisition_date,
+                                     examination_start_date, examination_end_date, status, serial_number,
+                                     manufacturer, storage_size, acquisition_method, hash_value, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', devices)
+    counts["digital_devices"] = len(devices)
+
+    # 진행 내역
+    progresses = []
+    for _ in range(sizes["case_progresses"]):
+        case = rng.choice(cases)
+        day = case_day(case)
+        content = rng.choice(PROGRESS_TEMPLATES).format(device=rng.choice(list(DEVICE_MODELS)))
+        progresses.append((case[0], _date_str(day), rng.choice(NAME_OPTIONS), content, timestamp(day)))
+    conn.executemany('''
+        INSERT INTO case_progresses (case_id, date, writer, content, created_at) VALUES (?, ?, ?, ?, ?)
+    ''', progresses)
+    counts["case_progresses"] = len(progresses)
+
+    # 사건 세부 작업
+    tasks = []
+    for _ in range(sizes["case_tasks"]):
+        case = rng.choice(cases)
+        start = case_day(case)
+        sub = rng.choice(case_subs)
+        tasks.append((
+            case[0], "사건처리", sub, f"{sub} - {case[1]}", _date_str(start),
+            _date_str(start + timedelta(days=rng.randint(0, 3))),
+            rng.choices(STATUS_OPTIONS, weights=[2, 7, 1])[0], rng.choice(NAME_OPTIONS),
+            rng.randint(1, 16) / 2, timestamp(start)
+        ))
+    conn.executemany('''
+        INSERT INTO case_tasks (case_id, main_category, sub_category, content, start_date, end_date,
+                                status, writer, hours, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', tasks)
+    counts["case_tasks"] = len(tasks)
+
+    # 업무 기록 (사건처리는 사건과 연결)
+    works = []
+    for _ in range(sizes["work_categories"]):
+        start = _random_day(rng, first_day, last_day)
+        if rng.random() < 0.4:
+            main, case_id = "사건처리", rng.choice(cases)[0]
+        else:
+            main, case_id = rng.choice(other_mains), None
+        sub = rng.choice(CATEGORY_MAPPING[main])
+        works.append((
+            _date_str(start), main, sub, f"{sub} 업무", _date_str(start),
+            _date_str(start + timedelta(days=rng.randint(0, 2))),
+            rng.choices(STATUS_OPTIONS, weights=[2, 7, 1])[0], rng.choice(NAME_OPTIONS),
+            rng.randint(1, 16) / 2, case_id, timestamp(start)
+        ))
+    conn.executemany('''
+        INSERT INTO work_categories (date, main_category, sub_category, content, start_date, end_date,
+                                     status, writer, hours, case_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', works)
+    counts["work_categories"] = len(works)
+
+    # 일일 업무 (평일마다 직원별 약 90% 제출)
+    daily = []
+    day = first_day
+    while day <= last_day:
+        if day.weekday() < 5:
+            for name in NAME_OPTIONS:
+                if rng.random() < 0.9:
+                    lines = [f"- {rng.choice(case_subs)}: {rng.choice(cases)[1]}" for _ in range(rng.randint(1, 4))]
+                    daily.append((name, _date_str(day), "\n".join(lines)))
+        day += timedelta(days=1)
+    conn.executemany("INSERT INTO daily_work (name, date, content) VALUES (?, ?, ?)", daily)
+    counts["daily_work"] = len(daily)
+
+    conn.commit()
+    return counts
+
+def _use_database(db, db_path):
+    """db 모듈이 사용할 DB 파일을 바꾸고 테이블 생성 (db 함수는 호출 시점에 모듈 전역 DB_PATH를 읽음)"""
+    db.DB_PATH = db_path
+    db._label_cache.update(generation=None, maps={})
+    db.init_db()
+
+def build_database(db, db_path, scale, seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE):
+    """합성 데이터 DB 생성 후 유사도 색인/통계 갱신"""
+    _use_database(db, db_path)
+    conn = sqlite3.connect(db_path)
+    counts = generate_dataset(conn, scale, seed, end_date)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    db.rebuild_case_similarity_index()
+    return counts
+
+def build_benchmarks(db, utils, seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE):
+    """
+    측정 항목 목록 [(항목 이름, 대상 함수 이름, 호출 함수), ...]
+
+    조회 인자(사건 ID, 작성자, 기간)는 시드로 고정해 실행마다 같은 조건으로 측정합니다.
+    """
+    rng = random.Random(seed + 1)
+    conn = sqlite3.connect(db.DB_PATH)
+    case_id, case_title = conn.execute("SELECT id, title FROM cases ORDER BY id LIMIT 1 OFFSET ?",
+                                       (rng.randint(0, 99),)).fetchone()
+    # 장비/작업이 가장 많은 사건도 함께 측정 (최악의 경우)
+    busy_case_id = conn.execute("SELECT case_id FROM case_tasks GROUP BY case_id "
+                                "ORDER BY COUNT(*) DESC, case_id LIMIT 1").fetchone()[0]
+    device_ids = [row[0] for row in conn.execute("SELECT id FROM digital_devices ORDER BY id LIMIT 10")]
+    conn.close()
+
+    writer = rng.choice(NAME_OPTIONS)
+    last_day = datetime.strptime(end_date, "%Y-%m-%d")
+    day = _date_str(last_day - timedelta(days=rng.randint(1, 60)))
+    month_start, month_end = _date_str(last_day.replace(day=1)), end_date
+    year_start = _date_str(last_day - timedelta(days=364))
+
+    month_works = db.get_records_by_period("work_categories", month_start, month_end)
+    legacy_works = month_works.rename(columns={"writer": "name", "main_category": "category"}).head(200)
+    stats = db.get_work_stats(year_start, end_date, use_replica=False)
+    hours_df = db.get_hours_by_writer_date(year_start, end_date, use_replica=False)
+    matrix, targets = utils.build_timesheet(hours_df, year_start, end_date, freq="W")
+    submissions = db.get_daily_work_submissions(month_start, month_end, use_replica=False)
+    submission_matrix = utils.build_submission_matrix(submissions, month_start, month_end, NAME_OPTIONS)
+    bulk_devices = [{"name": f"bench-{i}", "device_type": "휴대폰", "hash_value": f"{rng.getrandbits(128):032x}"}
+                    for i in range(10)]
+
+    return [
+        # 조회
+        ("db.get_daily_works[date]", "db.get_daily_works", lambda: db.get_daily_works(date=day)),
+        ("db.get_daily_works[name]", "db.get_daily_works", lambda: db.get_daily_works(name=writer)),
+        ("db.get_daily_work_submissions", "db.get_daily_work_submissions",
+         lambda: db.get_daily_work_submissions(month_start, month_end, use_replica=False)),
+        ("db.iter_daily_works[month]", "db.iter_daily_works",
+         lambda: list(db.iter_daily_works(month_start, month_end, use_replica=False))),
+        ("db.get_cases", "db.get_cases", lambda: db.get_cases()),
+        ("db.get_cases[status]", "db.get_cases", lambda: db.get_cases({"status": "진행 중"})),
+        ("db.get_case", "db.get_case", lambda: db.get_case(case_id)),
+        ("db.get_case_logs", "db.get_case_logs", lambda: db.get_case_logs(case_id)),
+        ("db.get_case_progresses[case]", "db.get_case_progresses", lambda: db.get_case_progresses(case_id=case_id)),
+        ("db.get_case_progresses[all]", "db.get_case_progresses", lambda: db.get_case_progresses()),
+        ("db.get_case_tasks[case]", "db.get_case_tasks", lambda: db.get_case_tasks(case_id=busy_case_id)),
+        ("db.get_case_tasks[all]", "db.get_case_tasks", lambda: db.get_case_tasks()),
+        ("db.get_case_tasks_page", "db.get_case_tasks_page", lambda: db.get_case_tasks_page(limit=50)),
+        ("db.get_case_tasks_by_date_range", "db.get_case_tasks_by_date_range",
+         lambda: db.get_case_tasks_by_date_range(month_start, month_end)),
+        ("db.get_digital_devices[case]", "db.get_digital_devices", lambda: db.get_digital_devices(case_id=case_id)),
+        ("db.get_digital_devices[all]", "db.get_digital_devices", lambda: db.get_digital_devices()),
+        ("db.get_work_categories[all]", "db.get_work_categories", lambda: db.get_work_categories()),
+        ("db.get_work_categories[writer]", "db.get_work_categories",
+         lambda: db.get_work_categories({"writer": writer})),
+        ("db.get_work_categories_page", "db.get_work_categories_page", lambda: db.get_work_categories_page(limit=50)),
+        ("db.get_work_stats[year]", "db.get_work_stats",
+         lambda: db.get_work_stats(year_start, end_date, use_replica=False)),
+        ("db.get_hours_by_writer_date[year]", "db.get_hours_by_writer_date",
+         lambda: db.get_hours_by_writer_date(year_start, end_date, use_replica=False)),
+        ("db.get_records_by_period[month]", "db.get_records_by_period",
+         lambda: db.get_records_by_period("work_categories", month_start, month_end)),
+        ("db.get_case_labels", "db.get_case_labels", lambda: db.get_case_labels()),
+        ("db.get_device_labels", "db.get_device_labels", lambda: db.get_device_labels(busy_case_id)),
+        ("db.get_device_hash_values", "db.get_device_hash_values", lambda: db.get_device_hash_values(device_ids)),
+        ("db.get_attachments", "db.get_attachments", lambda: db.get_attachments(case_id)),
+        ("db.get_case_timeline", "db.get_case_timeline", lambda: db.get_case_timeline(busy_case_id)),
+        ("db.find_similar_cases", "db.find_similar_cases", lambda: db.find_similar_cases(case_title)),
+        ("db.find_duplicate_case_clusters", "db.find_duplicate_case_clusters",
+         lambda: db.find_duplicate_case_clusters()),
+        ("db.get_db_stats", "db.get_db_stats", lambda: db.get_db_stats()),
+        ("db.get_archive_stats", "db.get_archive_stats", lambda: db.get_archive_stats()),
+        ("db.get_change_counter", "db.get_change_counter", lambda: db.get_change_counter()),
+        ("db.get_replica_status", "db.get_replica_status", lambda: db.get_replica_status()),
+        ("db.get_export_jobs", "db.get_export_jobs", lambda: db.get_export_jobs()),
+        ("db.get_export_job", "db.get_export_job", lambda: db.get_export_job(1)),
+        ("db.get_expired_export_jobs", "db.get_expired_export_jobs", lambda: db.get_expired_export_jobs()),
+        # 보고서/차트
+        ("utils.create_excel_report[month]", "utils.create_excel_report",
+         lambda: utils.create_excel_report(month_works)),
+        ("utils.create_pdf_report", "utils.create_pdf_report", lambda: utils.create_pdf_report(legacy_works)),
+        ("utils.create_gantt_chart", "utils.create_gantt_chart", lambda: utils.create_gantt_chart(legacy_works)),
+        ("utils.create_category_chart", "utils.create_category_chart",
+         lambda: utils.create_category_chart(stats["by_category"])),
+        ("utils.create_status_chart", "utils.create_status_chart",
+         lambda: utils.create_status_chart(stats["by_status"])),
+        ("utils.create_monthly_chart", "utils.create_monthly_chart",
+         lambda: utils.create_monthly_chart(stats["by_month"])),
+        ("utils.create_writer_hours_chart", "utils.create_writer_hours_chart",
+         lambda: utils.create_writer_hours_chart(stats["by_writer"])),
+        ("utils.create_timesheet_excel", "utils.create_timesheet_excel",
+         lambda: utils.create_timesheet_excel(matrix, targets)),
+        ("utils.create_submission_excel", "utils.create_submission_excel",
+         lambda: utils.create_submission_excel(submission_matrix)),
+        ("utils.create_daily_rollup[month]", "utils.create_daily_rollup",
+         lambda: utils.create_daily_rollup(db.iter_daily_works(month_start, month_end, use_replica=False))),
+        # 입력 (조회 측정 뒤에 실행해 조회 결과에 영향을 주지 않도록 함)
+        ("db.add_daily_work", "db.add_daily_work", lambda: db.add_daily_work(writer, end_date, "- 벤치마크")),
+        ("db.add_case", "db.add_case",
+         lambda: db.add_case("벤치마크 사건", writer, "의뢰인", "사기", "진행 중", "벤치마크 설명", end_date)),
+        ("db.add_case_progress", "db.add_case_progress", lambda: db.add_case_progress(case_id, writer, "벤치마크")),
+        ("db.add_case_log", "db.add_case_log", lambda: db.add_case_log(case_id, "벤치마크")),
+        ("db.add_case_task", "db.add_case_task",
+         lambda: db.add_case_task(case_id, "사건처리", "분석(PC)", "벤치마크", end_date, end_date, "진행 중", writer, 1.0)),
+        ("db.add_digital_device", "db.add_digital_device",
+         lambda: db.add_digital_device(case_id, "PC", "벤치마크 PC", status="수집완료")),
+        ("db.add_digital_devices_bulk[10]", "db.add_digital_devices_bulk",
+         lambda: db.add_digital_devices_bulk(case_id, bulk_devices)),
+        ("db.add_work_category", "db.add_work_category",
+         lambda: db.add_work_category("회의", "내부회의", "벤치마크", end_date, end_date, "완료", writer, 1.0)),
+        ("db.add_attachment", "db.add_attachment",
+         lambda: db.add_attachment("0" * 64, case_id, "bench.jpg", 1024, thumb_status="없음")),
+        ("db.add_export_job", "db.add_export_job", lambda: db.add_export_job("timesheet", "벤치마크", {}))
+    ]
+
+def uncovered_functions(db, utils, benchmarks):
+    """측정 항목이 없는 db.get_*/add_*, utils.create_* 함수 (새 함수를 추가하면 여기에 나타남)"""
+    targets = {f"db.{name}" for name, func in inspect.getmembers(db, inspect.isfunction)
+               if name.startswith(("get_", "add_")) and func.__module__ == db.__name__}
+    targets |= {f"utils.{name}" for name, func in inspect.getmembers(utils, inspect.isfunction)
+                if name.startswith("create_") and func.__module__ == utils.__name__}
+    return sorted(targets - {target for _, target, _ in benchmarks} - UNCOVERED_EXCLUDED)
+
+def _result_size(result):
+    """결과 크기 (행 수 또는 바이트 수, 알 수 없으면 None)"""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if hasattr(result, "shape"):
+        return int(result.shape[0])
+    if isinstance(result, (bytes, str, list, dict)):
+        return len(result)
+    return None
+
+def time_call(func, repeat=DEFAULT_REPEAT):
+    """
+    함수를 한 번 예열한 뒤 repeat회 실행한 소요 시간
+
+    Returns:
+        dict: min_ms, median_ms, mean_ms, max_ms, repeat, size (실패하면 error)
+    """
+    try:
+        result = func()
+        gc.collect()
+        durations = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            durations.append((time.perf_counter() - started) * 1000)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return dict(_duration_stats(durations), size=_result_size(result))
+
+def _duration_stats(durations):
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "mean_ms": round(statistics.mean(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "repeat": len(durations)
+    }
+
+# 일일 업무 입력(첫 메뉴) 화면에서 import되면 안 되는 무거운 모듈
+# (streamlit 자체가 plotly, plotly.io, PIL은 import하므로 제외)
+COLDSTART_FORBIDDEN_MODULES = ["matplotlib", "plotly.express", "plotly.figure_factory", "fpdf", "xlsxwriter"]
+
+# 새 프로세스에서 streamlit import → app.py 첫 실행 → 다시 실행 시간을 재는 스크립트
+COLDSTART_SCRIPT = """
+import sys, json, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ms = (time.perf_counter() - started) * 1000
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+started = time.perf_counter()
+at.run()
+first_ms = (time.perf_counter() - started) * 1000
+loaded = [name for name in sys.argv[2:] if name in sys.modules]
+started = time.perf_counter()
+at.run()
+rerun_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"streamlit_import": streamlit_ms, "daily_input_first_run": first_ms,
+                  "daily_input_rerun": rerun_ms, "loaded": loaded,
+                  "errors": [str(e.value) for e in at.exception]}))
+"""
+
+def measure_coldstart(repeat=DEFAULT_REPEAT, work_dir=None):
+    """
+    일일 업무 입력 화면의 콜드 스타트 시간 측정 (매번 새 프로세스, 빈 DB)
+
+    첫 실행 시간에는 app.py가 import하는 모듈(db, utils 등)의 import 시간이 포함됩니다.
+
+    Returns:
+        dict: meta, results({"coldstart": 항목 → 결과}), forbidden_loaded(첫 화면에서 import된 무거운 모듈)
+    """
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    samples = {"streamlit_import": [], "daily_input_first_run": [], "daily_input_rerun": []}
+    loaded, errors = set(), []
+    with tempfile.TemporaryDirectory(prefix="worklog_coldstart_", dir=work_dir) as temp_dir:
+        for index in range(repeat):
+            run_dir = os.path.join(temp_dir, f"run_{index}")
+            os.makedirs(run_dir)
+            env = dict(os.environ,
+                       WORKLOG_DB_PATH=os.path.join(run_dir, "worklog.db"),
+                       WORKLOG_ARCHIVE_DB_PATH=os.path.join(run_dir, "worklog_archive.db"),
+                       WORKLOG_JOBS_DB_PATH=os.path.join(run_dir, "worklog_jobs.db"),
+                       PYTHONPATH=os.path.dirname(app_path))
+            completed = subprocess.run(
+                [sys.executable, "-c", COLDSTART_SCRIPT, app_path] + COLDSTART_FORBIDDEN_MODULES,
+                cwd=run_dir, env=env, capture_output=True, text=True, timeout=300
+            )
+            if completed.returncode != 0:
+                errors.append(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "실패")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            for name in samples:
+                samples[name].append(result[name])
+            loaded.update(result["loaded"])
+            errors += result["errors"]
+
+    results = {name: _duration_stats(durations) if durations else {"error": errors[0] if errors else "측정 실패"}
+               for name, durations in samples.items()}
+    return {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat
+        },
+        "results": {"coldstart": results},
+        "forbidden_loaded": sorted(loaded),
+        "errors": errors
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_benchmarks(scales, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE,
+                   work_dir=None, progress_callback=None):
+    """
+    규모별로 합성 DB를 만들고 모든 항목 측정
+
+    Args:
+        work_dir: 합성 DB를 만들 폴더 (None이면 임시 폴더를 쓰고 끝나면 삭제)
+        progress_callback: 항목 하나가 끝날 때마다 호출 (scale, 항목 이름, 결과)
+
+    Returns:
+        dict: meta, datasets(규모별 행 수/생성 시간), results(규모 → 항목 → 결과), uncovered
+    """
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="worklog_bench_")
+        work_dir = temp_dir.name
+    os.makedirs(work_dir, exist_ok=True)
+
+    # db는 import 시 DB_PATH를 초기화하므로 import 전에 작업 폴더의 파일을 가리키게 함
+    os.environ["WORKLOG_DB_PATH"] = os.path.join(work_dir, "bench_init.db")
+    os.environ["WORKLOG_ARCHIVE_DB_PATH"] = os.path.join(work_dir, "bench_archive.db")
+    os.environ["WORKLOG_JOBS_DB_PATH"] = os.path.join(work_dir, "bench_jobs.db")
+    import db
+    import utils
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "end_date": end_date,
+            "repeat": repeat
+        },
+        "datasets": {},
+        "results": {}
+    }
+
+    try:
+        for scale in scales:
+            started = time.perf_counter()
+            counts = build_database(db, os.path.join(work_dir, f"bench_{scale}.db"), scale, seed, end_date)
+            report["datasets"][scale] = {"rows": counts, "build_seconds": round(time.perf_counter() - started, 2)}
+
+            benchmarks = build_benchmarks(db, utils, seed, end_date)
+            results = report["results"][scale] = {}
+            for name, _, func in benchmarks:
+                results[name] = time_call(func, repeat)
+                if progress_callback:
+                    progress_callback(scale, name, results[name])
+        report["uncovered"] = uncovered_functions(db, utils, benchmarks) if scales else []
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    return report
+
+def compare_reports(current, baseline, threshold=DEFAULT_THRESHOLD, noise_floor_ms=NOISE_FLOOR_MS):
+    """
+    기준 보고서와 중앙값 비교
+
+    Returns:
+        list: dict(scale, name, baseline_ms, current_ms, ratio, status) - status는 느려짐/빨라짐/같음/신규/오류
+    """
+    rows = []
+    for scale, results in current["results"].items():
+        base_results = baseline.get("results", {}).get(scale, {})
+        for name, result in results.items():
+            base = base_results.get(name)
+            row = {"scale": scale, "name": name, "baseline_ms": None, "current_ms": result.get("median_ms"),
+                   "ratio": None, "status": "같음"}
+            if "error" in result:
+                row["status"] = "오류"
+            elif not base or "median_ms" not in base:
+                row["status"] = "신규"
+            else:
+                row["baseline_ms"] = base["median_ms"]
+                row["ratio"] = round(result["median_ms"] / base["median_ms"], 3) if base["median_ms"] else None
+                if abs(result["median_ms"] - base["median_ms"]) >= noise_floor_ms and row["ratio"] is not None:
+                    if row["ratio"] > 1 + threshold:
+                        row["status"] = "느려짐"
+                    elif row["ratio"] < 1 / (1 + threshold):
+                        row["status"] = "빨라짐"
+            rows.append(row)
+    return rows
+
+def print_comparison(rows):
+    """비교 결과 중 변화가 있는 항목만 출력"""
+    changed = [row for row in rows if row["status"] != "같음"]
+    if not changed:
+        print("기준과 비교해 의미 있는 변화가 없습니다.")
+        return
+    for row in sorted(changed, key=lambda row: (row["status"], row["scale"], row["name"])):
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        baseline_ms = f"{row['baseline_ms']:.2f}" if row["baseline_ms"] is not None else "-"
+        current_ms = f"{row['current_ms']:.2f}" if row["current_ms"] is not None else "-"
+        print(f"  [{row['status']}] {row['scale']:<6} {row['name']:<40} {baseline_ms:>10} → {current_ms:>10} ms ({ratio})")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="db.py / utils.py 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="합성 데이터로 DB 생성 (부하 테스트/화면 확인용)")
+    generate.add_argument("--db", required=True, help="생성할 DB 파일 경로")
+    generate.add_argument("--scale", choices=list(SCALES), default="small")
+    generate.add_argument("--force", action="store_true", help="같은 이름의 파일이 있으면 삭제 후 생성")
+
+    run = subparsers.add_parser("run", help="벤치마크 실행")
+    run.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="항목별 반복 횟수")
+    run.add_argument("-o", "--output", default="bench_report.json", help="JSON 보고서 저장 경로")
+    run.add_argument("--baseline", help="비교할 기준 보고서 (JSON)")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="느려짐으로 볼 비율 (0.2 = 20%%)")
+    run.add_argument("--work-dir", help="합성 DB를 남겨 둘 폴더 (기본값: 임시 폴더)")
+
+    for sub in (generate, run):
+        sub.add_argument("--seed", type=int, default=DEFAULT_SEED)
+        sub.add_argument("--end-date", default=DEFAULT_END_DATE, help="합성 데이터의 마지막 날짜 (YYYY-MM-DD)")
+
+    coldstart = subparsers.add_parser("coldstart", help="일일 업무 입력 화면 콜드 스타트(import 포함) 측정")
+    coldstart.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="새 프로세스 실행 횟수")
+    coldstart.add_argument("-o", "--output", default="bench_coldstart.json", help="JSON 보고서 저장 경로")
+    coldstart.add_argument("--baseline", help="비교할 기준 보고서 (JSON)")
+    coldstart.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="느려짐으로 볼 비율 (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+def _compare_with_baseline(report, baseline_path, threshold):
+    """기준 보고서와 비교 결과를 출력하고 느려진 항목이 있으면 True"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare_reports(report, baseline, threshold)
+    print(f"기준 보고서({baseline_path}) 대비:")
+    print_comparison(rows)
+    return any(row["status"] == "느려짐" for row in rows)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "generate":
+        if os.path.exists(args.db):
+            if not args.force:
+                print(f"{args.db} 파일이 이미 있습니다. 덮어쓰려면 --force를 지정하세요.", file=sys.stderr)
+                return 1
+            os.remove(args.db)
+        os.environ["WORKLOG_DB_PATH"] = os.path.abspath(args.db)
+        import db
+
+        started = time.perf_counter()
+        counts = build_database(db, os.path.abspath(args.db), args.scale, args.seed, args.end_date)
+        print(", ".join(f"{table} {count:,}행" for table, count in counts.items()))
+        print(f"{args.db} 생성 완료 ({time.perf_counter() - started:.1f}초)")
+        return 0
+
+    if args.command == "coldstart":
+        report = measure_coldstart(args.repeat)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        for name, result in report["results"]["coldstart"].items():
+            if "error" in result:
+                print(f"  {name:<40} 오류: {result['error']}")
+            else:
+                print(f"  {name:<40} {result['median_ms']:>10.2f} ms")
+        print(f"보고서 저장: {args.output}")
+
+        failed = bool(report["errors"])
+        if report["forbidden_loaded"]:
+            print(f"일일 업무 입력 화면에서 import되면 안 되는 모듈: {', '.join(report['forbidden_loaded'])}")
+            failed = True
+        if args.baseline:
+            failed = _compare_with_baseline(report, args.baseline, args.threshold) or failed
+        return 1 if failed else 0
+
+    def report_progress(scale, name, result):
+        if "error" in result:
+            print(f"  {scale:<6} {name:<40} 오류: {result['error']}")
+        else:
+            print(f"  {scale:<6} {name:<40} {result['median_ms']:>10.2f} ms")
+
+    report = run_benchmarks(args.scales, args.repeat, args.seed, args.end_date, args.work_dir, report_progress)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서 저장: {args.output}")
+    if report["uncovered"]:
+        print(f"측정 항목이 없는 함수: {', '.join(report['uncovered'])}")
+
+    if not args.baseline:
+        return 0
+    return 1 if _compare_with_baseline(report, args.baseline, args.threshold) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
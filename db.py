@@ -1,18 +1,360 @@
 import sqlite3
 import os
+import re
+import sys
+import time
+import threading
+import collections
+import logging
+import logging.handlers
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime
 import json
 from typing import List, Dict, Any, Optional, Union
+import similarity
+import metrics
 
-# DB 파일 경로
-DB_PATH = 'worklog.db'
+# DB 파일 경로 (명령행 도구 등에서 다른 DB를 쓸 때는 환경 변수로 지정)
+DB_PATH = os.environ.get('WORKLOG_DB_PATH', 'worklog.db')
+
+# 보관(아카이브) DB 파일 경로 - 완료된 지 오래된 사건과 하위 데이터를 옮겨 두는 곳
+ARCHIVE_DB_PATH = os.environ.get('WORKLOG_ARCHIVE_DB_PATH', 'worklog_archive.db')
+
+# 내보내기 작업 DB 파일 경로 - 진행률을 자주 기록하므로 운영 DB와 분리
+# (운영 DB에 쓰면 변경 카운터가 올라가 화면 캐시와 읽기 복제본이 계속 무효화됨)
+JOBS_DB_PATH = os.environ.get('WORKLOG_JOBS_DB_PATH', 'worklog_jobs.db')
+
+# 사건과 함께 보관 DB로 옮기는 하위 테이블 (모두 case_id 컬럼으로 연결)
+# 업무 기록(work_categories)은 직원별 근무 기록이므로 사건을 보관해도 운영 DB에 남김
+ARCHIVE_CHILD_TABLES = ['case_progresses', 'case_tasks', 'digital_devices']
+
+# DB 유지보수 설정 (단위: 초)
+MAINTENANCE_CHECK_INTERVAL = 60             # 유지보수 필요 여부 확인 주기
+MAINTENANCE_IDLE_SECONDS = 300              # 마지막 쓰기 이후 이 시간이 지나면 유휴 상태로 판단
+OPTIMIZE_INTERVAL = 6 * 60 * 60             # PRAGMA optimize 실행 주기
+ANALYZE_INTERVAL = 7 * 24 * 60 * 60         # ANALYZE 실행 주기
+VACUUM_MIN_FREE_PAGES = 100                 # 이 이상 빈 페이지가 쌓이면 incremental_vacuum 실행
+
+_maintenance_thread = None
+_maintenance_lock = threading.Lock()
+
+# 읽기 전용 복제본(메모리 DB) 설정 - 보고서/통계 조회가 운영 DB에 락을 잡지 않도록 분리
+READ_REPLICA_ENABLED = True
+REPLICA_POLL_INTERVAL = 2                   # 변경 카운터 확인 주기(초)
+REPLICA_MAX_STALENESS = 300                 # 변경이 감지되지 않아도 이 시간이 지나면 다시 복사(초)
+
+_replica_state = {"uri": None, "holder": None, "change_counter": None, "refreshed_at": None, "generation": 0}
+_replica_lock = threading.Lock()
+_replica_wakeup = threading.Event()
+_replica_thread = None
+
+# 선택 목록용 ID → 표시 이름 캐시 (데이터 세대가 바뀌면 비움)
+_label_cache = {"generation": None, "maps": {}}
+_label_cache_lock = threading.Lock()
+
+# 화면별 동시 조회용 스레드 풀 설정
+LOADER_MAX_WORKERS = 4
+
+_loader_pool = None
+_loader_pool_lock = threading.Lock()
+_thread_local = threading.local()
+
+# SQL 추적 설정 - 화면 한 번 실행(rerun)에 어떤 조회가 얼마나 걸렸는지 기록
+# (켜져 있을 때 이후에 여는 연결부터 적용, 꺼져 있으면 연결마다 플래그만 확인)
+# 지표 수집(metrics.METRICS_ENABLED)만 켜져 있으면 db 함수별 SQL 시간만 재고
+# 조회 기록/느린 조회 로그(EXPLAIN)는 남기지 않음
+QUERY_TRACE_ENABLED = os.environ.get('WORKLOG_QUERY_TRACE') == '1'
+QUERY_TRACE_HISTORY = 1000                  # 최근 조회 기록 보관 개수 (프로세스 전체)
+SLOW_QUERY_MS = float(os.environ.get('WORKLOG_SLOW_QUERY_MS', 200))
+SLOW_QUERY_LOG_PATH = os.environ.get('WORKLOG_SLOW_QUERY_LOG', 'worklog_slow_queries.log')
+SLOW_QUERY_LOG_BYTES = 1024 * 1024          # 로그 파일 하나의 최대 크기 (넘으면 교체)
+SLOW_QUERY_LOG_BACKUPS = 3
+
+_query_history = collections.deque(maxlen=QUERY_TRACE_HISTORY)
+_trace_local = threading.local()
+_slow_query_logger = None
+_slow_query_logger_lock = threading.Lock()
+
+_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SQL_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+def normalize_sql(sql):
+    """리터럴을 ?로 바꾸고 공백을 정리해 같은 모양의 조회를 하나로 묶을 수 있게 함"""
+    sql = _SQL_STRING_LITERAL.sub("?", sql)
+    sql = _SQL_NUMBER_LITERAL.sub("?", sql)
+    sql = _SQL_PLACEHOLDER_LIST.sub("(?, ...)", sql)
+    return " ".join(sql.split())
+
+def set_query_trace(enabled):
+    """SQL 추적 켜기/끄기 (이후에 여는 연결부터 적용)"""
+    global QUERY_TRACE_ENABLED
+    QUERY_TRACE_ENABLED = bool(enabled)
+
+def begin_query_trace(page):
+    """현재 스레드(화면 실행)의 조회 기록을 새로 시작하고 호출 화면 이름 지정"""
+    _trace_local.page = page
+    _trace_local.queries = []
+
+def get_query_trace():
+    """현재 스레드에서 begin_query_trace 이후 실행된 조회 기록 목록"""
+    return list(getattr(_trace_local, "queries", None) or [])
+
+def get_query_history():
+    """프로세스 전체의 최근 조회 기록 DataFrame"""
+    return pd.DataFrame(list(_query_history), columns=[
+        'started_at', 'page', 'caller', 'sql', 'param_count', 'duration_ms', 'rows', 'statements'
+    ])
+
+def _get_slow_query_logger():
+    global _slow_query_logger
+    with _slow_query_logger_lock:
+        if _slow_query_logger is None:
+            logger = logging.getLogger("worklog.slow_query")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = logging.handlers.RotatingFileHandler(
+                SLOW_QUERY_LOG_PATH, maxBytes=SLOW_QUERY_LOG_BYTES,
+                backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _slow_query_logger = logger
+        return _slow_query_logger
+
+def _query_caller():
+    """조회를 실행한 db 함수 이름 (pandas 등 중간 프레임은 건너뜀)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == __file__ and code.co_name not in _TRACE_FRAME_NAMES:
+            return code.co_name
+        frame = frame.f_back
+    return None
+
+class _TracedCursor(sqlite3.Cursor):
+    """
+    실행/가져오기 시간을 합산해 조회 하나의 기록을 만드는 커서
+    
+    SELECT는 결과를 끝까지 읽거나 커서를 닫을 때, 그 외 문장은 실행 직후 기록합니다.
+    """
+    _trace = None
+    _parameters = ()
+    
+    def _start(self, sql, parameters, param_count):
+        self._finish()
+        self._parameters = parameters
+        self._trace = {
+            "started_at": datetime.now().strftime("%H:%M:%S.%f")[:-3],
+            "page": getattr(_trace_local, "page", None),
+            "caller": _query_caller(),
+            "sql": sql,
+            "param_count": param_count,
+            "seconds": 0.0,
+            "rows": 0,
+            "statements": 0
+        }
+        self.connection._active_trace = self._trace
+        self.connection._open_cursors.add(self)
+    
+    def _discard(self):
+        self._trace = None
+        self.connection._active_trace = None
+        self.connection._open_cursors.discard(self)
+    
+    def _finish(self):
+        trace = self._trace
+        if trace is None:
+            return
+        self._trace = None
+        self.connection._open_cursors.discard(self)
+        if self.connection._active_trace is trace:
+            self.connection._active_trace = None
+        self.connection._record_query(trace, self)
+    
+    def execute(self, sql, parameters=()):
+        if not self.connection._tracing:
+            return super().execute(sql, parameters)
+        self._start(sql, parameters, len(parameters))
+        try:
+            self._timed(super().execute, sql, parameters)
+        except Exception:
+            self._discard()
+            raise
+        if self.description is None:
+            self._trace["rows"] = max(self.rowcount, 0)
+            self._finish()
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        if not self.connection._tracing:
+            return super().executemany(sql, seq_of_parameters)
+        seq_of_parameters = list(seq_of_parameters)
+        first = seq_of_parameters[0] if seq_of_parameters else ()
+        self._start(sql, first, len(first))
+        try:
+            self._timed(super().executemany, sql, seq_of_parameters)
+        except Exception:
+            self._discard()
+            raise
+        self._trace["rows"] = max(self.rowcount, 0)
+        self._finish()
+        return self
+    
+    def _timed(self, fetch, *args):
+        trace = self._trace
+        if trace is None:
+            return fetch(*args)
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            trace["seconds"] += time.perf_counter() - started
+    
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if self._trace is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._trace["rows"] += 1
+        return row
+    
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if self._trace is not None:
+            self._trace["rows"] += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+    
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._trace is not None:
+            self._trace["rows"] += len(rows)
+            self._finish()
+        return rows
+    
+    def __next__(self):
+        if self._trace is None:
+            return super().__next__()
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        self._trace["rows"] += 1
+        return row
+    
+    def close(self):
+        self._finish()
+        super().close()
+
+class _TracedConnection(sqlite3.Connection):
+    """
+    QUERY_TRACE_ENABLED일 때 만든 연결은 모든 문장의 실행 시간/행 수를 기록
+    
+    sqlite3 trace 콜백으로 실제 실행된 문장(트리거 내부 문장, 암묵적 BEGIN/COMMIT 포함)을
+    세어 각 조회 기록의 statements 값에 더합니다. 지표 수집만 켜져 있을 때 만든 연결은
+    실행 시간만 재서 지표에 더합니다.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._full_trace = QUERY_TRACE_ENABLED
+        self._tracing = self._full_trace or metrics.METRICS_ENABLED
+        self._active_trace = None
+        self._open_cursors = set()
+        self._explaining = False
+        if self._full_trace:
+            self.set_trace_callback(self._on_statement)
+    
+    def _on_statement(self, statement):
+        if self._active_trace is not None and not self._explaining:
+            self._active_trace["statements"] += 1
+    
+    def cursor(self, factory=_TracedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def commit(self):
+        if not self._tracing or not self.in_transaction:
+            return super().commit()
+        started = time.perf_counter()
+        super().commit()
+        self._record_query({
+            "started_at": datetime.now().strftime("%H:%M:%S.%f")[:-3],
+            "page": getattr(_trace_local, "page", None),
+            "caller": _query_caller(),
+            "sql": "COMMIT",
+            "param_count": 0,
+            "seconds": time.perf_counter() - started,
+            "rows": 0,
+            "statements": 1
+        })
+    
+    def close(self):
+        for cursor in list(self._open_cursors):
+            cursor._finish()
+        super().close()
+    
+    def _explain(self, sql, parameters):
+        """느린 조회의 EXPLAIN QUERY PLAN 결과 (추적하지 않는 기본 커서로 실행)"""
+        self._explaining = True
+        try:
+            cursor = sqlite3.Cursor(self)
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+            return [row[3] for row in cursor.fetchall()]
+        except (sqlite3.Error, ValueError):
+            return []
+        finally:
+            self._explaining = False
+    
+    def _record_query(self, trace, cursor=None):
+        duration_ms = trace.pop("seconds") * 1000
+        metrics.DB_QUERY_SECONDS.observe(duration_ms / 1000, caller=trace["caller"])
+        if not self._full_trace:
+            return
+        
+        record = dict(trace, sql=normalize_sql(trace["sql"]), duration_ms=round(duration_ms, 3))
+        _query_history.append(record)
+        queries = getattr(_trace_local, "queries", None)
+        if queries is not None:
+            queries.append(record)
+        
+        if duration_ms >= SLOW_QUERY_MS:
+            plan = self._explain(trace["sql"], getattr(cursor, "_parameters", ())) if cursor is not None else []
+            _get_slow_query_logger().info(json.dumps(
+                dict(record, logged_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), plan=plan),
+                ensure_ascii=False
+            ))
+
+# 호출 함수 이름을 찾을 때 건너뛸 추적용 프레임
+_TRACE_FRAME_NAMES = {
+    name for cls in (_TracedCursor, _TracedConnection) for name in vars(cls)
+} | {"_query_caller", "_connect"}
+
+def _connect(database, **kwargs):
+    """추적 가능한 연결 생성 (sqlite3.connect와 같은 인자)"""
+    kwargs.setdefault("factory", _TracedConnection)
+    return sqlite3.connect(database, **kwargs)
 
 def init_db():
     """데이터베이스 초기화 및 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     
+    # 삭제로 생긴 빈 페이지를 점진적으로 반환할 수 있도록 auto_vacuum 모드 설정
+    enable_incremental_vacuum(conn)
+    
     # 일일업무 테이블 (기존)
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS daily_work (
@@ -91,6 +433,11 @@ def init_db():
         storage_size TEXT,                  -- 저장용량
         acquisition_method TEXT,            -- 수집방법
         hash_value TEXT,                    -- 해시값
+        hash_md5 TEXT,                      -- 이미지 파일 MD5 (계산값)
+        hash_sha1 TEXT,                     -- 이미지 파일 SHA-1 (계산값)
+        hash_sha256 TEXT,                   -- 이미지 파일 SHA-256 (계산값)
+        hash_status TEXT,                   -- 해시 검증 상태 (일치/불일치/계산됨)
+        hash_verified_at TEXT,              -- 해시 계산일시
         description TEXT,                   -- 설명
         created_at TEXT NOT NULL,           -- 생성일시
         FOREIGN KEY(case_id) REFERENCES cases(id)
@@ -115,11 +462,65 @@ def init_db():
     )
     ''')
     
+    # 첨부 파일 메타 정보 (파일 본문은 sha256 이름으로 attachments 폴더에 저장)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS attachments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sha256 TEXT NOT NULL,               -- 파일 내용 해시 (저장 파일 이름)
+        case_id INTEGER NOT NULL,           -- 연결된 사건 ID
+        device_id INTEGER,                  -- 연결된 장비 ID (선택)
+        file_name TEXT NOT NULL,            -- 원본 파일명
+        mime_type TEXT,                     -- 파일 형식
+        size INTEGER NOT NULL,              -- 파일 크기(B)
+        thumb_status TEXT NOT NULL,         -- 썸네일 상태 (대기/완료/없음)
+        description TEXT,                   -- 설명
+        created_at TEXT NOT NULL,           -- 생성일시
+        FOREIGN KEY(case_id) REFERENCES cases(id),
+        FOREIGN KEY(device_id) REFERENCES digital_devices(id)
+    )
+    ''')
+    
+    # DB 메타 정보 테이블 (유지보수 실행 시각 등)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS db_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''')
+    
+    # 사건 유사도 색인 (MinHash 서명과 LSH 버킷)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS case_minhash (
+        case_id INTEGER PRIMARY KEY,        -- 사건 ID
+        signature BLOB NOT NULL,            -- MinHash 서명
+        updated_at TEXT NOT NULL            -- 갱신일시
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS case_lsh_buckets (
+        band INTEGER NOT NULL,              -- 밴드 번호
+        bucket INTEGER NOT NULL,            -- 밴드 해시
+        case_id INTEGER NOT NULL,           -- 사건 ID
+        PRIMARY KEY (band, bucket, case_id)
+    ) WITHOUT ROWID
+    ''')
+    
     # 테이블 업그레이드 검사 실행
     upgrade_tables(conn, cursor)
     
+    # 인덱스 생성
+    create_indexes(cursor)
+    
+    # 유사도 색인이 없는 기존 사건 색인
+    _index_missing_case_similarity(conn)
+    
     conn.commit()
     conn.close()
+    
+    # 예전 보관 작업으로 보관 DB에 들어간 업무 기록 복구
+    _restore_archived_work_categories()
+    
+    init_jobs_db()
     print("데이터베이스가 초기화되었습니다.")
 
 def upgrade_tables(conn, cursor):
@@ -173,7 +574,12 @@ def upgrade_tables(conn, cursor):
     if cursor.fetchone():
         required_columns = {
             'examination_start_date': 'TEXT',
-            'examination_end_date': 'TEXT'
+            'examination_end_date': 'TEXT',
+            'hash_md5': 'TEXT',
+            'hash_sha1': 'TEXT',
+            'hash_sha256': 'TEXT',
+            'hash_status': 'TEXT',
+            'hash_verified_at': 'TEXT'
         }
         
         for column_name, column_type in required_columns.items():
@@ -186,10 +592,33 @@ def upgrade_tables(conn, cursor):
     
     conn.commit()
 
+def create_indexes(cursor):
+    """자주 사용하는 조회 조건에 대한 인덱스 생성"""
+    # 사건 선택 목록의 앞글자 검색(typeahead)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cases_title ON cases(title)")
+    # 사건별 장비 목록
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_digital_devices_case_id ON digital_devices(case_id)")
+    # 업무 기록 목록의 기본 정렬 (페이지 단위 조회)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_categories_created_at ON work_categories(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_tasks_start_date ON case_tasks(start_date, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_tasks_case_id ON case_tasks(case_id)")
+    # 통계 화면의 기간 조건
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_categories_start_date ON work_categories(start_date)")
+    # 일일 업무 제출 현황 (기간 + 작성자 집계를 인덱스만으로 처리)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_work_date_name ON daily_work(date, name)")
+    # 사건 타임라인 (사건별 날짜 순 커서)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_progresses_case_id_date ON case_progresses(case_id, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_categories_case_id_start_date ON work_categories(case_id, start_date)")
+    # 사건 유사도 색인 갱신 시 사건별 버킷 삭제
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_lsh_buckets_case_id ON case_lsh_buckets(case_id)")
+    # 사건별 첨부 파일 목록, 같은 내용 파일의 참조 확인
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_attachments_case_id ON attachments(case_id, device_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_attachments_sha256 ON attachments(sha256)")
+
 # 일일업무 관련 함수
 
 def add_daily_work(name, date, content):
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('''
     INSERT INTO daily_work (name, date, content) VALUES (?, ?, ?)
@@ -199,21 +628,68 @@ def add_daily_work(name, date, content):
     conn.close()
     return last_id
 
-def get_daily_works(date=None):
-    conn = sqlite3.connect(DB_PATH)
-    query = "SELECT * FROM daily_work"
+def get_daily_works(date=None, name=None, use_replica=False):
+    conn, source = _connect_for_read('daily_work', use_replica=use_replica)
+    query = f"SELECT * FROM {source}"
     params = []
+    conditions = []
     if date:
-        query += " WHERE date = ?"
+        conditions.append("date = ?")
         params.append(date)
+    if name:
+        conditions.append("name = ?")
+        params.append(name)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
     query += " ORDER BY name, id"
     df = pd.read_sql_query(query, conn, params=params)
     conn.close()
     return df
 
+def get_daily_work_submissions(start_date, end_date, use_replica=True):
+    """
+    기간 내 날짜·작성자별 일일 업무 제출 건수를 한 번의 GROUP BY로 조회
+    
+    Returns:
+        DataFrame: date, name, count
+    """
+    conn, _ = _connect_for_read('daily_work', use_replica=use_replica)
+    df = pd.read_sql_query('''
+        SELECT date, name, COUNT(*) AS count FROM daily_work
+        WHERE date >= ? AND date <= ?
+        GROUP BY date, name
+    ''', conn, params=[start_date, end_date])
+    conn.close()
+    return df
+
+def iter_daily_works(start_date, end_date, order_by="name", use_replica=True):
+    """
+    기간 내 일일 업무를 한 번의 조회로 한 행씩 읽어 반환 (제너레이터)
+    
+    전체 기간을 DataFrame으로 올리지 않고 커서를 그대로 순회합니다.
+    
+    Args:
+        start_date, end_date: 조회 기간 (YYYY-MM-DD, 양 끝 포함)
+        order_by: "name"(작성자, 날짜 순) 또는 "date"(날짜, 작성자 순)
+    
+    Yields:
+        tuple: (date, name, content)
+    """
+    order = "name, date, id" if order_by == "name" else "date, name, id"
+    conn, _ = _connect_for_read('daily_work', use_replica=use_replica)
+    try:
+        cursor = conn.execute(f'''
+            SELECT date, name, content FROM daily_work
+            WHERE date >= ? AND date <= ?
+            ORDER BY {order}
+        ''', (start_date, end_date))
+        yield from cursor
+    finally:
+        conn.close()
+
 def delete_daily_work(work_id):
     """일일 업무 삭제"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('DELETE FROM daily_work WHERE id=?', (work_id,))
     conn.commit()
@@ -226,7 +702,7 @@ def add_case(title, manager, client, case_type, status, description, start_date=
     사건 정보를 데이터베이스에 추가
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = _connect(DB_PATH)
         cursor = conn.cursor()
         
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -241,6 +717,7 @@ def add_case(title, manager, client, case_type, status, description, start_date=
         )
         
         case_id = cursor.lastrowid
+        _index_case_similarity(conn, case_id, title, client, description)
         conn.commit()
         conn.close()
         
@@ -249,11 +726,11 @@ def add_case(title, manager, client, case_type, status, description, start_date=
         print(f"사건 추가 중 오류 발생: {e}")
         return None
 
-def get_cases(filter_dict=None):
-    """사건 목록 조회 (필터링 지원)"""
-    conn = sqlite3.connect(DB_PATH)
+def get_cases(filter_dict=None, include_archive=False, use_replica=False):
+    """사건 목록 조회 (필터링 지원, include_archive=True이면 보관된 사건 포함)"""
+    conn, source = _connect_for_read('cases', include_archive, use_replica)
     
-    query = "SELECT * FROM cases"
+    query = f"SELECT * FROM {source}"
     params = []
     
     if filter_dict:
@@ -277,7 +754,7 @@ def update_case(case_id, **kwargs):
     
     Args:
         case_id: 업데이트할 사건 ID
-        **kwargs: 업데이트할 필드 (title, manager, client, case_type, status, description, start_date, end_date)
+        **kwargs: 업데이트할 필드 (title, manager, client, case_type, status, priority, description, start_date, end_date)
     
     Returns:
         bool: 업데이트 성공 여부
@@ -287,20 +764,28 @@ def update_case(case_id, **kwargs):
         values = []
         
         for key, value in kwargs.items():
-            if key in ['title', 'manager', 'client', 'case_type', 'status', 'description', 'start_date', 'end_date']:
+            if key in ['title', 'manager', 'client', 'case_type', 'status', 'priority', 'description', 'start_date', 'end_date']:
                 fields.append(f"{key} = ?")
                 values.append(value)
         
         if not fields:
             return False
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = _connect(DB_PATH)
         cursor = conn.cursor()
         
         query = f"UPDATE cases SET {', '.join(fields)} WHERE id = ?"
         values.append(case_id)
         
         cursor.execute(query, values)
+        
+        # 비교 대상 필드가 바뀌면 유사도 색인 갱신
+        if {'title', 'client', 'description'} & set(kwargs):
+            cursor.execute("SELECT title, client, description FROM cases WHERE id = ?", (case_id,))
+            row = cursor.fetchone()
+            if row:
+                _index_case_similarity(conn, case_id, *row)
+        
         conn.commit()
         conn.close()
         
@@ -312,7 +797,7 @@ def update_case(case_id, **kwargs):
 # 업무 진행 경과(B 테이블) 관련 함수
 def add_case_progress(case_id, writer, content):
     """업무 진행 경과 추가"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     date = datetime.now().strftime("%Y-%m-%d")
     created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -332,11 +817,11 @@ def add_case_progress(case_id, writer, content):
     
     return last_id
 
-def get_case_progresses(case_id=None, start_date=None, end_date=None):
+def get_case_progresses(case_id=None, start_date=None, end_date=None, include_archive=False, use_replica=False):
     """업무 진행 경과 조회"""
-    conn = sqlite3.connect(DB_PATH)
+    conn, source = _connect_for_read('case_progresses', include_archive, use_replica)
     
-    query = "SELECT * FROM case_progresses"
+    query = f"SELECT * FROM {source}"
     params = []
     conditions = []
     
@@ -364,7 +849,7 @@ def get_case_progresses(case_id=None, start_date=None, end_date=None):
 def add_case_task(case_id, main_category, sub_category, content, 
                   start_date, end_date, status, writer, hours=None):
     """사건 세부 작업 추가"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -381,11 +866,11 @@ def add_case_task(case_id, main_category, sub_category, content,
     conn.close()
     return last_id
 
-def get_case_tasks(case_id=None, filter_dict=None):
+def get_case_tasks(case_id=None, filter_dict=None, include_archive=False, use_replica=False):
     """사건 세부 작업 조회"""
-    conn = sqlite3.connect(DB_PATH)
+    conn, source = _connect_for_read('case_tasks', include_archive, use_replica)
     
-    query = "SELECT * FROM case_tasks"
+    query = f"SELECT * FROM {source}"
     params = []
     conditions = []
     
@@ -407,9 +892,31 @@ def get_case_tasks(case_id=None, filter_dict=None):
     conn.close()
     return df
 
+def get_case_tasks_page(case_id=None, filter_dict=None, sort_by=None, ascending=False, limit=50, offset=0, use_replica=False):
+    """
+    사건 세부 작업을 페이지 단위로 조회
+    
+    Returns:
+        tuple: (해당 페이지 DataFrame, 필터에 맞는 전체 건수)
+    """
+    conditions = []
+    params = []
+    if case_id:
+        conditions.append("case_id = ?")
+        params.append(case_id)
+    if filter_dict:
+        for key, value in filter_dict.items():
+            if value and key in ['main_category', 'sub_category', 'status', 'writer']:
+                conditions.append(f"{key} = ?")
+                params.append(value)
+    
+    valid_columns = ['case_id', 'writer', 'main_category', 'sub_category', 'start_date', 'end_date', 'status', 'hours', 'created_at']
+    order_by = _page_order_by(sort_by, ascending, valid_columns, "start_date DESC, created_at DESC")
+    return _query_page('case_tasks', conditions, params, order_by, limit, offset, use_replica)
+
 def get_case_tasks_by_date_range(start_date, end_date, case_id=None):
     """날짜 범위로 사건 세부 작업 조회"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     
     query = "SELECT * FROM case_tasks WHERE (start_date BETWEEN ? AND ?) OR (end_date BETWEEN ? AND ?)"
     params = [start_date, end_date, start_date, end_date]
@@ -426,7 +933,7 @@ def get_case_tasks_by_date_range(start_date, end_date, case_id=None):
 # 디지털 장비 정보 관련 함수
 def add_digital_device(case_id, device_type, name, model=None, **kwargs):
     """디지털 장비 정보 추가"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -457,11 +964,55 @@ def add_digital_device(case_id, device_type, name, model=None, **kwargs):
     conn.close()
     return last_id
 
-def get_digital_devices(case_id=None, filter_dict=None):
+def add_digital_devices_bulk(case_id, devices, status='수집완료'):
+    """
+    여러 장비를 하나의 트랜잭션으로 일괄 추가 (수집 로그 일괄 등록용)
+    
+    같은 사건에 장비명과 해시값이 같은 장비가 이미 있으면 건너뛰므로
+    같은 로그 디렉터리를 다시 등록해도 중복되지 않습니다.
+    
+    Args:
+        devices: 장비 정보 dict 목록 (name, device_type 필수)
+    
+    Returns:
+        (inserted, skipped): 추가한 장비 수, 건너뛴 장비 수
+    """
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    today = created_at.split()[0]
+    
+    conn = _connect(DB_PATH)
+    existing = set(conn.execute(
+        "SELECT name, COALESCE(hash_value, '') FROM digital_devices WHERE case_id = ?", (case_id,)
+    ).fetchall())
+    
+    rows = []
+    for device in devices:
+        key = (device['name'], device.get('hash_value') or '')
+        if key in existing:
+            continue
+        existing.add(key)
+        rows.append((
+            case_id, device['device_type'], device['name'], device.get('model', ''),
+            device.get('serial_number', ''), device.get('manufacturer', ''), device.get('storage_size', ''),
+            device.get('acquisition_date') or today, device.get('acquisition_method', ''),
+            device.get('hash_value', ''), device.get('description', ''), status, created_at
+        ))
+    
+    with conn:
+        conn.executemany('''
+        INSERT INTO digital_devices
+        (case_id, device_type, name, model, serial_number, manufacturer, storage_size,
+         acquisition_date, acquisition_method, hash_value, description, status, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+    conn.close()
+    return len(rows), len(devices) - len(rows)
+
+def get_digital_devices(case_id=None, filter_dict=None, include_archive=False, use_replica=False):
     """디지털 장비 정보 조회"""
-    conn = sqlite3.connect(DB_PATH)
+    conn, source = _connect_for_read('digital_devices', include_archive, use_replica)
     
-    query = "SELECT * FROM digital_devices"
+    query = f"SELECT * FROM {source}"
     params = []
     conditions = []
     
@@ -483,19 +1034,23 @@ def get_digital_devices(case_id=None, filter_dict=None):
     conn.close()
     return df
 
+def get_device_hash_values(device_ids):
+    """장비 ID별 기록된 hash_value (해시 검증 시 해당 장비만 조회)"""
+    if not device_ids:
+        return {}
+    conn = _connect(DB_PATH)
+    cursor = conn.cursor()
+    placeholders = ", ".join("?" for _ in device_ids)
+    cursor.execute(f"SELECT id, hash_value FROM digital_devices WHERE id IN ({placeholders})", list(device_ids))
+    values = dict(cursor.fetchall())
+    conn.close()
+    return values
+
 def update_digital_device(device_id, **kwargs):
     """디지털 장비 정보 업데이트"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     
-    # 현재 데이터 조회
-    cursor.execute('SELECT * FROM digital_devices WHERE id=?', (device_id,))
-    current_data = cursor.fetchone()
-    
-    if not current_data:
-        conn.close()
-        return False
-    
     # 업데이트할 필드와 값 목록 생성
     updates = []
     params = []
@@ -503,30 +1058,34 @@ def update_digital_device(device_id, **kwargs):
     valid_fields = ['name', 'device_type', 'model', 'serial_number', 'manufacturer', 
                     'storage_size', 'acquisition_date', 'examination_start_date',
                     'examination_end_date', 'acquisition_method', 
-                    'hash_value', 'description', 'status']
+                    'hash_value', 'hash_md5', 'hash_sha1', 'hash_sha256',
+                    'hash_status', 'hash_verified_at', 'description', 'status']
     
     for key, value in kwargs.items():
         if value is not None and key in valid_fields:
             updates.append(f"{key} = ?")
             params.append(value)
     
-    # 업데이트할 내용이 있을 경우만 실행
+    # 변경할 내용이 있으면 UPDATE 한 번으로 처리하고 영향받은 행 수로 존재 여부 확인
     if updates:
         query = f"UPDATE digital_devices SET {', '.join(updates)} WHERE id = ?"
         params.append(device_id)
         cursor.execute(query, params)
+        exists = cursor.rowcount > 0
         conn.commit()
-        
+    else:
+        exists = cursor.execute('SELECT 1 FROM digital_devices WHERE id=?', (device_id,)).fetchone() is not None
+    
     conn.close()
-    return True
+    return exists
 
 # 기존 호환성 함수들 유지
-def get_case(case_id):
+def get_case(case_id, include_archive=False):
     """단일 사건 조회 (호환성 유지)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn, source = _connect_for_read('cases', include_archive)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM cases WHERE id=?', (case_id,))
+    cursor.execute(f'SELECT * FROM {source} WHERE id=?', (case_id,))
     row = cursor.fetchone()
     conn.close()
     if row:
@@ -535,7 +1094,7 @@ def get_case(case_id):
 
 def add_case_log(case_id, log_text):
     """기존 사건 로그 추가 함수 (호환성 유지)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('SELECT logs FROM cases WHERE id=?', (case_id,))
     row = cursor.fetchone()
@@ -554,7 +1113,7 @@ def add_case_log(case_id, log_text):
 
 def get_case_logs(case_id) -> List[dict]:
     """기존 사건 로그 조회 함수 (호환성 유지)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('SELECT logs FROM cases WHERE id=?', (case_id,))
     row = cursor.fetchone()
@@ -565,7 +1124,7 @@ def get_case_logs(case_id) -> List[dict]:
 
 def update_case_status(case_id, status, end_date=None):
     """기존 사건 상태 업데이트 함수 (호환성 유지)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     if status == "완료" and end_date is None:
         end_date = datetime.now().strftime("%Y-%m-%d")
@@ -577,7 +1136,7 @@ def update_case_status(case_id, status, end_date=None):
 # 업무 분류 관련 함수
 def add_work_category(main_category, sub_category, content, start_date, end_date, status, writer, hours=None, case_id=None, memo=None):
     """업무 분류 데이터 추가"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     date = datetime.now().strftime("%Y-%m-%d")
     created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -591,10 +1150,10 @@ def add_work_category(main_category, sub_category, content, start_date, end_date
     conn.close()
     return last_id
 
-def get_work_categories(filter_dict=None):
+def get_work_categories(filter_dict=None, include_archive=False, use_replica=False):
     """업무 분류 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    query = "SELECT * FROM work_categories"
+    conn, source = _connect_for_read('work_categories', include_archive, use_replica)
+    query = f"SELECT * FROM {source}"
     params = []
     
     if filter_dict:
@@ -612,19 +1171,154 @@ def get_work_categories(filter_dict=None):
     conn.close()
     return df
 
+# 통계 관련 함수
+def get_work_stats(start_date=None, end_date=None, include_archive=False, use_replica=True):
+    """
+    업무 기록(work_categories)과 사건 세부 작업(case_tasks)을 합친 통계를 SQL 집계로 조회
+    
+    Args:
+        start_date, end_date: 시작일(start_date) 기준 조회 기간 (YYYY-MM-DD)
+        include_archive: True이면 보관된 사건의 세부 작업도 포함
+    
+    Returns:
+        dict: by_category / by_status / by_month / by_writer 집계 DataFrame
+    """
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append("start_date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("start_date <= ?")
+        params.append(end_date)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    # 두 테이블에 같은 기간 조건을 적용해 인덱스를 사용하도록 함
+    conn, tasks_source = _connect_for_read('case_tasks', include_archive, use_replica)
+    source = f'''(
+        SELECT main_category, status, writer, start_date, hours FROM work_categories{where}
+        UNION ALL
+        SELECT main_category, status, writer, start_date, hours FROM {tasks_source}{where}
+    )'''
+    params = params * 2
+    
+    stats = {
+        "by_category": pd.read_sql_query(f'''
+            SELECT main_category, COUNT(*) AS count, COALESCE(SUM(hours), 0) AS hours
+            FROM {source} GROUP BY main_category ORDER BY count DESC
+        ''', conn, params=params),
+        "by_status": pd.read_sql_query(f'''
+            SELECT status, COUNT(*) AS count FROM {source} GROUP BY status ORDER BY count DESC
+        ''', conn, params=params),
+        "by_month": pd.read_sql_query(f'''
+            SELECT substr(start_date, 1, 7) AS month, COUNT(*) AS count, COALESCE(SUM(hours), 0) AS hours
+            FROM {source} GROUP BY month ORDER BY month
+        ''', conn, params=params),
+        "by_writer": pd.read_sql_query(f'''
+            SELECT writer, COUNT(*) AS count, COALESCE(SUM(hours), 0) AS hours
+            FROM {source} GROUP BY writer ORDER BY hours DESC
+        ''', conn, params=params)
+    }
+    conn.close()
+    return stats
+
+def get_hours_by_writer_date(start_date, end_date, include_archive=False, use_replica=True):
+    """
+    근무시간 집계용으로 작성자·날짜별 소요 시간 합계만 조회
+    
+    work_categories와 case_tasks의 시작일(start_date) 인덱스로 기간을 좁힌 뒤
+    (writer, date, hours) 행만 돌려주므로 1년치 전체 직원 데이터도 가볍게 조회됩니다.
+    
+    Args:
+        start_date, end_date: 조회 기간 (YYYY-MM-DD, 양 끝 포함)
+        include_archive: True이면 보관된 사건의 세부 작업 시간도 포함
+    
+    Returns:
+        DataFrame: writer, date, hours
+    """
+    conn, tasks_source = _connect_for_read('case_tasks', include_archive, use_replica)
+    query = f'''
+        SELECT writer, date, SUM(hours) AS hours FROM (
+            SELECT writer, start_date AS date, hours FROM work_categories
+            WHERE start_date >= ? AND start_date <= ? AND hours > 0
+            UNION ALL
+            SELECT writer, start_date AS date, hours FROM {tasks_source}
+            WHERE start_date >= ? AND start_date <= ? AND hours > 0
+        )
+        GROUP BY writer, date
+    '''
+    df = pd.read_sql_query(query, conn, params=[start_date, end_date] * 2)
+    conn.close()
+    return df
+
+def _query_page(table, conditions, params, order_by, limit, offset, use_replica=False):
+    """조건에 맞는 전체 건수와 한 페이지(LIMIT/OFFSET) 분량의 행만 조회"""
+    conn, source = _connect_for_read(table, use_replica=use_replica)
+    
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    total = conn.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+    
+    query = f"SELECT * FROM {source}{where} ORDER BY {order_by} LIMIT ? OFFSET ?"
+    df = pd.read_sql_query(query, conn, params=params + [limit, offset])
+    conn.close()
+    return df, total
+
+def _page_order_by(sort_by, ascending, valid_columns, default_order):
+    if sort_by not in valid_columns:
+        return default_order
+    return f"{sort_by} {'ASC' if ascending else 'DESC'}, id DESC"
+
+def get_work_categories_page(filter_dict=None, sort_by=None, ascending=False, limit=50, offset=0, use_replica=False):
+    """
+    업무 분류 데이터를 페이지 단위로 조회
+    
+    Returns:
+        tuple: (해당 페이지 DataFrame, 필터에 맞는 전체 건수)
+    """
+    conditions = []
+    params = []
+    if filter_dict:
+        for key, value in filter_dict.items():
+            if value and key in ['main_category', 'sub_category', 'status', 'writer', 'case_id']:
+                conditions.append(f"{key} = ?")
+                params.append(value)
+    
+    valid_columns = ['writer', 'main_category', 'sub_category', 'start_date', 'end_date', 'status', 'hours', 'created_at']
+    order_by = _page_order_by(sort_by, ascending, valid_columns, "created_at DESC")
+    return _query_page('work_categories', conditions, params, order_by, limit, offset, use_replica)
+
+def get_records_by_period(table, start_date, end_date, writer=None, include_archive=False, use_replica=False):
+    """
+    업무 기록(work_categories) 또는 사건 세부 작업(case_tasks)을 시작일 기간으로 조회 (보고서 일괄 생성용)
+    
+    Args:
+        table: 'work_categories' 또는 'case_tasks'
+        start_date, end_date: 시작일(start_date) 기준 조회 기간 (YYYY-MM-DD, 양 끝 포함)
+        writer: 작성자 (None이면 전체)
+        include_archive: True이면 보관 DB의 행도 포함
+    """
+    if table not in ('work_categories', 'case_tasks'):
+        raise ValueError(f"기간 조회를 지원하지 않는 테이블입니다: {table}")
+    
+    conditions = ["start_date >= ?", "start_date <= ?"]
+    params = [start_date, end_date]
+    if writer:
+        conditions.append("writer = ?")
+        params.append(writer)
+    
+    conn, source = _connect_for_read(table, include_archive, use_replica)
+    df = pd.read_sql_query(
+        f"SELECT * FROM {source} WHERE {' AND '.join(conditions)} ORDER BY start_date, created_at",
+        conn, params=params
+    )
+    conn.close()
+    return df
+
 def update_work_category(category_id, **kwargs):
     """업무 분류 데이터 수정"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     
-    # 현재 데이터 조회
-    cursor.execute('SELECT * FROM work_categories WHERE id=?', (category_id,))
-    current_data = cursor.fetchone()
-    
-    if not current_data:
-        conn.close()
-        return False
-    
     # 업데이트할 필드와 값 목록 생성
     updates = []
     params = []
@@ -638,19 +1332,22 @@ def update_work_category(category_id, **kwargs):
             updates.append(f"{key} = ?")
             params.append(value)
     
-    # 업데이트할 내용이 있을 경우만 실행
+    # 변경할 내용이 있으면 UPDATE 한 번으로 처리하고 영향받은 행 수로 존재 여부 확인
     if updates:
         query = f"UPDATE work_categories SET {', '.join(updates)} WHERE id = ?"
         params.append(category_id)
         cursor.execute(query, params)
+        exists = cursor.rowcount > 0
         conn.commit()
-        
+    else:
+        exists = cursor.execute('SELECT 1 FROM work_categories WHERE id=?', (category_id,)).fetchone() is not None
+    
     conn.close()
-    return True
+    return exists
 
 def delete_work_category(category_id):
     """업무 분류 데이터 삭제"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('DELETE FROM work_categories WHERE id=?', (category_id,))
     affected_rows = cursor.rowcount
@@ -658,5 +1355,1137 @@ def delete_work_category(category_id):
     conn.close()
     return affected_rows > 0
 
+# DB 유지보수 관련 함수
+def enable_incremental_vacuum(conn):
+    """auto_vacuum 모드를 INCREMENTAL로 전환 (기존 DB는 최초 1회 VACUUM 필요)"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] == 2:
+        return
+    
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # 이미 테이블이 있는 DB는 VACUUM을 해야 모드 변경이 적용됨
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+    if cursor.fetchone()[0] > 0:
+        print("auto_vacuum 모드 변경을 위해 VACUUM 실행 중...")
+        cursor.execute("VACUUM")
+
+def _get_meta(cursor, key):
+    cursor.execute("SELECT value FROM db_meta WHERE key = ?", (key,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _set_meta(cursor, key, value):
+    cursor.execute('''
+    INSERT INTO db_meta (key, value) VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    ''', (key, value))
+
+def _seconds_since(timestamp):
+    """'%Y-%m-%d %H:%M:%S' 형식 시각으로부터 경과한 초 (기록이 없으면 None)"""
+    if not timestamp:
+        return None
+    return (datetime.now() - datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")).total_seconds()
+
+def run_maintenance(optimize=True, analyze=False, vacuum=True):
+    """
+    DB 유지보수 실행
+    
+    Args:
+        optimize: PRAGMA optimize 실행 여부
+        analyze: 전체 ANALYZE 실행 여부 (통계 정보 갱신)
+        vacuum: 빈 페이지를 incremental_vacuum으로 반환할지 여부
+    
+    Returns:
+        dict: 실행한 작업과 반환된 페이지 수
+    """
+    with _maintenance_lock:
+        conn = _connect(DB_PATH)
+        cursor = conn.cursor()
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        result = {"optimize": False, "analyze": False, "freed_pages": 0}
+        
+        if vacuum:
+            cursor.execute("PRAGMA freelist_count")
+            before = cursor.fetchone()[0]
+            if before > 0:
+                # cursor.execute는 한 단계만 실행해 페이지가 1개만 반환되므로 executescript로 끝까지 실행
+                conn.executescript("PRAGMA incremental_vacuum;")
+                cursor.execute("PRAGMA freelist_count")
+                result["freed_pages"] = before - cursor.fetchone()[0]
+                _set_meta(cursor, "last_vacuum", now)
+        
+        if analyze:
+            cursor.execute("ANALYZE")
+            _set_meta(cursor, "last_analyze", now)
+            result["analyze"] = True
+        
+        if optimize:
+            cursor.execute("PRAGMA optimize")
+            _set_meta(cursor, "last_optimize", now)
+            result["optimize"] = True
+        
+        _set_meta(cursor, "last_maintenance", now)
+        conn.commit()
+        conn.close()
+        return result
+
+def is_db_idle(idle_seconds=MAINTENANCE_IDLE_SECONDS):
+    """DB 파일의 마지막 수정 이후 idle_seconds 이상 지났는지 확인"""
+    try:
+        return time.time() - os.path.getmtime(DB_PATH) >= idle_seconds
+    except OSError:
+        return False
+
+def maybe_run_maintenance():
+    """유휴 상태이고 주기가 지난 유지보수 작업만 실행 (실행한 경우 결과 반환)"""
+    if not is_db_idle():
+        return None
+    
+    conn = _connect(DB_PATH)
+    cursor = conn.cursor()
+    since_optimize = _seconds_since(_get_meta(cursor, "last_optimize"))
+    since_analyze = _seconds_since(_get_meta(cursor, "last_analyze"))
+    cursor.execute("PRAGMA freelist_count")
+    free_pages = cursor.fetchone()[0]
+    conn.close()
+    
+    need_optimize = since_optimize is None or since_optimize >= OPTIMIZE_INTERVAL
+    need_analyze = since_analyze is None or since_analyze >= ANALYZE_INTERVAL
+    need_vacuum = free_pages >= VACUUM_MIN_FREE_PAGES
+    
+    if not (need_optimize or need_analyze or need_vacuum):
+        return None
+    
+    return run_maintenance(optimize=need_optimize, analyze=need_analyze, vacuum=need_vacuum)
+
+def _maintenance_loop():
+    while True:
+        time.sleep(MAINTENANCE_CHECK_INTERVAL)
+        try:
+            result = maybe_run_maintenance()
+            if result:
+                print(f"DB 유지보수 실행: {result}")
+        except sqlite3.Error as e:
+            # 다른 사용자가 쓰는 중이면 다음 주기에 다시 시도
+            print(f"DB 유지보수 중 오류 발생: {e}")
+
+def start_maintenance_scheduler():
+    """백그라운드 유지보수 스레드 시작 (프로세스당 1회)"""
+    global _maintenance_thread
+    if _maintenance_thread is not None and _maintenance_thread.is_alive():
+        return _maintenance_thread
+    
+    _maintenance_thread = threading.Thread(target=_maintenance_loop, name="db-maintenance", daemon=True)
+    _maintenance_thread.start()
+    return _maintenance_thread
+
+def get_db_stats():
+    """
+    DB 상태 조회 (관리자 화면용)
+    
+    Returns:
+        dict: 페이지 크기/개수, 빈 페이지 수, 파일 크기, 마지막 유지보수 시각,
+              objects(테이블/인덱스별 페이지 수와 크기 DataFrame)
+    """
+    conn = _connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    stats = {}
+    for pragma in ["page_size", "page_count", "freelist_count", "auto_vacuum"]:
+        cursor.execute(f"PRAGMA {pragma}")
+        stats[pragma] = cursor.fetchone()[0]
+    stats["file_size"] = os.path.getsize(DB_PATH) if os.path.exists(DB_PATH) else 0
+    
+    for key in ["last_maintenance", "last_optimize", "last_analyze", "last_vacuum"]:
+        stats[key] = _get_meta(cursor, key)
+    
+    # 테이블/인덱스별 크기 (dbstat 가상 테이블을 지원하는 SQLite에서만 가능)
+    try:
+        stats["objects"] = pd.read_sql_query('''
+        SELECT m.type AS type, m.tbl_name AS table_name, s.name AS name,
+               COUNT(*) AS pages, SUM(s.pgsize) AS size
+        FROM dbstat s
+        JOIN sqlite_master m ON m.name = s.name
+        GROUP BY s.name
+        ORDER BY size DESC
+        ''', conn)
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        stats["objects"] = pd.read_sql_query('''
+        SELECT type, tbl_name AS table_name, name FROM sqlite_master
+        WHERE type IN ('table', 'index')
+        ORDER BY tbl_name, type DESC
+        ''', conn)
+    
+    conn.close()
+    return stats
+
+# 보관(아카이브) DB 관련 함수
+def _attach_archive(conn):
+    """보관 DB를 archive 스키마로 연결 (파일이 없으면 새로 생성됨)"""
+    conn.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_DB_PATH,))
+
+def _table_columns(cursor, table, schema='main'):
+    cursor.execute(f"PRAGMA {schema}.table_info({table})")
+    return [column[1] for column in cursor.fetchall()]
+
+def _ensure_archive_schema(cursor):
+    """보관 DB에 운영 DB와 같은 구조의 테이블을 만들고 누락된 컬럼을 추가"""
+    for table in ['cases'] + ARCHIVE_CHILD_TABLES:
+        cursor.execute("SELECT sql FROM main.sqlite_master WHERE type='table' AND name=?", (table,))
+        create_sql = cursor.fetchone()[0]
+        cursor.execute(create_sql.replace(f"CREATE TABLE {table}", f"CREATE TABLE IF NOT EXISTS archive.{table}", 1))
+        
+        # 운영 DB에 나중에 추가된 컬럼 반영
+        archive_columns = _table_columns(cursor, table, 'archive')
+        cursor.execute(f"PRAGMA main.table_info({table})")
+        for column in cursor.fetchall():
+            if column[1] not in archive_columns:
+                cursor.execute(f"ALTER TABLE archive.{table} ADD COLUMN {column[1]} {column[2]}")
+
+def _archive_union_source(cursor, table):
+    """운영 DB와 보관 DB의 테이블을 합친 서브쿼리 (is_archived 컬럼으로 구분)"""
+    main_columns = _table_columns(cursor, table, 'main')
+    archive_columns = _table_columns(cursor, table, 'archive')
+    if not archive_columns:
+        return table
+    
+    column_list = ", ".join(main_columns)
+    archive_column_list = ", ".join(c if c in archive_columns else f"NULL AS {c}" for c in main_columns)
+    return (f"(SELECT {column_list}, 0 AS is_archived FROM main.{table} "
+            f"UNION ALL SELECT {archive_column_list}, 1 AS is_archived FROM archive.{table}) AS {table}")
+
+def _connect_for_read(table, include_archive=False, use_replica=False):
+    """
+    조회용 연결과 FROM 절에 쓸 테이블 이름 반환
+    
+    include_archive=True이고 보관 DB가 있을 때만 ATTACH하여 운영/보관 데이터를 합쳐 조회합니다.
+    use_replica=True이면 최신 상태의 읽기 전용 복제본이 있을 때 복제본에서 조회합니다.
+    """
+    if use_replica and not include_archive:
+        conn = _connect_replica()
+        metrics.CACHE_REQUESTS.inc(cache="read_replica")
+        if conn is not None:
+            return conn, table
+        metrics.CACHE_MISSES.inc(cache="read_replica")
+    
+    # 동시 조회 스레드 풀 작업자는 스레드별 읽기 연결을 재사용
+    thread_conn = getattr(_thread_local, "read_conn", None)
+    if thread_conn is not None and not include_archive:
+        thread_conn.row_factory = None
+        return thread_conn, table
+    
+    conn = _connect(DB_PATH)
+    if not include_archive or not os.path.exists(ARCHIVE_DB_PATH):
+        return conn, table
+    
+    _attach_archive(conn)
+    return conn, _archive_union_source(conn.cursor(), table)
+
+def archive_completed_cases(months=12):
+    """
+    완료된 지 months개월이 지난 사건과 하위 데이터를 보관 DB로 이동
+    
+    사건(cases)과 하위 테이블(ARCHIVE_CHILD_TABLES)의 복사/삭제를 하나의 트랜잭션으로 처리합니다.
+    
+    Returns:
+        dict: 테이블별 이동한 행 수
+    """
+    conn = _connect(DB_PATH, isolation_level=None)
+    cursor = conn.cursor()
+    _attach_archive(conn)
+    
+    moved = {}
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        _ensure_archive_schema(cursor)
+        
+        cursor.execute("SELECT date('now', 'localtime', ?)", (f"-{int(months)} months",))
+        cutoff = cursor.fetchone()[0]
+        
+        cursor.execute("DROP TABLE IF EXISTS temp.archive_case_ids")
+        cursor.execute('''
+        CREATE TEMP TABLE archive_case_ids AS
+        SELECT id FROM main.cases
+        WHERE status = '완료' AND end_date IS NOT NULL AND end_date != '' AND end_date < ?
+        ''', (cutoff,))
+        
+        # 하위 테이블을 먼저 옮긴 뒤 사건을 옮김
+        for table in ARCHIVE_CHILD_TABLES + ['cases']:
+            key_column = 'id' if table == 'cases' else 'case_id'
+            column_list = ", ".join(_table_columns(cursor, table, 'main'))
+            cursor.execute(f'''
+            INSERT INTO archive.{table} ({column_list})
+            SELECT {column_list} FROM main.{table}
+            WHERE {key_column} IN (SELECT id FROM temp.archive_case_ids)
+            ''')
+            cursor.execute(f"DELETE FROM main.{table} WHERE {key_column} IN (SELECT id FROM temp.archive_case_ids)")
+            moved[table] = cursor.rowcount
+        
+        cursor.execute("DROP TABLE temp.archive_case_ids")
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK")
+        conn.close()
+        raise
+    
+    conn.close()
+    return moved
+
+def get_archive_stats():
+    """보관 DB의 테이블별 행 수 조회 (보관 DB가 없으면 빈 dict)"""
+    if not os.path.exists(ARCHIVE_DB_PATH):
+        return {}
+    
+    conn = _connect(ARCHIVE_DB_PATH)
+    cursor = conn.cursor()
+    stats = {}
+    for table in ['cases'] + ARCHIVE_CHILD_TABLES:
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            stats[table] = cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            stats[table] = 0
+    conn.close()
+    return stats
+
+def get_archived_until():
+    """보관된 사건 세부 작업의 가장 늦은 시작일 (보관된 작업이 없으면 None)"""
+    if not os.path.exists(ARCHIVE_DB_PATH):
+        return None
+    
+    def build():
+        conn = _connect(ARCHIVE_DB_PATH)
+        try:
+            return conn.execute("SELECT MAX(start_date) FROM case_tasks").fetchone()[0]
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            conn.close()
+    
+    # 보관 실행은 운영 DB에서도 행을 지우므로 운영 DB의 변경 카운터로 캐시
+    return _cached_labels(("archived_until",), build)
+
+def archive_covers_period(start_date):
+    """start_date부터의 기간에 보관된 데이터가 있을 수 있는지 (통계/근무시간 조회의 include_archive 값)"""
+    archived_until = get_archived_until()
+    return archived_until is not None and (not start_date or str(start_date) <= archived_until)
+
+def _restore_archived_work_categories():
+    """
+    예전 보관 작업이 보관 DB로 옮긴 업무 기록(work_categories)을 운영 DB로 되돌림
+    
+    보관 이후 같은 id가 운영 DB에서 다시 쓰였으면 새 id로 추가합니다.
+    
+    Returns:
+        int: 되돌린 행 수
+    """
+    if not os.path.exists(ARCHIVE_DB_PATH):
+        return 0
+    
+    conn = _connect(DB_PATH, isolation_level=None)
+    cursor = conn.cursor()
+    _attach_archive(conn)
+    archive_columns = _table_columns(cursor, 'work_categories', 'archive')
+    if not archive_columns:
+        conn.close()
+        return 0
+    
+    columns = [c for c in _table_columns(cursor, 'work_categories', 'main') if c in archive_columns]
+    column_list = ", ".join(columns)
+    data_column_list = ", ".join(c for c in columns if c != 'id')
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DROP TABLE IF EXISTS temp.restore_conflict_ids")
+        cursor.execute('''
+        CREATE TEMP TABLE restore_conflict_ids AS
+        SELECT id FROM archive.work_categories WHERE id IN (SELECT id FROM main.work_categories)
+        ''')
+        cursor.execute(f'''
+        INSERT INTO main.work_categories ({column_list})
+        SELECT {column_list} FROM archive.work_categories WHERE id NOT IN (SELECT id FROM temp.restore_conflict_ids)
+        ''')
+        restored = cursor.rowcount
+        cursor.execute(f'''
+        INSERT INTO main.work_categories ({data_column_list})
+        SELECT {data_column_list} FROM archive.work_categories WHERE id IN (SELECT id FROM temp.restore_conflict_ids)
+        ORDER BY id
+        ''')
+        restored += cursor.rowcount
+        cursor.execute("DROP TABLE temp.restore_conflict_ids")
+        cursor.execute("DROP TABLE archive.work_categories")
+        cursor.execute("COMMIT")
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK")
+        conn.close()
+        raise
+    
+    conn.close()
+    return restored
+
+# 읽기 전용 복제본 관련 함수
+def get_change_counter():
+    """DB 파일 헤더의 file change counter 조회 (쓰기 트랜잭션이 커밋될 때마다 증가)"""
+    with open(DB_PATH, 'rb') as f:
+        f.seek(24)
+        return int.from_bytes(f.read(4), 'big')
+
+def refresh_read_replica():
+    """운영 DB 전체를 backup API로 새 메모리 DB에 복사한 뒤 복제본을 교체"""
+    counter = get_change_counter()
+    
+    with _replica_lock:
+        generation = _replica_state["generation"] + 1
+    uri = f"file:worklog_replica_{generation}?mode=memory&cache=shared"
+    
+    # 복사하는 동안 기존 복제본은 그대로 사용 가능
+    source = _connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    holder = _connect(uri, uri=True, check_same_thread=False)
+    source.backup(holder)
+    source.close()
+    
+    with _replica_lock:
+        old_holder = _replica_state["holder"]
+        _replica_state.update({
+            "uri": uri,
+            "holder": holder,
+            "change_counter": counter,
+            "refreshed_at": time.time(),
+            "generation": generation
+        })
+    
+    # 이전 복제본은 이미 열린 조회 연결이 모두 닫히면 메모리에서 해제됨
+    if old_holder is not None:
+        old_holder.close()
+
+def _connect_replica():
+    """운영 DB와 변경 카운터가 같은(최신) 복제본에 대한 연결 반환, 없거나 오래되었으면 None"""
+    try:
+        counter = get_change_counter()
+    except OSError:
+        return None
+    
+    with _replica_lock:
+        if _replica_state["uri"] is None:
+            return None
+        if _replica_state["change_counter"] != counter:
+            # 오래된 복제본 대신 운영 DB를 사용하고 백그라운드 갱신을 앞당김
+            _replica_wakeup.set()
+            return None
+        # 교체 중에 메모리 DB가 해제되지 않도록 락 안에서 연결
+        return _connect(_replica_state["uri"], uri=True)
+
+def _replica_loop():
+    while True:
+        _replica_wakeup.wait(REPLICA_POLL_INTERVAL)
+        _replica_wakeup.clear()
+        try:
+            counter = get_change_counter()
+            age = time.time() - (_replica_state["refreshed_at"] or 0)
+            if counter != _replica_state["change_counter"] or age >= REPLICA_MAX_STALENESS:
+                refresh_read_replica()
+        except (sqlite3.Error, OSError) as e:
+            # 쓰기 중이라 복사하지 못한 경우 다음 주기에 다시 시도
+            print(f"읽기 복제본 갱신 중 오류 발생: {e}")
+
+def start_read_replica():
+    """읽기 전용 복제본을 만들고 백그라운드 갱신 스레드 시작 (프로세스당 1회)"""
+    global _replica_thread
+    if _replica_thread is not None and _replica_thread.is_alive():
+        return _replica_thread
+    
+    refresh_read_replica()
+    _replica_thread = threading.Thread(target=_replica_loop, name="db-read-replica", daemon=True)
+    _replica_thread.start()
+    return _replica_thread
+
+def get_replica_status():
+    """읽기 전용 복제본 상태 조회 (관리자 화면용)"""
+    with _replica_lock:
+        state = dict(_replica_state)
+    
+    refreshed_at = state["refreshed_at"]
+    try:
+        is_fresh = state["uri"] is not None and state["change_counter"] == get_change_counter()
+    except OSError:
+        is_fresh = False
+    
+    return {
+        "enabled": state["uri"] is not None,
+        "is_fresh": is_fresh,
+        "generation": state["generation"],
+        "refreshed_at": datetime.fromtimestamp(refreshed_at).strftime("%Y-%m-%d %H:%M:%S") if refreshed_at else None
+    }
+
+# 선택 목록(selectbox)용 조회 함수
+def _cached_labels(key, build):
+    """데이터 세대(change counter)별로 한 번만 label dict를 만들어 재사용"""
+    generation = get_change_counter()
+    with _label_cache_lock:
+        if _label_cache["generation"] != generation:
+            _label_cache["generation"] = generation
+            _label_cache["maps"] = {}
+        labels = _label_cache["maps"].get(key)
+    
+    metrics.CACHE_REQUESTS.inc(cache="labels")
+    if labels is None:
+        metrics.CACHE_MISSES.inc(cache="labels")
+        labels = build()
+        with _label_cache_lock:
+            if _label_cache["generation"] == generation:
+                _label_cache["maps"][key] = labels
+    return labels
+
+def _case_label(title, manager, with_manager):
+    return f"{title} (담당: {manager})" if with_manager else title
+
+def get_case_labels(status=None, with_manager=True):
+    """
+    사건 ID → 표시 이름 dict (사건 목록과 같은 순서)
+    
+    selectbox의 format_func에서 dict 조회만 하도록 데이터가 바뀔 때만 새로 만듭니다.
+    """
+    def build():
+        conn = _connect(DB_PATH)
+        query = "SELECT id, title, manager FROM cases"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY start_date DESC, id DESC"
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return {case_id: _case_label(title, manager, with_manager) for case_id, title, manager in rows}
+    
+    return _cached_labels(("cases", status, with_manager), build)
+
+def search_case_labels(prefix, status=None, with_manager=True, limit=50):
+    """사건명 앞글자(prefix)로 사건 검색 - cases(title) 인덱스 범위 조회 사용"""
+    if not prefix:
+        return get_case_labels(status, with_manager)
+    
+    # title LIKE 'prefix%' 대신 인덱스를 타는 범위 조건 사용
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    query = "SELECT id, title, manager FROM cases WHERE title >= ? AND title < ?"
+    params = [prefix, upper]
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    query += " ORDER BY title LIMIT ?"
+    params.append(limit)
+    
+    conn = _connect(DB_PATH)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return {case_id: _case_label(title, manager, with_manager) for case_id, title, manager in rows}
+
+def get_device_labels(case_id, include_archive=False):
+    """사건에 속한 장비 ID → 장비명 dict"""
+    def build():
+        conn, source = _connect_for_read('digital_devices', include_archive)
+        rows = conn.execute(
+            f"SELECT id, name FROM {source} WHERE case_id = ? ORDER BY acquisition_date DESC, created_at DESC",
+            (case_id,)
+        ).fetchall()
+        conn.close()
+        return dict(rows)
+    
+    return _cached_labels(("devices", case_id, include_archive), build)
+
+# 동시 조회 관련 함수
+class _ThreadReadConnection(_TracedConnection):
+    """스레드 풀 작업자가 계속 재사용하는 읽기 연결 (조회 함수의 close() 호출은 무시)"""
+    def close(self):
+        pass
+    
+    def dispose(self):
+        super().close()
+
+def _init_loader_thread():
+    _thread_local.read_conn = _connect(
+        f"file:{DB_PATH}?mode=ro", uri=True, factory=_ThreadReadConnection, check_same_thread=False
+    )
+
+def _get_loader_pool():
+    global _loader_pool
+    with _loader_pool_lock:
+        if _loader_pool is None:
+            _loader_pool = ThreadPoolExecutor(
+                max_workers=LOADER_MAX_WORKERS,
+                thread_name_prefix="db-loader",
+                initializer=_init_loader_thread
+            )
+        return _loader_pool
+
+def load_concurrently(queries):
+    """
+    서로 독립적인 조회들을 스레드 풀에서 동시에 실행
+    
+    각 작업자 스레드는 자신의 읽기 전용 연결을 재사용하므로, 화면 로딩 시간이
+    조회 시간의 합이 아니라 가장 느린 조회 시간에 가까워집니다.
+    
+    Args:
+        queries: {이름: (조회 함수, kwargs dict)} 형태의 dict
+    
+    Returns:
+        dict: {이름: 조회 결과}
+    """
+    pool = _get_loader_pool()
+    page = getattr(_trace_local, "page", None)
+    trace = getattr(_trace_local, "queries", None)
+    futures = {name: pool.submit(_traced_call, page, trace, func, kwargs) for name, (func, kwargs) in queries.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+def _traced_call(page, queries, func, kwargs):
+    """작업자 스레드의 조회도 요청한 화면의 SQL 추적 기록에 남도록 전달"""
+    _trace_local.page, _trace_local.queries = page, queries
+    try:
+        return func(**kwargs)
+    finally:
+        _trace_local.page = _trace_local.queries = None
+
+# 첨부 파일 관련 함수 (파일 저장/썸네일 생성은 attachments.py)
+def add_attachment(sha256, case_id, file_name, size, mime_type=None, device_id=None,
+                   description=None, thumb_status='대기'):
+    """첨부 파일 메타 정보 추가"""
+    conn = _connect(DB_PATH)
+    cursor = conn.cursor()
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    cursor.execute('''
+    INSERT INTO attachments
+    (sha256, case_id, device_id, file_name, mime_type, size, thumb_status, description, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (sha256, case_id, device_id, file_name, mime_type, size, thumb_status, description, created_at))
+    
+    conn.commit()
+    last_id = cursor.lastrowid
+    conn.close()
+    return last_id
+
+def get_attachments(case_id, device_id=None, limit=None, offset=0):
+    """
+    사건(또는 장비)의 첨부 파일 목록 (최근 등록순)
+    
+    Returns:
+        (DataFrame, total): 현재 페이지 목록과 전체 건수
+    """
+    conditions = ["case_id = ?"]
+    params = [case_id]
+    if device_id:
+        conditions.append("device_id = ?")
+        params.append(device_id)
+    return _query_page(
+        'attachments', conditions, params, "id DESC",
+        -1 if limit is None else limit, offset
+    )
+
+def set_attachment_thumb_status(sha256, thumb_status):
+    """같은 내용(sha256)의 첨부 파일 썸네일 상태 일괄 변경"""
+    conn = _connect(DB_PATH)
+    conn.execute("UPDATE attachments SET thumb_status = ? WHERE sha256 = ?", (thumb_status, sha256))
+    conn.commit()
+    conn.close()
+
+def delete_attachment(attachment_id):
+    """
+    첨부 파일 메타 정보 삭제
+    
+    Returns:
+        str: 더 이상 참조하는 첨부가 없는 파일의 sha256 (파일 정리용, 아직 참조가 있으면 None)
+    """
+    conn = _connect(DB_PATH)
+    row = conn.execute("SELECT sha256 FROM attachments WHERE id = ?", (attachment_id,)).fetchone()
+    if not row:
+        conn.close()
+        return None
+    
+    conn.execute("DELETE FROM attachments WHERE id = ?", (attachment_id,))
+    remaining = conn.execute("SELECT COUNT(*) FROM attachments WHERE sha256 = ?", (row[0],)).fetchone()[0]
+    conn.commit()
+    conn.close()
+    return None if remaining else row[0]
+
+# 일괄 수정 (편집 그리드의 변경분을 한 트랜잭션으로 반영)
+BULK_EDIT_COLUMNS = {
+    'cases': ['manager', 'status', 'priority', 'end_date'],
+    'case_tasks': ['writer', 'status', 'end_date', 'hours'],
+    'digital_devices': ['status', 'examination_start_date', 'examination_end_date']
+}
+
+def _same_value(a, b):
+    """편집 전 값과 현재 DB 값 비교 (None/NaN/빈 문자열은 같은 값으로 취급)"""
+    a = None if a is None or a == '' or (isinstance(a, float) and a != a) else a
+    b = None if b is None or b == '' or (isinstance(b, float) and b != b) else b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return float(a) == float(b)
+    return a == b
+
+def apply_bulk_edits(table, edits):
+    """
+    여러 행의 변경분을 하나의 트랜잭션으로 반영
+    
+    트랜잭션 안에서 대상 행의 현재 값을 한 번에 읽어, 편집을 시작할 때의 값(original)과
+    달라진 행은 충돌로 돌려주고 나머지는 변경 컬럼 조합별 executemany로 UPDATE합니다.
+    
+    Args:
+        table: BULK_EDIT_COLUMNS에 있는 테이블 이름
+        edits: [{"id": 행 ID, "original": {컬럼: 편집 전 값}, "changes": {컬럼: 새 값}}, ...]
+    
+    Returns:
+        dict: updated(반영한 ID 목록), conflicts([{id, column, expected, current}, ...])
+    """
+    allowed = BULK_EDIT_COLUMNS[table]
+    # 수정 가능한 컬럼 중 실제로 값이 바뀐 것만 남김
+    edits = [
+        {**edit, "changes": {
+            k: v for k, v in edit["changes"].items()
+            if k in allowed and not _same_value(edit["original"].get(k), v)
+        }}
+        for edit in edits
+    ]
+    edits = [edit for edit in edits if edit["changes"]]
+    result = {"updated": [], "conflicts": []}
+    if not edits:
+        return result
+    
+    conn = _connect(DB_PATH, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        
+        ids = [edit["id"] for edit in edits]
+        rows = conn.execute(
+            f"SELECT id, {', '.join(allowed)} FROM {table} WHERE id IN ({', '.join('?' * len(ids))})", ids
+        ).fetchall()
+        current = {row[0]: dict(zip(allowed, row[1:])) for row in rows}
+        
+        batches = {}
+        for edit in edits:
+            row = current.get(edit["id"])
+            if row is None:
+                result["conflicts"].append({"id": edit["id"], "column": None, "expected": None, "current": "삭제됨"})
+                continue
+            
+            # 편집한 컬럼의 값이 그 사이 다른 곳에서 바뀌었으면 덮어쓰지 않음
+            changed_elsewhere = [
+                column for column in edit["changes"]
+                if not _same_value(edit["original"].get(column), row[column])
+            ]
+            if changed_elsewhere:
+                for column in changed_elsewhere:
+                    result["conflicts"].append({
+                        "id": edit["id"], "column": column,
+                        "expected": edit["original"].get(column), "current": row[column]
+                    })
+                continue
+            
+            columns = tuple(sorted(edit["changes"]))
+            batches.setdefault(columns, []).append([edit["changes"][c] for c in columns] + [edit["id"]])
+            result["updated"].append(edit["id"])
+        
+        for columns, params in batches.items():
+            conn.executemany(
+                f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?", params
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    
+    return result
+
+# 사건 자료 묶음 내보내기용 조회 (사건에 연결된 기록을 한 행씩 읽음)
+CASE_RECORD_ORDER = {
+    "case_progresses": "date, id",
+    "case_tasks": "start_date, id",
+    "digital_devices": "acquisition_date, id"
+}
+
+def iter_case_records(table, case_id, include_archive=False):
+    """
+    사건에 연결된 기록을 날짜순으로 한 행씩 반환 (제너레이터)
+    
+    DataFrame으로 올리지 않고 커서를 그대로 순회하므로 행이 많아도 메모리를 적게 씁니다.
+    
+    Yields:
+        첫 값은 컬럼 이름 목록, 이후 행 tuple
+    """
+    if table not in CASE_RECORD_ORDER:
+        raise ValueError(f"사건 기록 테이블이 아닙니다: {table}")
+    
+    conn, source = _connect_for_read(table, include_archive)
+    try:
+        cursor = conn.execute(
+            f"SELECT * FROM {source} WHERE case_id = ? ORDER BY {CASE_RECORD_ORDER[table]}", (case_id,)
+        )
+        yield [column[0] for column in cursor.description]
+        yield from cursor
+    finally:
+        conn.close()
+
+# 사건 타임라인 (출처별로 날짜 정렬된 커서를 병합)
+TIMELINE_SOURCES = {
+    "progress": ("case_progresses", "진행 내역",
+                 "SELECT date, id, writer, content FROM {source} WHERE case_id = ? ORDER BY date DESC, id DESC"),
+    "task": ("case_tasks", "세부 작업",
+             "SELECT start_date, id, writer, '[' || main_category || '/' || sub_category || '] ' || content || "
+             "' (' || status || ')' FROM {source} WHERE case_id = ? ORDER BY start_date DESC, id DESC"),
+    "device_acquired": ("digital_devices", "장비 수집",
+                        "SELECT acquisition_date, id, NULL, name || ' (' || device_type || ')' FROM {source} "
+                        "WHERE case_id = ? AND acquisition_date > '' ORDER BY acquisition_date DESC, id DESC"),
+    "device_exam_start": ("digital_devices", "장비 검토 시작",
+                          "SELECT examination_start_date, id, NULL, name || ' (' || device_type || ')' FROM {source} "
+                          "WHERE case_id = ? AND examination_start_date > '' "
+                          "ORDER BY examination_start_date DESC, id DESC"),
+    "device_exam_end": ("digital_devices", "장비 검토 완료",
+                        "SELECT examination_end_date, id, NULL, name || ' (' || device_type || ')' FROM {source} "
+                        "WHERE case_id = ? AND examination_end_date > '' "
+                        "ORDER BY examination_end_date DESC, id DESC"),
+    "work": ("work_categories", "업무 기록",
+             "SELECT start_date, id, writer, '[' || main_category || '/' || sub_category || '] ' || content "
+             "FROM {source} WHERE case_id = ? ORDER BY start_date DESC, id DESC")
+}
+
+def _connect_for_timeline(include_archive=False):
+    """타임라인 조회용 연결과 테이블별 FROM 절 이름 반환 (보관 DB 포함 시 ATTACH)"""
+    tables = {table for table, _, _ in TIMELINE_SOURCES.values()}
+    conn = _connect(DB_PATH)
+    if not include_archive or not os.path.exists(ARCHIVE_DB_PATH):
+        return conn, {table: table for table in tables}
+    
+    _attach_archive(conn)
+    cursor = conn.cursor()
+    return conn, {table: _archive_union_source(cursor, table) for table in tables}
+
+def _timeline_events(cursor, kind, label):
+    """출처 커서의 행에 이벤트 종류를 붙여 반환"""
+    for date, source_id, writer, content in cursor:
+        yield date, kind, label, source_id, writer, content
+
+def iter_case_timeline(case_id, include_archive=False):
+    """
+    사건의 활동 내역을 최신순으로 하나씩 반환 (제너레이터)
+    
+    출처(TIMELINE_SOURCES)마다 날짜 내림차순 커서를 하나씩 열고 heapq.merge로 병합하므로,
+    필요한 만큼만 읽고 멈추면 나머지 행은 조회하지 않습니다.
+    
+    Yields:
+        tuple: (date, kind, label, source_id, writer, content)
+    """
+    conn, sources = _connect_for_timeline(include_archive)
+    try:
+        streams = []
+        for kind, (table, label, query) in TIMELINE_SOURCES.items():
+            cursor = conn.execute(query.format(source=sources[table]), (case_id,))
+            streams.append(_timeline_events(cursor, kind, label))
+        yield from heapq.merge(*streams, key=lambda event: event[0] or "", reverse=True)
+    finally:
+        conn.close()
+
+def count_case_timeline(case_id, include_archive=False):
+    """사건 타임라인 전체 이벤트 수"""
+    conn, sources = _connect_for_timeline(include_archive)
+    total = 0
+    for table, _, query in TIMELINE_SOURCES.values():
+        count_query = f"SELECT COUNT(*) FROM ({query.format(source=sources[table])})"
+        total += conn.execute(count_query, (case_id,)).fetchone()[0]
+    conn.close()
+    return total
+
+def get_case_timeline(case_id, limit=50, offset=0, include_archive=False):
+    """
+    사건 타임라인의 한 페이지(최신순 offset번째부터 limit개)만 조회
+    
+    Returns:
+        DataFrame: date, kind, label, source_id, writer, content
+    """
+    events = iter_case_timeline(case_id, include_archive)
+    try:
+        page = list(itertools.islice(events, offset, offset + limit))
+    finally:
+        events.close()
+    return pd.DataFrame(page, columns=["date", "kind", "label", "source_id", "writer", "content"])
+
+# 사건 유사도 색인 (중복 등록 의심 사건 검색)
+def _index_case_similarity(conn, case_id, title, client=None, description=None):
+    """
+    사건 하나의 MinHash 서명과 LSH 버킷 저장 (호출한 쪽에서 commit)
+    
+    Returns:
+        bool: 색인 여부 (비교할 글자가 없는 사건은 기존 색인만 지우고 False)
+    """
+    signature = similarity.case_signature(title, client, description)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    conn.execute("DELETE FROM case_lsh_buckets WHERE case_id = ?", (case_id,))
+    if signature is None:
+        conn.execute("DELETE FROM case_minhash WHERE case_id = ?", (case_id,))
+        return False
+    conn.execute(
+        "INSERT OR REPLACE INTO case_minhash (case_id, signature, updated_at) VALUES (?, ?, ?)",
+        (case_id, similarity.signature_to_blob(signature), now)
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO case_lsh_buckets (band, bucket, case_id) VALUES (?, ?, ?)",
+        [(band, bucket, case_id) for band, bucket in similarity.band_buckets(signature)]
+    )
+    return True
+
+def _index_missing_case_similarity(conn):
+    """서명이 없는 사건만 색인 (init_db에서 기존 데이터 보완용)"""
+    rows = conn.execute('''
+        SELECT id, title, client, description FROM cases
+        WHERE id NOT IN (SELECT case_id FROM case_minhash)
+    ''').fetchall()
+    return sum(_index_case_similarity(conn, *row) for row in rows)
+
+def rebuild_case_similarity_index():
+    """
+    전체 사건의 유사도 색인을 하나의 트랜잭션으로 재구성 (보관된 사건의 색인은 제거)
+    
+    Returns:
+        int: 색인한 사건 수
+    """
+    conn = _connect(DB_PATH)
+    conn.execute("DELETE FROM case_lsh_buckets")
+    conn.execute("DELETE FROM case_minhash")
+    count = _index_missing_case_similarity(conn)
+    conn.commit()
+    conn.close()
+    return count
+
+def find_similar_cases(title, client=None, description=None, threshold=similarity.DEFAULT_THRESHOLD,
+                       limit=5, exclude_case_id=None):
+    """
+    입력한 사건 정보와 비슷한 기존 사건 검색
+    
+    LSH 버킷이 하나라도 겹치는 사건만 후보로 읽어 서명을 비교합니다.
+    
+    Returns:
+        DataFrame: id, title, client, manager, status, start_date, similarity (유사도 내림차순)
+    """
+    columns = ["id", "title", "client", "manager", "status", "start_date"]
+    signature = similarity.case_signature(title, client, description)
+    if signature is None:
+        return pd.DataFrame(columns=columns + ["similarity"])
+    buckets = similarity.band_buckets(signature)
+    
+    conn = _connect(DB_PATH)
+    placeholders = ", ".join(["(?, ?)"] * len(buckets))
+    rows = conn.execute(f'''
+        WITH keys(band, bucket) AS (VALUES {placeholders})
+        SELECT m.case_id, m.signature FROM case_minhash m JOIN cases c ON c.id = m.case_id
+        WHERE m.case_id IN (
+            SELECT b.case_id FROM case_lsh_buckets b JOIN keys k ON b.band = k.band AND b.bucket = k.bucket
+        )
+    ''', [value for key in buckets for value in key]).fetchall()
+    
+    scores = {
+        case_id: similarity.estimate_similarity(signature, similarity.signature_from_blob(blob))
+        for case_id, blob in rows if case_id != exclude_case_id
+    }
+    matches = sorted((item for item in scores.items() if item[1] >= threshold), key=lambda item: -item[1])[:limit]
+    
+    if not matches:
+        conn.close()
+        return pd.DataFrame(columns=columns + ["similarity"])
+    
+    ids = [case_id for case_id, _ in matches]
+    df = pd.read_sql_query(
+        f"SELECT {', '.join(columns)} FROM cases WHERE id IN ({', '.join('?' * len(ids))})", conn, params=ids
+    )
+    conn.close()
+    
+    df["similarity"] = df["id"].map(dict(matches))
+    return df.sort_values("similarity", ascending=False).reset_index(drop=True)
+
+def find_duplicate_case_clusters(threshold=similarity.DEFAULT_THRESHOLD):
+    """
+    전체 사건에서 중복 의심 사건 묶음 검색 (배치 작업)
+    
+    같은 LSH 버킷에 들어간 사건 쌍만 서명으로 비교하고, 기준 이상인 쌍을 묶어 클러스터로 만듭니다.
+    
+    Returns:
+        DataFrame: cluster, id, title, client, manager, status, start_date (2건 이상 묶음만)
+    """
+    conn = _connect(DB_PATH)
+    signatures = {}
+    for case_id, blob in conn.execute(
+        "SELECT m.case_id, m.signature FROM case_minhash m JOIN cases c ON c.id = m.case_id"
+    ):
+        signature = similarity.signature_from_blob(blob)
+        # 색인 재구성 전에 내용 없는 사건으로 저장된 예전 서명은 비교하지 않음
+        if not similarity.is_empty_signature(signature):
+            signatures[case_id] = signature
+    buckets = conn.execute('''
+        SELECT group_concat(case_id) FROM case_lsh_buckets
+        GROUP BY band, bucket HAVING COUNT(*) > 1
+    ''').fetchall()
+    
+    # 후보 쌍 검증 후 union-find로 묶기
+    parent = {}
+    
+    def find(case_id):
+        while parent.get(case_id, case_id) != case_id:
+            case_id = parent[case_id]
+        return case_id
+    
+    checked = set()
+    for (members,) in buckets:
+        ids = sorted(int(case_id) for case_id in members.split(",") if int(case_id) in signatures)
+        for pair in itertools.combinations(ids, 2):
+            if pair in checked:
+                continue
+            checked.add(pair)
+            if similarity.estimate_similarity(signatures[pair[0]], signatures[pair[1]]) >= threshold:
+                parent[find(pair[1])] = find(pair[0])
+    
+    columns = ["cluster", "id", "title", "client", "manager", "status", "start_date"]
+    clusters = {}
+    for case_id in parent:
+        clusters.setdefault(find(case_id), set()).add(case_id)
+    for root in list(clusters):
+        clusters[root].add(root)
+    
+    if not clusters:
+        conn.close()
+        return pd.DataFrame(columns=columns)
+    
+    cluster_of = {
+        case_id: number
+        for number, members in enumerate(sorted(clusters.values(), key=min), 1)
+        for case_id in members
+    }
+    ids = list(cluster_of)
+    df = pd.read_sql_query(
+        f"SELECT id, title, client, manager, status, start_date FROM cases WHERE id IN ({', '.join('?' * len(ids))})",
+        conn, params=ids
+    )
+    conn.close()
+    
+    df.insert(0, "cluster", df["id"].map(cluster_of))
+    return df.sort_values(["cluster", "id"]).reset_index(drop=True)
+
+# 내보내기 작업 큐 (JOBS_DB_PATH의 export_jobs 테이블)
+EXPORT_JOB_ACTIVE_STATUSES = ('대기', '실행 중')
+EXPORT_JOB_COLUMNS = ['status', 'progress', 'message', 'artifact_path', 'file_name',
+                      'started_at', 'finished_at', 'expires_at']
+
+def init_jobs_db():
+    """내보내기 작업 테이블 생성"""
+    conn = _connect(JOBS_DB_PATH)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS export_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,                 -- 작업 종류 (export_jobs.EXPORT_KINDS 키)
+        label TEXT NOT NULL,                -- 화면 표시용 설명
+        params TEXT NOT NULL,               -- 작업 인자 (JSON)
+        status TEXT NOT NULL,               -- 상태 (대기/실행 중/완료/실패/만료)
+        progress REAL NOT NULL DEFAULT 0,   -- 진행률 (0~1)
+        message TEXT,                       -- 진행 메시지 또는 오류 내용
+        artifact_path TEXT,                 -- 생성된 파일 경로
+        file_name TEXT,                     -- 다운로드 파일명
+        created_at TEXT NOT NULL,           -- 등록일시
+        started_at TEXT,                    -- 시작일시
+        finished_at TEXT,                   -- 종료일시
+        expires_at TEXT                     -- 파일 보관 만료일시
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_export_jobs_status ON export_jobs(status, expires_at)")
+    conn.commit()
+    conn.close()
+
+def add_export_job(kind, label, params):
+    """내보내기 작업 등록 (대기 상태)"""
+    conn = _connect(JOBS_DB_PATH)
+    cursor = conn.cursor()
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    cursor.execute('''
+    INSERT INTO export_jobs (kind, label, params, status, created_at)
+    VALUES (?, ?, ?, '대기', ?)
+    ''', (kind, label, json.dumps(params, ensure_ascii=False), created_at))
+    
+    conn.commit()
+    last_id = cursor.lastrowid
+    conn.close()
+    return last_id
+
+def update_export_job(job_id, **fields):
+    """내보내기 작업 상태/진행률 등 갱신 (EXPORT_JOB_COLUMNS의 컬럼만)"""
+    columns = [column for column in fields if column in EXPORT_JOB_COLUMNS]
+    if not columns:
+        return False
+    
+    conn = _connect(JOBS_DB_PATH)
+    cursor = conn.execute(
+        f"UPDATE export_jobs SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+        [fields[c] for c in columns] + [job_id]
+    )
+    conn.commit()
+    updated = cursor.rowcount > 0
+    conn.close()
+    return updated
+
+def get_export_job(job_id):
+    """내보내기 작업 하나 조회 (params는 dict로 변환)"""
+    conn = _connect(JOBS_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM export_jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    return job
+
+def get_export_jobs(limit=50):
+    """최근 내보내기 작업 목록 (최근 등록순)"""
+    conn = _connect(JOBS_DB_PATH)
+    df = pd.read_sql_query("SELECT * FROM export_jobs ORDER BY id DESC LIMIT ?", conn, params=(limit,))
+    conn.close()
+    return df
+
+def count_active_export_jobs():
+    """대기 중이거나 실행 중인 내보내기 작업 수"""
+    conn = _connect(JOBS_DB_PATH)
+    count = conn.execute(
+        "SELECT COUNT(*) FROM export_jobs WHERE status IN (?, ?)", EXPORT_JOB_ACTIVE_STATUSES
+    ).fetchone()[0]
+    conn.close()
+    return count
+
+def fail_interrupted_export_jobs(message):
+    """
+    서버 재시작 등으로 끝나지 못한 작업(대기/실행 중)을 실패로 표시
+    
+    Returns:
+        list: 실패로 바꾼 작업 ID 목록
+    """
+    conn = _connect(JOBS_DB_PATH)
+    job_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM export_jobs WHERE status IN (?, ?)", EXPORT_JOB_ACTIVE_STATUSES
+    )]
+    conn.executemany(
+        "UPDATE export_jobs SET status = '실패', message = ?, finished_at = ? WHERE id = ?",
+        [(message, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id) for job_id in job_ids]
+    )
+    conn.commit()
+    conn.close()
+    return job_ids
+
+def get_expired_export_jobs(now=None):
+    """보관 기간이 지난 완료 작업 목록 [(id, artifact_path), ...]"""
+    now = now or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect(JOBS_DB_PATH)
+    rows = conn.execute(
+        "SELECT id, artifact_path FROM export_jobs WHERE status = '완료' AND expires_at <= ?", (now,)
+    ).fetchall()
+    conn.close()
+    return rows
+
 # 데이터베이스 초기화 (앱 시작 시 항상 실행)
 init_db() 
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+수집 로그 기반 디지털 장비 일괄 등록
+
+이미징 도구가 남긴 로그/보고서 파일(FTK Imager .txt, ewfacquire 등 .E01 동반 로그, CSV 목록)을
+여러 프로세스에서 동시에 분석해 장비 정보와 해시를 추출합니다.
+추출한 장비는 db.add_digital_devices_bulk로 한 트랜잭션에 저장합니다.
+"""
+import os
+import re
+import csv
+import io
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+# 분석 대상 확장자
+LOG_EXTENSIONS = (".txt", ".log", ".csv")
+
+# 동시에 분석할 프로세스 수 기본값
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# 파일 수가 이보다 적으면 프로세스 풀 없이 현재 프로세스에서 분석
+PARALLEL_MIN_FILES = 8
+
+# 텍스트 로그의 "항목: 값" 키 → 장비 필드 (먼저 나온 값을 사용)
+LOG_FIELD_ALIASES = {
+    "evidence number": "name",
+    "unique description": "name",
+    "drive model": "model",
+    "model": "model",
+    "drive serial number": "serial_number",
+    "serial number": "serial_number",
+    "manufacturer": "manufacturer",
+    "source data size": "storage_size",
+    "media size": "storage_size",
+    "acquisition started": "acquisition_date",
+    "acquiry started at": "acquisition_date",
+    "examiner": "examiner",
+    "examiner name": "examiner",
+    "notes": "notes",
+    "drive interface type": "interface",
+    "removable drive": "removable",
+    "created by": "tool"
+}
+
+# CSV 헤더 → 장비 필드
+CSV_FIELD_ALIASES = {
+    "name": "name", "기기명": "name", "장비명": "name",
+    "device_type": "device_type", "기기 종류": "device_type", "기기종류": "device_type", "유형": "device_type",
+    "model": "model", "모델명": "model",
+    "serial_number": "serial_number", "serial": "serial_number", "시리얼번호": "serial_number",
+    "manufacturer": "manufacturer", "제조사": "manufacturer",
+    "storage_size": "storage_size", "저장용량": "storage_size",
+    "acquisition_date": "acquisition_date", "수집일자": "acquisition_date",
+    "acquisition_method": "acquisition_method", "수집방법": "acquisition_method",
+    "hash_value": "hash_value", "hash": "hash_value", "해시값": "hash_value",
+    "description": "description", "설명": "description"
+}
+
+DEVICE_FIELDS = [
+    "name", "device_type", "model", "serial_number", "manufacturer", "storage_size",
+    "acquisition_date", "acquisition_method", "hash_value", "description"
+]
+
+_KEY_VALUE_RE = re.compile(r"^\s*([^:\[\]]{2,40}?)\s*:\s*(.*?)\s*$")
+_HASH_RE = re.compile(r"\b(MD5|SHA-?1|SHA-?256)\b[^:\n]*:\s*([0-9a-fA-F]{32,64})\b", re.IGNORECASE)
+_DATE_FORMATS = ["%a %b %d %H:%M:%S %Y", "%b %d, %Y %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"]
+_MOBILE_KEYWORDS = ("iphone", "galaxy", "sm-", "android", "ipad", "pixel")
+
+def _read_text(path):
+    """로그 파일을 UTF-8 → CP949 순으로 읽기 (한글 윈도 도구 로그 대응)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
+
+def normalize_date(value):
+    """로그의 날짜 표기를 YYYY-MM-DD로 변환 (인식하지 못하면 빈 문자열)"""
+    value = (value or "").strip()
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    match = re.search(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})", value)
+    if match:
+        return "{}-{:02d}-{:02d}".format(*map(int, match.groups()))
+    return ""
+
+def _guess_device_type(fields):
+    """모델명/인터페이스로 기기 종류 추정"""
+    model = fields.get("model", "").lower()
+    if any(keyword in model for keyword in _MOBILE_KEYWORDS):
+        return "휴대폰"
+    if fields.get("removable", "").lower() == "true" or fields.get("interface", "").lower() == "usb":
+        return "저장장치"
+    return "PC"
+
+def parse_text_log(path):
+    """
+    이미징 도구 텍스트 로그(FTK Imager, ewfacquire 등)에서 장비 1건 추출
+
+    Returns:
+        list: 장비 정보 dict 목록 (인식한 항목이 없으면 빈 목록)
+    """
+    text = _read_text(path)
+    fields = {}
+    for line in text.splitlines():
+        match = _KEY_VALUE_RE.match(line)
+        if not match:
+            continue
+        field = LOG_FIELD_ALIASES.get(match.group(1).strip().lower())
+        if field and match.group(2) and field not in fields:
+            fields[field] = match.group(2)
+
+    # 계산 해시 (검증 결과에 같은 해시가 다시 나오므로 알고리즘별 첫 값만 사용)
+    hashes = {}
+    for algorithm, value in _HASH_RE.findall(text):
+        hashes.setdefault(algorithm.upper().replace("-", ""), value.lower())
+
+    if not fields and not hashes:
+        return []
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    description = [f"수집 로그: {os.path.basename(path)}"]
+    if fields.get("examiner"):
+        description.append(f"수집자: {fields['examiner']}")
+    if fields.get("notes"):
+        description.append(fields["notes"])
+    if re.search(r":\s*(verified|match(ed)?)\s*$", text, re.IGNORECASE | re.MULTILINE):
+        description.append("수집 도구 해시 검증: 일치")
+
+    # FTK Imager 로그 첫 줄은 "Created By <도구명>" 형식 (콜론 없음)
+    created_by = re.search(r"^\s*Created By\s+(.+?)\s*$", text, re.IGNORECASE | re.MULTILINE)
+    tool = fields.get("tool") or (created_by.group(1) if created_by else "")
+    method = re.sub(r"[®™]", "", tool).strip() or ("ewfacquire" if "ewfacquire" in text.lower() else "")
+    if ".e01" in text.lower():
+        method = f"{method} (E01)".strip()
+
+    return [{
+        "name": fields.get("name") or stem,
+        "device_type": _guess_device_type(fields),
+        "model": fields.get("model", ""),
+        "serial_number": fields.get("serial_number", ""),
+        "manufacturer": fields.get("manufacturer", ""),
+        "storage_size": fields.get("storage_size", ""),
+        "acquisition_date": normalize_date(fields.get("acquisition_date")),
+        "acquisition_method": method,
+        "hash_value": "\n".join(f"{algorithm}: {value}" for algorithm, value in hashes.items()),
+        "description": "\n".join(description)
+    }]
+
+def parse_csv_log(path):
+    """
+    장비 목록 CSV(도구 내보내기 또는 직접 작성)에서 장비 여러 건 추출
+
+    Returns:
+        list: 장비 정보 dict 목록
+    """
+    reader = csv.DictReader(io.StringIO(_read_text(path)))
+    devices = []
+    for row in reader:
+        device = {field: "" for field in DEVICE_FIELDS}
+        for header, value in row.items():
+            field = CSV_FIELD_ALIASES.get((header or "").strip().lower())
+            if field and value:
+                device[field] = value.strip()
+        if not device["name"]:
+            continue
+        device["acquisition_date"] = normalize_date(device["acquisition_date"])
+        device["device_type"] = device["device_type"] or _guess_device_type(device)
+        devices.append(device)
+    return devices
+
+def parse_log_file(path):
+    """
+    로그 파일 하나 분석 (프로세스 풀 작업 단위)
+
+    Returns:
+        (path, devices, error)
+    """
+    try:
+        if path.lower().endswith(".csv"):
+            devices = parse_csv_log(path)
+        else:
+            devices = parse_text_log(path)
+        if not devices:
+            return path, [], "인식할 수 있는 장비 정보가 없습니다."
+        return path, devices, None
+    except Exception as e:
+        return path, [], str(e)
+
+def find_log_files(directory):
+    """디렉터리(하위 포함)에서 분석 대상 로그 파일 목록"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if file_name.lower().endswith(LOG_EXTENSIONS):
+                paths.append(os.path.join(root, file_name))
+    return sorted(paths)
+
+def parse_directory(directory, max_workers=DEFAULT_WORKERS):
+    """
+    디렉터리의 로그 파일을 병렬 분석
+
+    Returns:
+        (devices, errors): 장비 dict 목록(source_file 포함), [(파일 경로, 오류 메시지), ...]
+    """
+    paths = find_log_files(directory)
+    if max_workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        results = map(parse_log_file, paths)
+    else:
+        chunksize = max(1, len(paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(parse_log_file, paths, chunksize=chunksize))
+
+    devices = []
+    errors = []
+    for path, parsed, error in results:
+        if error:
+            errors.append((path, error))
+        for device in parsed:
+            device["source_file"] = os.path.relpath(path, directory)
+            devices.append(device)
+    return devices, errors
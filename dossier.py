@@ -0,0 +1,296 @@
+"""
+사건 자료 묶음(ZIP) 내보내기
+
+사건마다 개요, 진행 내역, 세부 작업, 디지털 장비(해시 포함), 타임라인 PDF를 ZIP 하나로 묶습니다.
+여러 사건은 프로세스 풀에서 사건 단위로 동시에 만들고, 각 파일은 DB 커서를 한 행씩 읽어
+임시 파일에 쓴 뒤 ZIP에 옮기므로 통합 문서 전체를 메모리에 올리지 않습니다.
+
+사용 예:
+    python dossier.py --case 3 7 12 -o dossiers --workers 4
+"""
+import os
+import re
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DOSSIER_DIR = "dossiers"
+
+# 동시에 만들 사건 수 기본값
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# 타임라인 PDF용 한글 TTF 글꼴 후보 (WORKLOG_PDF_FONT 환경 변수가 우선)
+# fpdf 1.7은 .ttc를 읽지 못하므로 .ttf만 지정
+FONT_CANDIDATES = [
+    "fonts/NanumGothic.ttf",
+    "NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/Library/Fonts/NanumGothic.ttf"
+]
+
+# ZIP에 넣을 표 (파일명, 테이블, 시트 이름)
+DOSSIER_SHEETS = [
+    ("02_진행내역.xlsx", "case_progresses", "진행 내역"),
+    ("03_세부작업.xlsx", "case_tasks", "세부 작업"),
+    ("04_디지털장비.xlsx", "digital_devices", "디지털 장비")
+]
+
+# 표 머리글 (없는 컬럼은 원래 이름 사용)
+COLUMN_LABELS = {
+    "id": "ID", "case_id": "사건 ID", "date": "날짜", "writer": "작성자", "content": "내용",
+    "main_category": "대분류", "sub_category": "소분류", "start_date": "시작일", "end_date": "종료일",
+    "status": "상태", "hours": "소요시간", "created_at": "생성일시", "device_type": "기기 종류",
+    "name": "기기명", "model": "모델명", "acquisition_date": "수집일자",
+    "examination_start_date": "검토 시작일", "examination_end_date": "검토 완료일",
+    "serial_number": "시리얼번호", "manufacturer": "제조사", "storage_size": "저장용량",
+    "acquisition_method": "수집방법", "hash_value": "해시값(기록)", "hash_md5": "MD5(계산)",
+    "hash_sha1": "SHA-1(계산)", "hash_sha256": "SHA-256(계산)", "hash_status": "해시 검증",
+    "hash_verified_at": "해시 계산일시", "description": "설명", "is_archived": "보관 여부"
+}
+
+CASE_FIELDS = [
+    ("id", "사건 ID"), ("title", "사건명"), ("manager", "담당자"), ("client", "의뢰인"),
+    ("case_type", "사건 종류"), ("status", "상태"), ("priority", "우선순위"),
+    ("start_date", "시작일"), ("end_date", "종료일"), ("created_at", "등록일시"), ("description", "사건 설명")
+]
+
+def find_pdf_font():
+    """타임라인 PDF에 쓸 한글 글꼴 경로 (없으면 None)"""
+    candidates = [os.environ.get("WORKLOG_PDF_FONT")] + FONT_CANDIDATES
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+def dossier_file_name(case):
+    """사건 ZIP 파일명 (파일 시스템에서 쓸 수 없는 문자 제거)"""
+    title = re.sub(r'[\\/:*?"<>|\s]+', "_", str(case.get("title") or "")).strip("_")[:40]
+    return f"case{case['id']}_{title}.zip" if title else f"case{case['id']}.zip"
+
+def _write_sheet(path, sheet_name, records):
+    """
+    커서 행을 constant_memory 모드로 Excel 파일에 기록 (행마다 디스크로 내보냄)
+
+    Returns:
+        int: 데이터 행 수
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({"bold": True, "fg_color": "#D7E4BC", "border": 1})
+
+    columns = next(records)
+    for col_num, column in enumerate(columns):
+        worksheet.write(0, col_num, COLUMN_LABELS.get(column, column), header_format)
+        worksheet.set_column(col_num, col_num, 50 if column in ("content", "description", "hash_value") else 14)
+
+    rows = 0
+    for rows, row in enumerate(records, start=1):
+        worksheet.write_row(rows, 0, row)
+    workbook.close()
+    return rows
+
+def _write_summary(path, case, counts, timeline_note):
+    """사건 개요 텍스트 파일 기록"""
+    with open(path, "w", encoding="utf-8-sig") as f:
+        f.write(f"사건 자료 묶음 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 생성)\n\n")
+        for field, label in CASE_FIELDS:
+            value = case.get(field)
+            f.write(f"{label}: {'' if value is None else value}\n")
+        f.write("\n[포함 자료]\n")
+        for label, count in counts.items():
+            f.write(f"{label}: {count:,}건\n")
+        if timeline_note:
+            f.write(f"\n{timeline_note}\n")
+
+def _write_timeline_pdf(path, case, events, font_path):
+    """
+    사건 타임라인 PDF 기록
+
+    Returns:
+        int: 이벤트 수
+    """
+    import fpdf
+
+    # 글꼴 폴더에 .pkl 캐시를 쓰지 않도록 설정 (시스템 글꼴 폴더는 쓰기 권한이 없을 수 있음)
+    fpdf.set_global("FPDF_CACHE_MODE", 1)
+    pdf = fpdf.FPDF()
+    pdf.add_font("Korean", "", font_path, uni=True)
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font("Korean", "", 16)
+    pdf.cell(0, 10, f"사건 타임라인: {case.get('title', '')}", 0, 1, "C")
+    pdf.set_font("Korean", "", 9)
+    pdf.cell(0, 6, f"생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, "C")
+    pdf.ln(4)
+
+    count = 0
+    for date, _, label, _, writer, content in events:
+        count += 1
+        pdf.set_font("Korean", "", 10)
+        pdf.cell(0, 6, f"{date or '-'}  [{label}]" + (f"  {writer}" if writer else ""), 0, 1)
+        pdf.set_font("Korean", "", 9)
+        pdf.multi_cell(0, 5, str(content or ""))
+        pdf.ln(1)
+
+    if not count:
+        pdf.cell(0, 6, "기록된 활동이 없습니다.", 0, 1)
+    pdf.output(path, "F")
+    return count
+
+def _write_timeline_text(path, events):
+    """한글 글꼴이 없을 때 타임라인을 텍스트로 기록"""
+    count = 0
+    with open(path, "w", encoding="utf-8-sig") as f:
+        for date, _, label, _, writer, content in events:
+            count += 1
+            f.write(f"{date or '-'}\t{label}\t{writer or ''}\t{content or ''}\n")
+    return count
+
+def build_case_dossier(case_id, output_dir=DOSSIER_DIR, include_archive=False):
+    """
+    사건 하나의 자료 묶음 ZIP 생성 (프로세스 풀 작업 단위)
+
+    파일마다 임시 폴더에 쓴 뒤 ZIP에 추가하고 바로 지우며,
+    ZIP도 임시 이름으로 만든 뒤 완성되면 교체하므로 중단되어도 반쯤 쓴 파일이 남지 않습니다.
+
+    Returns:
+        (case_id, ZIP 경로, 항목별 건수 dict)
+    """
+    # 작업 프로세스가 부모와 같은 DB(WORKLOG_DB_PATH)를 쓰도록 여기서 import
+    import db
+
+    case = db.get_case(case_id, include_archive=include_archive)
+    if case is None:
+        raise ValueError(f"사건을 찾을 수 없습니다: {case_id}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    zip_path = os.path.join(output_dir, dossier_file_name(case))
+    temp_zip_path = f"{zip_path}.{os.getpid()}.tmp"
+    counts = {}
+
+    with tempfile.TemporaryDirectory() as work_dir, \
+            zipfile.ZipFile(temp_zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        def add(file_name, writer):
+            path = os.path.join(work_dir, file_name)
+            result = writer(path)
+            zf.write(path, file_name)
+            os.remove(path)
+            return result
+
+        for file_name, table, sheet_name in DOSSIER_SHEETS:
+            records = db.iter_case_records(table, case_id, include_archive)
+            counts[sheet_name] = add(file_name, lambda path: _write_sheet(path, sheet_name, records))
+
+        font_path = find_pdf_font()
+        events = db.iter_case_timeline(case_id, include_archive)
+        if font_path:
+            counts["타임라인"] = add("05_타임라인.pdf", lambda path: _write_timeline_pdf(path, case, events, font_path))
+            timeline_note = None
+        else:
+            counts["타임라인"] = add("05_타임라인.txt", lambda path: _write_timeline_text(path, events))
+            timeline_note = "※ 한글 글꼴(NanumGothic.ttf 등)을 찾지 못해 타임라인을 텍스트 파일로 저장했습니다."
+
+        add("01_사건개요.txt", lambda path: _write_summary(path, case, counts, timeline_note))
+
+    os.replace(temp_zip_path, zip_path)
+    return case_id, zip_path, counts
+
+def export_dossiers(case_ids, output_dir=DOSSIER_DIR, include_archive=False,
+                    max_workers=DEFAULT_WORKERS, progress_callback=None):
+    """
+    여러 사건의 자료 묶음을 병렬 생성
+
+    Args:
+        case_ids: 사건 ID 목록
+        max_workers: 프로세스 수 (1이면 현재 프로세스에서 순서대로 생성)
+        progress_callback: 사건 하나가 끝날 때마다 호출 (case_id, done, total)
+
+    Returns:
+        (results, errors): {case_id: (ZIP 경로, 항목별 건수)}, [(case_id, 오류 메시지), ...]
+    """
+    results = {}
+    errors = []
+
+    def finish(case_id, run):
+        try:
+            _, path, counts = run()
+            results[case_id] = (path, counts)
+        except Exception as e:
+            errors.append((case_id, str(e)))
+        if progress_callback:
+            progress_callback(case_id, len(results) + len(errors), len(case_ids))
+
+    if max_workers <= 1 or len(case_ids) <= 1:
+        for case_id in case_ids:
+            finish(case_id, lambda: build_case_dossier(case_id, output_dir, include_archive))
+        return results, errors
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(case_ids))) as pool:
+        futures = {pool.submit(build_case_dossier, case_id, output_dir, include_archive): case_id
+                   for case_id in case_ids}
+        for future in as_completed(futures):
+            finish(futures[future], future.result)
+    return results, errors
+
+def bundle_dossiers(paths, bundle_path):
+    """사건별 ZIP 여러 개를 ZIP 하나로 묶기 (이미 압축되어 있으므로 무압축 저장)"""
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_STORED) as zf:
+        for path in paths:
+            zf.write(path, os.path.basename(path))
+    return bundle_path
+
+def cleanup_dossiers(output_dir=DOSSIER_DIR, max_age_hours=24):
+    """오래된 자료 묶음 파일 삭제"""
+    if not os.path.isdir(output_dir):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for entry in os.scandir(output_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+def main(argv=None):
+    """명령행 실행: 사건 ID 목록의 자료 묶음 생성"""
+    parser = argparse.ArgumentParser(description="사건 자료 묶음(ZIP) 생성")
+    parser.add_argument("--db", help="DB 파일 경로 (기본값: worklog.db 또는 WORKLOG_DB_PATH)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--case", type=int, nargs="+", help="사건 ID 목록")
+    group.add_argument("--all-cases", action="store_true", help="전체 사건")
+    parser.add_argument("--include-archive", action="store_true", help="보관된 사건 포함")
+    parser.add_argument("-o", "--output-dir", default=DOSSIER_DIR, help="ZIP 저장 폴더")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 만들 사건 수")
+    args = parser.parse_args(argv)
+
+    # db import 전에 지정해야 하고, 작업 프로세스에도 환경 변수로 전달됨
+    if args.db:
+        os.environ["WORKLOG_DB_PATH"] = os.path.abspath(args.db)
+
+    case_ids = args.case
+    if args.all_cases:
+        import db
+        case_ids = db.get_cases(include_archive=args.include_archive)["id"].astype(int).tolist()
+
+    def report(case_id, done, total):
+        print(f"[{done}/{total}] 사건 {case_id}")
+
+    started = time.perf_counter()
+    results, errors = export_dossiers(case_ids, args.output_dir, args.include_archive, args.workers, report)
+    for case_id, (path, counts) in sorted(results.items()):
+        print(f"  ✔ {path} ({', '.join(f'{label} {count:,}건' for label, count in counts.items())})")
+    for case_id, error in errors:
+        print(f"  ✘ 사건 {case_id}: {error}", file=sys.stderr)
+    print(f"완료: {len(results)}개 생성, 실패 {len(errors)}개, {time.perf_counter() - started:.1f}초")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
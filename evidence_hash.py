@@ -0,0 +1,294 @@
+"""
+증거 이미지 해시 계산
+
+대용량 이미지 파일을 큰 버퍼로 한 번만 읽으면서 MD5/SHA-1/SHA-256을 동시에 계산합니다.
+여러 파일은 프로세스 풀로 병렬 처리하고, 파일 단위 체크포인트로 중단된 작업을 이어서 실행합니다.
+(해시는 순차 계산이라 한 파일을 구간별로 나눠 병렬 계산할 수 없으므로 병렬화는 파일 단위입니다.)
+
+계산 결과는 저장된 파일 그대로의 해시입니다. raw/dd 이미지는 원본 매체 해시와 같지만,
+E01 등 압축 컨테이너는 수집 도구가 기록한 매체 해시와 다를 수 있습니다.
+
+사용 예:
+    python evidence_hash.py --device 12 D:/images/phone.dd --device 13 D:/images/pc.dd --workers 2
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# 한 번에 읽을 크기 (8 MiB)
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# 동시에 계산할 파일 수 기본값
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+HASH_ALGORITHMS = ("md5", "sha1", "sha256")
+
+# 16진수 길이로 알고리즘 구분 (수기 입력된 hash_value 검증용)
+_HEX_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256"}
+
+# 화면에서 요청한 장비 해시 계산은 백그라운드 스레드에서 실행
+# (hashlib과 파일 읽기는 GIL을 놓으므로 스레드로 충분, 진행 상태는 프로세스 메모리에 보관)
+BACKGROUND_WORKERS = 2
+
+_background_pool = None
+_background_jobs = {}
+_background_lock = threading.Lock()
+
+def hash_file(path, chunk_size=CHUNK_SIZE, progress_callback=None):
+    """
+    파일 하나를 한 번 읽으면서 MD5/SHA-1/SHA-256 계산
+
+    미리 할당한 버퍼에 readinto로 읽어 청크마다 새 bytes 객체를 만들지 않습니다.
+
+    Args:
+        progress_callback: 청크를 읽을 때마다 지금까지 읽은 바이트 수로 호출
+
+    Returns:
+        dict: path, size, md5, sha1, sha256, seconds
+    """
+    hashers = [hashlib.new(name) for name in HASH_ALGORITHMS]
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    started = time.perf_counter()
+
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            chunk = view[:read]
+            for hasher in hashers:
+                hasher.update(chunk)
+            size += read
+            if progress_callback:
+                progress_callback(size)
+
+    result = {name: hasher.hexdigest() for name, hasher in zip(HASH_ALGORITHMS, hashers)}
+    result.update(path=path, size=size, seconds=time.perf_counter() - started)
+    return result
+
+def _file_key(path):
+    """체크포인트 비교용 파일 식별 정보 (경로, 크기, 수정 시각)"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+def load_checkpoint(checkpoint_path):
+    """체크포인트 파일 로드 (없거나 손상되었으면 빈 dict)"""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return {}
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    """체크포인트를 임시 파일에 쓴 뒤 교체 (쓰는 중 중단되어도 기존 파일 유지)"""
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, checkpoint_path)
+
+def hash_files(paths, max_workers=DEFAULT_WORKERS, checkpoint_path=None, progress_callback=None):
+    """
+    여러 파일의 해시를 병렬 계산
+
+    체크포인트에 같은 크기/수정 시각으로 기록된 파일은 다시 계산하지 않고,
+    파일 하나가 끝날 때마다 체크포인트를 저장합니다.
+
+    Args:
+        paths: 파일 경로 목록
+        max_workers: 프로세스 수 (1이면 현재 프로세스에서 순서대로 계산)
+        checkpoint_path: 체크포인트 JSON 파일 경로 (None이면 저장하지 않음)
+        progress_callback: 파일 하나가 끝날 때마다 호출 (result, done, total)
+
+    Returns:
+        dict: results(경로 → 결과), bytes, seconds, throughput(MB/s), resumed(건너뛴 파일 수)
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    checkpoint = load_checkpoint(checkpoint_path)
+    results = {}
+
+    # 체크포인트에 완료 기록이 있는 파일은 건너뜀
+    pending = []
+    for path in paths:
+        saved = checkpoint.get(path)
+        if saved and {"size": saved["size"], "mtime": saved["mtime"]} == _file_key(path):
+            results[path] = saved
+        else:
+            pending.append(path)
+    resumed = len(results)
+
+    def finish(result):
+        result.update(_file_key(result["path"]))
+        results[result["path"]] = result
+        if checkpoint_path:
+            checkpoint[result["path"]] = result
+            save_checkpoint(checkpoint_path, checkpoint)
+        if progress_callback:
+            progress_callback(result, len(results), len(paths))
+
+    started = time.perf_counter()
+    if max_workers <= 1 or len(pending) <= 1:
+        for path in pending:
+            finish(hash_file(path))
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            futures = [pool.submit(hash_file, path) for path in pending]
+            for future in as_completed(futures):
+                finish(future.result())
+    seconds = time.perf_counter() - started
+
+    hashed_bytes = sum(results[path]["size"] for path in pending)
+    return {
+        "results": results,
+        "bytes": hashed_bytes,
+        "seconds": seconds,
+        "throughput": hashed_bytes / 1024 / 1024 / seconds if seconds > 0 else 0.0,
+        "resumed": resumed
+    }
+
+def verify_hash(recorded, result):
+    """
+    수기/수집 도구로 기록된 hash_value와 계산값 비교
+
+    Returns:
+        str: "일치", "불일치" 또는 "계산됨"(비교할 기록이 없음)
+    """
+    recorded_hashes = {}
+    for token in (recorded or "").replace(":", " ").split():
+        token = token.strip().lower()
+        if len(token) in _HEX_LENGTHS and all(c in "0123456789abcdef" for c in token):
+            recorded_hashes[_HEX_LENGTHS[len(token)]] = token
+
+    if not recorded_hashes:
+        return "계산됨"
+    if all(result[name] == value for name, value in recorded_hashes.items()):
+        return "일치"
+    return "불일치"
+
+def hash_device_images(device_paths, max_workers=DEFAULT_WORKERS, checkpoint_path=None, progress_callback=None):
+    """
+    장비별 이미지 파일 해시를 계산해 digital_devices에 저장
+
+    기존 hash_value가 비어 있으면 SHA-256을 hash_value로 채우고,
+    값이 있으면 계산값과 비교한 검증 상태만 기록합니다.
+
+    Args:
+        device_paths: {device_id: 이미지 파일 경로}
+
+    Returns:
+        dict: hash_files 결과에 devices(device_id → 검증 상태) 추가
+    """
+    summary = hash_files(list(device_paths.values()), max_workers, checkpoint_path, progress_callback)
+    summary["devices"] = save_device_hashes({
+        device_id: summary["results"][os.path.abspath(path)] for device_id, path in device_paths.items()
+    })
+    return summary
+
+def save_device_hashes(device_results):
+    """
+    장비별 해시 계산 결과를 기록된 hash_value와 비교해 digital_devices에 저장
+
+    Args:
+        device_results: {device_id: hash_file 결과}
+
+    Returns:
+        dict: device_id → 검증 상태
+    """
+    # 작업 프로세스가 DB 초기화를 반복하지 않도록 결과 저장 시점에만 import
+    import db
+
+    recorded = {
+        device_id: value for device_id, value in db.get_device_hash_values(list(device_results)).items()
+        if isinstance(value, str) and value.strip()
+    }
+    verified_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    statuses = {}
+    for device_id, result in device_results.items():
+        status = verify_hash(recorded.get(device_id), result)
+        db.update_digital_device(
+            device_id,
+            hash_md5=result["md5"],
+            hash_sha1=result["sha1"],
+            hash_sha256=result["sha256"],
+            hash_status=status,
+            hash_verified_at=verified_at,
+            hash_value=None if recorded.get(device_id) else result["sha256"]
+        )
+        statuses[device_id] = status
+    return statuses
+
+def _run_device_hash(device_id, path):
+    job = _background_jobs[device_id]
+
+    def progress(done):
+        job["done"] = done
+
+    try:
+        result = hash_file(path, progress_callback=progress)
+        job["result"] = save_device_hashes({device_id: result})[device_id]
+        job["throughput"] = result["size"] / 1024 / 1024 / result["seconds"] if result["seconds"] > 0 else 0.0
+        job["status"] = "완료"
+    except Exception as e:
+        job["message"] = str(e)
+        job["status"] = "실패"
+    job["finished_at"] = time.time()
+
+def start_device_hash(device_id, path):
+    """
+    장비 이미지 해시 계산을 백그라운드 스레드에서 시작
+
+    Returns:
+        bool: 시작했으면 True, 같은 장비의 계산이 이미 실행 중이면 False
+    """
+    global _background_pool
+    with _background_lock:
+        job = _background_jobs.get(device_id)
+        if job and job["status"] == "실행 중":
+            return False
+        _background_jobs[device_id] = {
+            "path": path, "status": "실행 중", "done": 0, "total": os.path.getsize(path),
+            "started_at": time.time(), "finished_at": None, "result": None, "throughput": None, "message": None
+        }
+        if _background_pool is None:
+            _background_pool = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="evidence-hash")
+    _background_pool.submit(_run_device_hash, device_id, path)
+    return True
+
+def get_device_hash_job(device_id):
+    """장비의 백그라운드 해시 계산 상태 (status, done, total, result, throughput, message) 또는 None"""
+    with _background_lock:
+        job = _background_jobs.get(device_id)
+        return dict(job) if job else None
+
+def main():
+    """명령행 실행: 장비 ID와 이미지 경로를 받아 해시 계산 후 DB에 저장"""
+    parser = argparse.ArgumentParser(description="증거 이미지 해시 계산 (MD5/SHA-1/SHA-256)")
+    parser.add_argument("--device", nargs=2, action="append", metavar=("DEVICE_ID", "PATH"), required=True,
+                        help="장비 ID와 이미지 파일 경로 (여러 번 지정 가능)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 계산할 파일 수")
+    parser.add_argument("--checkpoint", default="hash_checkpoint.json", help="체크포인트 파일 경로")
+    args = parser.parse_args()
+
+    def report(result, done, total):
+        rate = result["size"] / 1024 / 1024 / result["seconds"] if result["seconds"] > 0 else 0.0
+        print(f"[{done}/{total}] {result['path']} ({result['size']:,} B, {rate:.1f} MB/s)")
+
+    device_paths = {int(device_id): path for device_id, path in args.device}
+    summary = hash_device_images(device_paths, args.workers, args.checkpoint, report)
+
+    for device_id, status in summary["devices"].items():
+        print(f"장비 {device_id}: {status}")
+    print(f"총 {summary['bytes']:,} B, {summary['seconds']:.1f}초, {summary['throughput']:.1f} MB/s "
+          f"(체크포인트로 건너뛴 파일 {summary['resumed']}개)")
+
+if __name__ == "__main__":
+    main()
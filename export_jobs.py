@@ -0,0 +1,196 @@
+"""
+백그라운드 내보내기 작업 큐
+
+대용량 Excel/ZIP 내보내기를 Streamlit 스크립트 스레드 대신 작업 스레드 풀에서 실행합니다.
+작업 상태와 진행률은 db의 export_jobs 테이블(JOBS_DB_PATH)에 기록하므로, 화면은 작업을 등록한 뒤
+진행률만 조회하고 완료된 파일은 나중에 내려받을 수 있습니다.
+동시에 실행하는 작업 수와 대기 작업 수에 상한을 두고, 보관 기간이 지난 파일은 정리합니다.
+"""
+import time
+import shutil
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import db
+import utils
+import metrics
+
+EXPORT_DIR = Path("exports")
+
+# 동시에 실행할 작업 수 (나머지는 대기)
+MAX_CONCURRENT_JOBS = 2
+
+# 대기/실행 중 작업이 이 수 이상이면 새 작업을 받지 않음
+MAX_ACTIVE_JOBS = 20
+
+# 완료 파일 보관 시간
+ARTIFACT_TTL_HOURS = 24
+
+# 진행률을 DB에 기록하는 최소 간격(초)
+PROGRESS_WRITE_INTERVAL = 1.0
+
+_job_pool = None
+_job_pool_lock = threading.Lock()
+
+# 지표 조회 시점의 대기/실행 중 작업 수
+metrics.gauge("worklog_export_queue_depth", "대기 또는 실행 중인 내보내기 작업 수", db.count_active_export_jobs)
+
+def _excel_file(work_dir, file_prefix, df):
+    """DataFrame을 Excel 파일로 저장하고 경로 반환"""
+    path = work_dir / f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    path.write_bytes(utils.create_excel_report(df))
+    return path
+
+def _export_work_categories(params, work_dir, progress):
+    df = db.get_work_categories(params.get("filters") or None, use_replica=True)
+    progress(0.5, f"{len(df):,}행 Excel 작성 중")
+    return _excel_file(work_dir, "work_report", df)
+
+def _export_case_tasks(params, work_dir, progress):
+    df = db.get_case_tasks(case_id=params.get("case_id"), filter_dict=params.get("filters") or None, use_replica=True)
+    progress(0.5, f"{len(df):,}행 Excel 작성 중")
+    return _excel_file(work_dir, "case_tasks_report", df)
+
+def _export_daily_rollup(params, work_dir, progress):
+    records = db.iter_daily_works(params["start"], params["end"], order_by=params.get("group_by", "name"))
+    _, data, rows = utils.create_daily_rollup(records, params.get("group_by", "name"))
+    progress(0.9, f"{rows:,}행 취합 완료")
+    path = work_dir / f"daily_rollup_{params['start']}_{params['end']}.xlsx"
+    path.write_bytes(data)
+    return path
+
+def _export_timesheet(params, work_dir, progress):
+    hours_df = db.get_hours_by_writer_date(
+        params["start"], params["end"], include_archive=db.archive_covers_period(params["start"])
+    )
+    matrix, targets = utils.build_timesheet(
+        hours_df, params["start"], params["end"],
+        freq=params.get("freq", "W"), weekly_target=params.get("weekly_target", 40)
+    )
+    progress(0.5, "Excel 작성 중")
+    path = work_dir / f"timesheet_{params['start']}_{params['end']}.xlsx"
+    path.write_bytes(utils.create_timesheet_excel(matrix, targets))
+    return path
+
+def _export_dossiers(params, work_dir, progress):
+    import dossier
+
+    case_ids = params["case_ids"]
+    results, errors = dossier.export_dossiers(
+        case_ids, output_dir=str(work_dir), include_archive=params.get("include_archive", False),
+        progress_callback=lambda case_id, done, total: progress(done / total * 0.95, f"사건 {done}/{total}")
+    )
+    if errors and not results:
+        raise RuntimeError("; ".join(f"사건 {case_id}: {error}" for case_id, error in errors))
+
+    paths = [results[case_id][0] for case_id in case_ids if case_id in results]
+    if len(paths) == 1:
+        return Path(paths[0])
+    bundle_path = work_dir / f"case_dossiers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Path(dossier.bundle_dossiers(paths, bundle_path))
+
+# 작업 종류 → (화면 표시 이름, 실행 함수)
+# 실행 함수는 (params, 작업 폴더, progress(비율, 메시지))를 받아 생성한 파일 경로를 반환
+EXPORT_KINDS = {
+    "work_categories": ("업무 기록 Excel", _export_work_categories),
+    "case_tasks": ("사건 세부 작업 Excel", _export_case_tasks),
+    "daily_rollup": ("일일 업무 기간 취합 Excel", _export_daily_rollup),
+    "timesheet": ("근무시간 Excel", _export_timesheet),
+    "dossiers": ("사건 자료 묶음 ZIP", _export_dossiers)
+}
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _get_job_pool():
+    global _job_pool
+    with _job_pool_lock:
+        if _job_pool is None:
+            _job_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="export-job")
+        return _job_pool
+
+def job_dir(job_id):
+    """작업별 파일 폴더"""
+    return EXPORT_DIR / f"job_{job_id}"
+
+def _run_job(job_id, kind, params):
+    """작업 하나 실행 (작업 스레드)"""
+    db.update_export_job(job_id, status="실행 중", started_at=_now(), message=None)
+    started = time.perf_counter()
+    last_write = [0.0]
+
+    def progress(ratio, message=None):
+        # 진행률은 일정 간격으로만 기록해 DB 쓰기를 줄임
+        now = time.monotonic()
+        if now - last_write[0] >= PROGRESS_WRITE_INTERVAL:
+            last_write[0] = now
+            db.update_export_job(job_id, progress=min(max(ratio, 0.0), 1.0), message=message)
+
+    work_dir = job_dir(job_id)
+    try:
+        work_dir.mkdir(parents=True, exist_ok=True)
+        path = EXPORT_KINDS[kind][1](params, work_dir, progress)
+        finished_at = datetime.now()
+        db.update_export_job(
+            job_id, status="완료", progress=1.0, message=None,
+            artifact_path=str(path), file_name=path.name,
+            finished_at=finished_at.strftime("%Y-%m-%d %H:%M:%S"),
+            expires_at=(finished_at + timedelta(hours=ARTIFACT_TTL_HOURS)).strftime("%Y-%m-%d %H:%M:%S")
+        )
+        metrics.EXPORT_JOB_SECONDS.observe(time.perf_counter() - started, kind=kind, status="완료")
+    except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        db.update_export_job(job_id, status="실패", message=str(e), finished_at=_now())
+        metrics.EXPORT_JOB_SECONDS.observe(time.perf_counter() - started, kind=kind, status="실패")
+
+def submit_job(kind, params):
+    """
+    내보내기 작업 등록 후 작업 스레드 풀에 추가
+
+    Args:
+        kind: EXPORT_KINDS 키
+        params: 작업 인자 (JSON으로 저장 가능한 dict)
+
+    Returns:
+        int: 작업 ID
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"알 수 없는 내보내기 작업입니다: {kind}")
+    if db.count_active_export_jobs() >= MAX_ACTIVE_JOBS:
+        raise ValueError(f"대기 중인 작업이 {MAX_ACTIVE_JOBS}개 이상입니다. 잠시 후 다시 시도하세요.")
+
+    cleanup_expired_jobs()
+    job_id = db.add_export_job(kind, EXPORT_KINDS[kind][0], params)
+    _get_job_pool().submit(_run_job, job_id, kind, params)
+    return job_id
+
+def read_artifact(job_id):
+    """완료된 작업의 파일 내용 (파일이 없으면 None)"""
+    job = db.get_export_job(job_id)
+    if not job or job["status"] != "완료" or not job["artifact_path"]:
+        return None
+    path = Path(job["artifact_path"])
+    return path.read_bytes() if path.exists() else None
+
+def cleanup_expired_jobs():
+    """
+    보관 기간이 지난 작업 파일 삭제 후 '만료'로 표시
+
+    Returns:
+        int: 정리한 작업 수
+    """
+    expired = db.get_expired_export_jobs(_now())
+    for job_id, _ in expired:
+        shutil.rmtree(job_dir(job_id), ignore_errors=True)
+        db.update_export_job(job_id, status="만료", artifact_path=None)
+    return len(expired)
+
+def recover_interrupted_jobs():
+    """서버 시작 시 이전 프로세스에서 끝나지 못한 작업을 실패로 표시하고 남은 폴더 정리"""
+    job_ids = db.fail_interrupted_export_jobs("서버가 다시 시작되어 작업이 중단되었습니다.")
+    for job_id in job_ids:
+        shutil.rmtree(job_dir(job_id), ignore_errors=True)
+    cleanup_expired_jobs()
+    return len(job_ids)
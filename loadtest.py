@@ -0,0 +1,320 @@
+"""
+화면 단위 부하 테스트
+
+Streamlit AppTest로 여러 직원이 동시에 앱을 쓰는 상황을 흉내 냅니다.
+가상 사용자마다 별도 프로세스에서 AppTest 세션을 하나씩 열고, 모든 메뉴 화면 전환과
+입력 폼 저장(일일 업무, 사건, 업무 기록)을 반복하면서 스크립트 실행 시간과 DB 잠금 오류를 기록합니다.
+사용자 수를 단계별로 늘려 가며 p50/p95/p99가 기준을 넘거나 잠금 오류가 생기는 지점을 찾습니다.
+
+- 모든 단계는 benchmark.py의 합성 데이터로 만든 같은 DB 사본에서 시작합니다.
+- AppTest는 한 프로세스에서 여러 스레드로 동시에 실행할 수 없어 사용자마다 프로세스를 나눕니다.
+  따라서 st.cache_data 캐시와 읽기 복제본이 사용자별로 따로 만들어지며, 실제 서버(한 프로세스)보다
+  다소 보수적인(느린) 결과가 나옵니다.
+
+사용 예:
+    python loadtest.py --users 1 2 4 8 --iterations 3 --scale medium -o loadtest.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import traceback
+import multiprocessing
+from queue import Empty
+from datetime import datetime
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+DEFAULT_USERS = [1, 2, 4, 8]
+DEFAULT_ITERATIONS = 3
+
+# 화면 한 번 실행의 제한 시간(초) - 넘으면 오류로 기록
+RUN_TIMEOUT = 60
+
+# 세션 준비(앱 첫 실행)를 모든 사용자가 마칠 때까지 기다리는 시간(초)과 결과 대기 중 프로세스 확인 간격(초)
+SESSION_START_TIMEOUT = 300
+RESULT_POLL_SECONDS = 5
+
+# 이 p95(초)를 넘거나 잠금 오류가 생기면 해당 사용자 수에서 성능이 떨어진 것으로 판단
+DEFAULT_P95_LIMIT = 2.0
+
+# 입력 폼 저장 동작: 폼 이름 → (메뉴, 입력할 위젯 {(위젯 종류, 라벨): 값 형식})
+FORM_ACTIONS = {
+    "daily_work_form": ("📥 일일 업무 입력", {
+        ("text_area", "업무 내용"): "A. 매출 관련 업무\n\nB. 내부업무\n- 부하 테스트 {user}-{step}\n\nC. 사건처리\n"
+    }),
+    "case_input_form": ("🗂️ 사건 입력", {
+        ("text_input", "사건명 *"): "부하 테스트 사건 {user}-{step}",
+        ("text_input", "담당자 *"): "부하테스트{user}"
+    }),
+    "work_category_form": ("📊 업무 기록", {
+        ("text_area", "업무 내용"): "부하 테스트 업무 {user}-{step}"
+    })
+}
+
+LOCK_ERROR_MESSAGES = ("database is locked", "database table is locked")
+
+def _is_lock_error(message):
+    return any(text in message for text in LOCK_ERROR_MESSAGES)
+
+def _run_step(at, action, run):
+    """
+    AppTest 실행 한 번의 소요 시간과 오류 기록
+
+    Returns:
+        dict: action, seconds, error(없으면 None), lock_error, started_at/ended_at(처리량 계산용 시각)
+    """
+    started_at = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        run()
+        if at.exception:
+            error = at.exception[0].value
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "action": action,
+        "seconds": time.perf_counter() - started,
+        "error": error,
+        "lock_error": bool(error and _is_lock_error(error)),
+        "started_at": started_at,
+        "ended_at": time.time()
+    }
+
+def _submit_form(at, form_name, user, step):
+    """폼 입력 위젯을 채우고 저장 버튼 클릭"""
+    for (widget_type, label), value in FORM_ACTIONS[form_name][1].items():
+        widget = next(w for w in getattr(at, widget_type) if w.label == label)
+        widget.input(value.format(user=user, step=step))
+    at.button(key=f"FormSubmitter:{form_name}-저장").click().run(timeout=RUN_TIMEOUT)
+    # 비슷한 사건 확인 단계가 나오면 그대로 저장 (부하 테스트는 매번 저장까지 측정)
+    confirm_key = f"FormSubmitter:{form_name}-그래도 저장"
+    if any(button.key == confirm_key for button in at.button):
+        at.button(key=confirm_key).click().run(timeout=RUN_TIMEOUT)
+
+def run_session(user, work_dir, iterations, seed, think_time, replica, barrier, queue):
+    """
+    가상 사용자 한 명의 세션 (작업 프로세스)
+
+    첫 실행(앱 import, DB 초기화)은 준비 단계로 보고 기록하지 않으며,
+    모든 사용자가 준비되면 동시에 측정을 시작합니다.
+    """
+    records = []
+    try:
+        # 설정 파일, 첨부/내보내기 폴더가 작업 폴더에 생기도록 이동 후 db import
+        os.chdir(work_dir)
+        os.environ["WORKLOG_DB_PATH"] = os.path.join(work_dir, "worklog.db")
+        os.environ["WORKLOG_ARCHIVE_DB_PATH"] = os.path.join(work_dir, "worklog_archive.db")
+        os.environ["WORKLOG_JOBS_DB_PATH"] = os.path.join(work_dir, "worklog_jobs.db")
+        import db
+        from streamlit.testing.v1 import AppTest
+
+        db.READ_REPLICA_ENABLED = replica
+        rng = random.Random(seed + user)
+        at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        at.run()
+        menus = list(at.sidebar.radio[0].options)
+        form_menus = {menu: form_name for form_name, (menu, _) in FORM_ACTIONS.items()}
+    except Exception:
+        barrier.abort()
+        queue.put((user, records, traceback.format_exc()))
+        return
+
+    try:
+        barrier.wait()
+        step = 0
+        for _ in range(iterations):
+            for menu in rng.sample(menus, len(menus)):
+                step += 1
+                radio = at.sidebar.radio[0]
+                records.append(_run_step(at, f"page:{menu}", lambda: radio.set_value(menu).run(timeout=RUN_TIMEOUT)))
+                if menu in form_menus:
+                    form_name = form_menus[menu]
+                    records.append(_run_step(at, f"submit:{form_name}",
+                                             lambda: _submit_form(at, form_name, user, step)))
+                if think_time:
+                    time.sleep(rng.uniform(0, think_time))
+        queue.put((user, records, None))
+    except Exception:
+        queue.put((user, records, traceback.format_exc()))
+
+def prepare_database(template_dir, scale, seed):
+    """합성 데이터 DB를 한 번 만들어 두고 단계마다 복사해서 사용"""
+    os.environ["WORKLOG_DB_PATH"] = os.path.join(template_dir, "worklog.db")
+    os.environ["WORKLOG_ARCHIVE_DB_PATH"] = os.path.join(template_dir, "worklog_archive.db")
+    os.environ["WORKLOG_JOBS_DB_PATH"] = os.path.join(template_dir, "worklog_jobs.db")
+    import db
+    import benchmark
+
+    return benchmark.build_database(db, os.environ["WORKLOG_DB_PATH"], scale, seed)
+
+def summarize(records, elapsed):
+    """
+    실행 기록 집계 (전체 및 동작별)
+
+    Returns:
+        dict: runs, errors, lock_errors, throughput(초당 실행 수), p50/p95/p99/max(초), actions
+    """
+    def stats(items):
+        seconds = np.array([item["seconds"] for item in items]) if items else np.zeros(1)
+        return {
+            "runs": len(items),
+            "errors": sum(1 for item in items if item["error"]),
+            "lock_errors": sum(1 for item in items if item["lock_error"]),
+            "p50": round(float(np.percentile(seconds, 50)), 4),
+            "p95": round(float(np.percentile(seconds, 95)), 4),
+            "p99": round(float(np.percentile(seconds, 99)), 4),
+            "max": round(float(seconds.max()), 4)
+        }
+
+    summary = stats(records)
+    summary["throughput"] = round(len(records) / elapsed, 2) if elapsed > 0 else 0.0
+    summary["actions"] = {
+        action: stats([record for record in records if record["action"] == action])
+        for action in sorted({record["action"] for record in records})
+    }
+    return summary
+
+def run_level(users, template_dir, base_dir, iterations, seed, think_time, replica):
+    """
+    사용자 수 한 단계 실행 (DB 사본에서 시작)
+
+    Returns:
+        dict: 집계 결과에 users, elapsed, failures(세션 오류), error_samples 추가
+    """
+    work_dir = os.path.join(base_dir, f"users_{users}")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    shutil.copytree(template_dir, work_dir)
+
+    # 부모 프로세스에서 import한 db 모듈 상태가 섞이지 않도록 새 인터프리터(spawn)로 실행
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(users, timeout=SESSION_START_TIMEOUT)
+    queue = context.Queue()
+    processes = [
+        context.Process(target=run_session,
+                        args=(user, work_dir, iterations, seed, think_time, replica, barrier, queue))
+        for user in range(users)
+    ]
+    for process in processes:
+        process.start()
+
+    records, failures = [], []
+    pending = dict(enumerate(processes))
+    exited = set()
+    while pending:
+        try:
+            user, user_records, failure = queue.get(timeout=RESULT_POLL_SECONDS)
+        except Empty:
+            # 결과를 보내지 못하고 끝난 프로세스(강제 종료, 메모리 부족 등)는 세션 오류로 기록
+            # (종료 직전에 보낸 결과가 아직 도착하지 않았을 수 있어 두 번 연속 확인된 경우만)
+            for user, process in list(pending.items()):
+                if process.exitcode is None:
+                    continue
+                if user in exited:
+                    failures.append({"user": user, "traceback": f"결과 없이 종료되었습니다 (exitcode {process.exitcode})"})
+                    del pending[user]
+                exited.add(user)
+            continue
+        pending.pop(user, None)
+        records.extend(user_records)
+        if failure:
+            failures.append({"user": user, "traceback": failure})
+    for process in processes:
+        process.join()
+
+    # 준비 단계를 뺀 측정 구간 (첫 동작 시작 ~ 마지막 동작 종료)
+    elapsed = max(r["ended_at"] for r in records) - min(r["started_at"] for r in records) if records else 0.0
+
+    summary = summarize(records, elapsed)
+    summary.update(
+        users=users,
+        elapsed=round(elapsed, 2),
+        failures=failures,
+        error_samples=sorted({record["error"] for record in records if record["error"]})[:10]
+    )
+    return summary
+
+def find_degradation(levels, p95_limit=DEFAULT_P95_LIMIT):
+    """p95가 기준을 넘거나 잠금 오류/세션 오류가 처음 생긴 사용자 수 (없으면 None)"""
+    for level in levels:
+        if level["p95"] > p95_limit or level["lock_errors"] or level["failures"]:
+            return level["users"]
+    return None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AppTest 기반 동시 사용자 부하 테스트")
+    parser.add_argument("--users", type=int, nargs="+", default=DEFAULT_USERS, help="단계별 동시 사용자 수")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="사용자별 전체 메뉴 순회 횟수")
+    parser.add_argument("--scale", default="small", help="합성 데이터 규모 (benchmark.SCALES)")
+    parser.add_argument("--seed", type=int, default=20240501)
+    parser.add_argument("--think-time", type=float, default=0.0, help="동작 사이 최대 대기 시간(초)")
+    parser.add_argument("--no-replica", action="store_true", help="읽기 복제본 없이 운영 DB에서 조회")
+    parser.add_argument("--p95-limit", type=float, default=DEFAULT_P95_LIMIT, help="성능 저하로 볼 p95(초)")
+    parser.add_argument("--work-dir", help="DB 사본을 남겨 둘 폴더 (기본값: 임시 폴더)")
+    parser.add_argument("-o", "--output", default="loadtest_report.json", help="JSON 보고서 저장 경로")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    temp_dir = None
+    base_dir = args.work_dir
+    if base_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="worklog_loadtest_")
+        base_dir = temp_dir.name
+    base_dir = os.path.abspath(base_dir)
+    template_dir = os.path.join(base_dir, "template")
+    os.makedirs(template_dir, exist_ok=True)
+
+    try:
+        counts = prepare_database(template_dir, args.scale, args.seed)
+        print(f"합성 데이터 ({args.scale}): " + ", ".join(f"{table} {count:,}행" for table, count in counts.items()))
+
+        levels = []
+        for users in args.users:
+            level = run_level(users, template_dir, base_dir, args.iterations, args.seed,
+                              args.think_time, not args.no_replica)
+            levels.append(level)
+            print(f"사용자 {users:>3}명: {level['runs']:,}회 실행, p50 {level['p50']:.2f}s, p95 {level['p95']:.2f}s, "
+                  f"p99 {level['p99']:.2f}s, 잠금 오류 {level['lock_errors']}, 기타 오류 "
+                  f"{level['errors'] - level['lock_errors']}, 세션 실패 {len(level['failures'])}")
+            slowest = sorted(level["actions"].items(), key=lambda item: item[1]["p95"], reverse=True)[:3]
+            print("    느린 동작: " + ", ".join(f"{action} p95 {stats['p95']:.2f}s" for action, stats in slowest))
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    degraded_at = find_degradation(levels, args.p95_limit)
+    report = {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "scale": args.scale,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "think_time": args.think_time,
+            "replica": not args.no_replica,
+            "p95_limit": args.p95_limit,
+            "cpu_count": os.cpu_count()
+        },
+        "rows": counts,
+        "levels": levels,
+        "degraded_at": degraded_at
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if degraded_at is None:
+        print(f"측정한 모든 단계에서 p95 {args.p95_limit}초 이내, 잠금 오류 없음")
+    else:
+        print(f"사용자 {degraded_at}명부터 성능 저하 (p95 > {args.p95_limit}초 또는 오류 발생)")
+    print(f"보고서 저장: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+화면/DB/내보내기 지표 수집
+
+카운터와 히스토그램을 프로세스 메모리에 모아 두고, 로컬 HTTP 엔드포인트(Prometheus 텍스트 형식)와
+주기적인 JSON 스냅샷 파일로 내보냅니다. WORKLOG_METRICS=1일 때만 기록하며, 꺼져 있으면
+기록 함수는 플래그만 확인하고 바로 반환합니다.
+
+    WORKLOG_METRICS=1 streamlit run app.py
+    curl http://127.0.0.1:9464/metrics         # Prometheus 텍스트 형식
+    curl http://127.0.0.1:9464/metrics.json    # 같은 내용의 JSON
+"""
+import os
+import json
+import time
+import bisect
+import functools
+import logging
+import logging.handlers
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.environ.get("WORKLOG_METRICS") == "1"
+METRICS_HOST = os.environ.get("WORKLOG_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("WORKLOG_METRICS_PORT", 9464))
+
+# JSON 스냅샷 (한 줄에 하나씩 추가, 크기가 넘으면 파일 교체)
+SNAPSHOT_PATH = os.environ.get("WORKLOG_METRICS_SNAPSHOT", "worklog_metrics.jsonl")
+SNAPSHOT_INTERVAL = 60
+SNAPSHOT_FILE_BYTES = 5 * 1024 * 1024
+SNAPSHOT_BACKUPS = 3
+
+# 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+_server = None
+_snapshot_thread = None
+_service_lock = threading.Lock()
+
+def _label_key(label_names, labels):
+    return tuple(str(labels.get(name, "")) for name in label_names)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(label_names, key, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, key)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = _label_key(self.label_names, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, None, value) for key, value in sorted(self._values.items())]
+
+    def to_dict(self):
+        with self._lock:
+            return [dict(zip(self.label_names, key), value=value) for key, value in sorted(self._values.items())]
+
+class Histogram:
+    """구간별 관측 횟수와 합계를 기록하는 히스토그램"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = _label_key(self.label_names, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간(초)을 관측값으로 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+                    cumulative += count
+                    result.append((f"{self.name}_bucket", key, ("le", _format_number(bound)), cumulative))
+                result.append((f"{self.name}_sum", key, None, state["sum"]))
+                result.append((f"{self.name}_count", key, None, state["count"]))
+        return result
+
+    def to_dict(self):
+        with self._lock:
+            return [
+                dict(zip(self.label_names, key), count=state["count"], sum=round(state["sum"], 6),
+                     buckets=dict(zip([str(b) for b in self.buckets] + ["+Inf"], state["counts"])))
+                for key, state in sorted(self._values.items())
+            ]
+
+class Gauge:
+    """조회 시점에 함수를 호출해 현재 값을 읽는 게이지 (예: 대기 중인 작업 수)"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.label_names = ()
+        self.read = read
+
+    def _value(self):
+        try:
+            return self.read()
+        except Exception:
+            return None
+
+    def samples(self):
+        value = self._value()
+        return [] if value is None else [(self.name, (), None, value)]
+
+    def to_dict(self):
+        return self._value()
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None and not isinstance(metric, Gauge):
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+def counter(name, help_text, label_names=()):
+    """카운터 등록 (같은 이름이 있으면 기존 카운터 반환)"""
+    return _register(Counter(name, help_text, label_names))
+
+def histogram(name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+    """히스토그램 등록 (같은 이름이 있으면 기존 히스토그램 반환)"""
+    return _register(Histogram(name, help_text, label_names, buckets))
+
+def gauge(name, help_text, read):
+    """게이지 등록 (같은 이름이면 읽기 함수를 교체)"""
+    return _register(Gauge(name, help_text, read))
+
+# 앱 공통 지표
+PAGE_RENDER_SECONDS = histogram("worklog_page_render_seconds", "메뉴 화면 한 번 실행 시간(초)", ("page",))
+PAGE_ERRORS = counter("worklog_page_errors_total", "예외로 끝난 화면 실행 수", ("page",))
+DB_QUERY_SECONDS = histogram("worklog_db_query_seconds", "db 함수별 SQL 실행 시간(초)", ("caller",))
+CACHE_REQUESTS = counter("worklog_cache_requests_total", "캐시 조회 수", ("cache",))
+CACHE_MISSES = counter("worklog_cache_misses_total", "캐시에 없어 새로 계산한 수", ("cache",))
+EXPORT_SECONDS = histogram("worklog_export_seconds", "보고서 파일 생성 시간(초)", ("kind",))
+EXPORT_JOB_SECONDS = histogram("worklog_export_job_seconds", "백그라운드 내보내기 작업 시간(초)", ("kind", "status"))
+
+def timed(metric, **labels):
+    """함수 실행 시간을 히스토그램에 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS_ENABLED:
+                return func(*args, **kwargs)
+            with metric.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def page_render(page):
+    """메뉴 화면 실행 시간과 예외 횟수 기록 (st.rerun/st.stop은 예외로 세지 않음)"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PAGE_ERRORS.inc(page=page)
+        raise
+    finally:
+        PAGE_RENDER_SECONDS.observe(time.perf_counter() - started, page=page)
+
+def render_prometheus():
+    """등록된 지표를 Prometheus 텍스트 형식(0.0.4)으로 반환"""
+    with _registry_lock:
+        registered = list(_registry.values())
+    lines = []
+    for metric in registered:
+        samples = metric.samples()
+        if not samples and metric.kind != "gauge":
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, key, extra, value in samples:
+            lines.append(f"{name}{_format_labels(metric.label_names, key, extra)} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
+
+def snapshot():
+    """현재 지표 값 dict (JSON 직렬화 가능)"""
+    with _registry_lock:
+        registered = list(_registry.values())
+    return {
+        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "pid": os.getpid(),
+        "metrics": {metric.name: metric.to_dict() for metric in registered}
+    }
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(snapshot(), ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _snapshot_loop(logger, interval):
+    while True:
+        time.sleep(interval)
+        logger.info(json.dumps(snapshot(), ensure_ascii=False))
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT, snapshot_path=SNAPSHOT_PATH,
+                         snapshot_interval=SNAPSHOT_INTERVAL):
+    """
+    지표 HTTP 엔드포인트와 JSON 스냅샷 스레드 시작 (프로세스당 1회)
+
+    포트를 이미 다른 프로세스가 쓰고 있으면 엔드포인트 없이 스냅샷만 기록합니다.
+
+    Returns:
+        (host, port) 또는 엔드포인트를 열지 못했으면 None
+    """
+    global _server, _snapshot_thread
+    with _service_lock:
+        if _snapshot_thread is None and snapshot_path:
+            logger = logging.getLogger("worklog.metrics")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = logging.handlers.RotatingFileHandler(
+                snapshot_path, maxBytes=SNAPSHOT_FILE_BYTES, backupCount=SNAPSHOT_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _snapshot_thread = threading.Thread(
+                target=_snapshot_loop, args=(logger, snapshot_interval), name="metrics-snapshot", daemon=True
+            )
+            _snapshot_thread.start()
+
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"지표 엔드포인트를 열 수 없습니다 ({host}:{port}): {e}")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server.server_address[:2]
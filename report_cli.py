@@ -0,0 +1,184 @@
+"""
+보고서 일괄 생성 명령행 도구
+
+Streamlit 화면 없이 db/utils의 보고서 함수를 그대로 사용해 기간/사건별 보고서 파일을 만듭니다.
+서로 독립적인 보고서(날짜별, 작성자별, 사건별)는 프로세스 풀에 나눠 동시에 생성합니다.
+
+사용 예:
+    python report_cli.py daily --start 2024-05-01 --end 2024-05-31 -o reports
+    python report_cli.py work --start 2024-05-01 --end 2024-05-31 --by-writer
+    python report_cli.py tasks --all-cases
+    python report_cli.py month-end --month 2024-05 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+def _date_range(start_date, end_date):
+    """시작일~종료일(포함) 날짜 문자열 목록"""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+def _month_range(month):
+    """YYYY-MM → (월 첫날, 월 마지막날)"""
+    first = datetime.strptime(month, "%Y-%m")
+    last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")
+
+def run_job(job, output_dir):
+    """
+    보고서 작업 하나 실행 (프로세스 풀 작업 단위)
+
+    db는 여기서 import하므로 작업 프로세스도 부모가 지정한 WORKLOG_DB_PATH를 사용합니다.
+
+    Returns:
+        (job, 저장한 파일 경로 또는 None(데이터 없음), 행 수)
+    """
+    import db
+    import utils
+
+    kind, params = job
+    if kind in ("daily", "work", "tasks"):
+        if kind == "daily":
+            df = db.get_daily_works(date=params["date"])
+            file_name = f"daily_report_{params['date']}.xlsx"
+        elif kind == "work":
+            df = db.get_records_by_period("work_categories", params["start"], params["end"], writer=params.get("writer"))
+            file_name = f"work_categories_{params.get('writer') or '전체'}_{params['start']}_{params['end']}.xlsx"
+        else:
+            df = db.get_case_tasks(case_id=params["case_id"])
+            file_name = f"case_tasks_case{params['case_id']}.xlsx"
+        rows = len(df)
+        data = utils.create_excel_report(df) if rows else None
+    elif kind == "rollup":
+        records = db.iter_daily_works(params["start"], params["end"], order_by=params["group_by"], use_replica=False)
+        _, data, rows = utils.create_daily_rollup(records, params["group_by"])
+        file_name = f"daily_rollup_{params['start']}_{params['end']}.xlsx"
+    elif kind == "timesheet":
+        hours_df = db.get_hours_by_writer_date(
+            params["start"], params["end"], include_archive=db.archive_covers_period(params["start"]), use_replica=False
+        )
+        matrix, targets = utils.build_timesheet(hours_df, params["start"], params["end"], freq=params["freq"])
+        rows = len(matrix)
+        data = utils.create_timesheet_excel(matrix, targets)
+        file_name = f"timesheet_{params['start']}_{params['end']}.xlsx"
+    else:
+        raise ValueError(f"알 수 없는 보고서 종류입니다: {kind}")
+
+    if not rows:
+        return job, None, 0
+
+    directory = os.path.join(output_dir, kind)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, file_name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return job, path, rows
+
+def build_jobs(args):
+    """명령행 인자로 실행할 보고서 작업 목록 구성"""
+    import db
+
+    if args.command == "month-end":
+        args.start, args.end = _month_range(args.month)
+
+    jobs = []
+    if args.command in ("daily", "month-end"):
+        jobs += [("daily", {"date": date}) for date in _date_range(args.start, args.end)]
+
+    if args.command in ("work", "month-end"):
+        jobs.append(("work", {"start": args.start, "end": args.end}))
+        if args.command == "month-end" or args.by_writer:
+            writers = db.get_records_by_period("work_categories", args.start, args.end)["writer"].dropna().unique()
+            jobs += [("work", {"start": args.start, "end": args.end, "writer": writer}) for writer in sorted(writers)]
+
+    if args.command == "tasks":
+        case_ids = args.case or db.get_cases()["id"].tolist()
+        jobs += [("tasks", {"case_id": int(case_id)}) for case_id in case_ids]
+
+    if args.command == "month-end":
+        jobs.append(("rollup", {"start": args.start, "end": args.end, "group_by": "name"}))
+        jobs.append(("timesheet", {"start": args.start, "end": args.end, "freq": "D"}))
+
+    return jobs
+
+def run_jobs(jobs, output_dir, max_workers=DEFAULT_WORKERS):
+    """
+    보고서 작업을 프로세스 풀에서 실행하고 완료되는 순서대로 결과 출력
+
+    Returns:
+        (생성한 파일 수, 실패한 작업 수)
+    """
+    created = failed = 0
+
+    def report(job, path, rows):
+        nonlocal created
+        if path:
+            created += 1
+            print(f"  ✔ {path} ({rows:,}행)")
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            try:
+                report(*run_job(job, output_dir))
+            except Exception as e:
+                failed += 1
+                print(f"  ✘ {job}: {e}", file=sys.stderr)
+        return created, failed
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(run_job, job, output_dir): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                report(*future.result())
+            except Exception as e:
+                failed += 1
+                print(f"  ✘ {futures[future]}: {e}", file=sys.stderr)
+    return created, failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="업무 기록 보고서 일괄 생성")
+    parser.add_argument("--db", help="DB 파일 경로 (기본값: worklog.db 또는 WORKLOG_DB_PATH)")
+    parser.add_argument("-o", "--output-dir", default="reports", help="보고서 저장 폴더")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 실행할 프로세스 수")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    daily = subparsers.add_parser("daily", help="날짜별 일일 취합 Excel")
+    work = subparsers.add_parser("work", help="기간 업무 기록(work_categories) Excel")
+    for sub in (daily, work):
+        sub.add_argument("--start", required=True, help="시작일 (YYYY-MM-DD)")
+        sub.add_argument("--end", required=True, help="종료일 (YYYY-MM-DD)")
+    work.add_argument("--by-writer", action="store_true", help="작성자별 파일도 함께 생성")
+
+    tasks = subparsers.add_parser("tasks", help="사건별 세부 작업(case_tasks) Excel")
+    group = tasks.add_mutually_exclusive_group(required=True)
+    group.add_argument("--case", type=int, nargs="+", help="사건 ID 목록")
+    group.add_argument("--all-cases", action="store_true", help="전체 사건")
+
+    month_end = subparsers.add_parser("month-end", help="월말 일괄 (일별/작성자별/기간 취합/근무시간)")
+    month_end.add_argument("--month", required=True, help="대상 월 (YYYY-MM)")
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # db import 전에 지정해야 하고, 작업 프로세스에도 환경 변수로 전달됨
+    if args.db:
+        os.environ["WORKLOG_DB_PATH"] = os.path.abspath(args.db)
+
+    started = time.perf_counter()
+    jobs = build_jobs(args)
+    print(f"보고서 작업 {len(jobs)}개 실행 (프로세스 {args.workers}개)")
+    created, failed = run_jobs(jobs, args.output_dir, args.workers)
+    print(f"완료: 파일 {created}개 생성, 실패 {failed}개, {time.perf_counter() - started:.1f}초")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
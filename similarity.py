@@ -0,0 +1,84 @@
+"""
+사건 유사도 색인 (MinHash + LSH)
+
+사건명/의뢰인/설명을 글자 n-gram 집합으로 만들고 MinHash 서명으로 요약합니다.
+서명을 밴드로 나눈 LSH 버킷이 하나라도 겹치는 사건만 후보로 삼으므로,
+새 사건을 전체 사건과 일일이 비교하지 않고도 중복 의심 사건을 찾을 수 있습니다.
+"""
+import re
+import zlib
+import hashlib
+import numpy as np
+
+# 글자 n-gram 크기
+SHINGLE_SIZE = 3
+
+# MinHash 해시 함수 개수 = 밴드 수 × 밴드당 행 수
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+
+# 중복 의심으로 볼 추정 Jaccard 유사도 기준
+DEFAULT_THRESHOLD = 0.5
+
+# 해시 함수 h(x) = ((a * x + b) mod p) & 0xFFFFFFFF 의 계수
+# (a * x는 uint64 범위에서 순환하도록 두어 값이 고르게 섞이게 함,
+#  서명이 저장되므로 시드를 바꾸면 색인을 재구성해야 함)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(20240501)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+def normalize_text(*parts):
+    """비교용 텍스트 정규화 (소문자, 공백/기호 제거)"""
+    text = " ".join(str(part) for part in parts if part)
+    return re.sub(r"[\W_]+", "", text.lower())
+
+def shingles(text, size=SHINGLE_SIZE):
+    """글자 n-gram 집합 (텍스트가 n보다 짧으면 텍스트 전체를 하나로 사용)"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def case_signature(title, client=None, description=None):
+    """
+    사건 정보의 MinHash 서명 계산
+
+    Returns:
+        np.ndarray: NUM_PERM개의 uint64 값 (비교할 글자가 없으면 None)
+    """
+    grams = shingles(normalize_text(title, client, description))
+    if not grams:
+        # 모두 최대값인 서명은 기호만 있는 다른 사건과 유사도 1.0이 되므로 색인/비교하지 않음
+        return None
+
+    # n-gram 해시 × 해시 함수 행렬을 한 번에 계산한 뒤 함수별 최소값
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    values = ((np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return values.min(axis=0)
+
+def band_buckets(signature):
+    """서명을 밴드별로 나눈 LSH 버킷 키 목록 [(band, bucket), ...]"""
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+    return buckets
+
+def is_empty_signature(signature):
+    """내용 없는 사건으로 저장된 예전 서명(모두 최대값)인지 여부"""
+    return bool(np.all(signature == _MAX_HASH))
+
+def estimate_similarity(signature, other):
+    """두 서명의 추정 Jaccard 유사도 (같은 위치 값이 일치하는 비율)"""
+    return float(np.mean(signature == other))
+
+def signature_to_blob(signature):
+    """서명을 DB 저장용 bytes로 변환"""
+    return signature.astype(np.uint64).tobytes()
+
+def signature_from_blob(blob):
+    """DB에 저장된 bytes를 서명으로 변환"""
+    return np.frombuffer(blob, dtype=np.uint64)
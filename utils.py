@@ -1,12 +1,14 @@
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
-import plotly.express as px
-import plotly.figure_factory as ff
-from fpdf import FPDF
-import xlsxwriter
 import io
+import metrics
 
+# plotly/fpdf/xlsxwriter는 import 비용이 커서 사용하는 함수 안에서 import
+# (일일 업무 입력처럼 차트·파일 생성이 없는 화면의 첫 실행이 느려지지 않도록)
+
+@metrics.timed(metrics.EXPORT_SECONDS, kind="excel")
 def create_excel_report(df, filename=None):
     """검색 결과를 Excel 파일로 출력"""
     if filename is None:
@@ -53,12 +55,15 @@ def create_excel_report(df, filename=None):
     
     return output.getvalue()
 
+@metrics.timed(metrics.EXPORT_SECONDS, kind="pdf")
 def create_pdf_report(df, filename=None):
     """검색 결과를 PDF 파일로 출력"""
     if filename is None:
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"worklog_report_{now}.pdf"
     
+    from fpdf import FPDF
+    
     # PDF 생성
     pdf = FPDF()
     pdf.add_page()
@@ -148,6 +153,8 @@ def create_gantt_chart(df):
     if not gantt_data:
         return None
     
+    import plotly.figure_factory as ff
+    
     # 간트 차트 생성
     fig = ff.create_gantt(
         gantt_data,
@@ -169,41 +176,39 @@ def create_gantt_chart(df):
     
     return fig
 
-def create_category_chart(df):
-    """카테고리별 통계 차트 생성"""
-    if df.empty:
+def create_category_chart(category_counts):
+    """대분류별 업무 비율 차트 생성 (집계 결과: main_category, count)"""
+    if category_counts.empty:
         return None
     
-    # 카테고리별 카운트
-    category_counts = df['category'].value_counts().reset_index()
-    category_counts.columns = ['카테고리', '건수']
+    import plotly.express as px
     
     # 차트 생성
     fig = px.pie(
         category_counts, 
-        values='건수', 
-        names='카테고리',
-        title='카테고리별 업무 비율'
+        values='count', 
+        names='main_category',
+        title='대분류별 업무 비율',
+        labels={'main_category': '대분류', 'count': '건수'}
     )
     
     return fig
 
-def create_status_chart(df):
-    """상태별 통계 차트 생성"""
-    if df.empty:
+def create_status_chart(status_counts):
+    """상태별 통계 차트 생성 (집계 결과: status, count)"""
+    if status_counts.empty:
         return None
     
-    # 상태별 카운트
-    status_counts = df['status'].value_counts().reset_index()
-    status_counts.columns = ['상태', '건수']
+    import plotly.express as px
     
     # 차트 생성
     fig = px.bar(
         status_counts, 
-        x='상태', 
-        y='건수',
+        x='status', 
+        y='count',
         title='상태별 업무 건수',
-        color='상태',
+        color='status',
+        labels={'status': '상태', 'count': '건수'},
         color_discrete_map={
             '완료': 'green',
             '진행 중': 'blue',
@@ -213,32 +218,285 @@ def create_status_chart(df):
     
     return fig
 
-def create_monthly_chart(df):
-    """월별 업무 건수 차트 생성"""
-    if df.empty:
+def create_monthly_chart(monthly_counts):
+    """월별 업무 건수 차트 생성 (집계 결과: month(YYYY-MM), count)"""
+    if monthly_counts.empty:
         return None
     
-    # 날짜 형식 변환
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # 월별 집계
-    monthly_counts = df.groupby(df['date'].dt.strftime('%Y-%m')).size().reset_index()
-    monthly_counts.columns = ['월', '건수']
+    # 시간순 정렬 (원본 DataFrame은 변경하지 않음)
+    monthly_counts = monthly_counts.sort_values('month')
     
-    # 시간순 정렬
-    monthly_counts = monthly_counts.sort_values('월')
+    import plotly.express as px
     
     # 차트 생성
     fig = px.line(
         monthly_counts, 
-        x='월', 
-        y='건수',
+        x='month', 
+        y='count',
         title='월별 업무 건수 추이',
+        labels={'month': '월', 'count': '건수'},
         markers=True
     )
     
     return fig
 
+def create_writer_hours_chart(writer_hours):
+    """작성자별 소요 시간 차트 생성 (집계 결과: writer, hours)"""
+    if writer_hours.empty:
+        return None
+    
+    import plotly.express as px
+    
+    fig = px.bar(
+        writer_hours,
+        x='writer',
+        y='hours',
+        title='작성자별 소요 시간',
+        labels={'writer': '작성자', 'hours': '소요 시간'}
+    )
+    
+    return fig
+
+def _timesheet_periods(dates, freq):
+    """날짜 배열을 근무시간 집계 기간 라벨(ISO 주 'YYYY-Www' 또는 'YYYY-MM-DD')로 변환"""
+    dates = pd.DatetimeIndex(dates)
+    if freq == "D":
+        return pd.Index(dates.strftime("%Y-%m-%d"))
+    iso = dates.isocalendar()
+    return pd.Index(iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2))
+
+def build_timesheet(hours_df, start_date, end_date, freq="W", staff=None, weekly_target=40):
+    """
+    작성자 × 기간(ISO 주/일) 근무시간 행렬과 기간별 목표 시간 계산
+    
+    반복문 없이 pivot_table 한 번으로 행렬을 만들고, 기록이 없는 기간과 직원은 0으로 채웁니다.
+    목표 시간은 기간에 포함된 평일 수 × (주간 목표 / 5)입니다.
+    
+    Args:
+        hours_df: writer, date, hours 컬럼의 DataFrame
+        freq: "W"(ISO 주) 또는 "D"(일)
+        staff: 기록이 없어도 행으로 표시할 직원 목록
+    
+    Returns:
+        (matrix, targets): 작성자 × 기간 DataFrame, 기간별 목표 시간 Series
+    """
+    all_days = pd.date_range(start_date, end_date, freq="D")
+    periods = _timesheet_periods(all_days, freq)
+    
+    # 기간별 평일 수로 목표 시간 계산
+    targets = pd.Series((all_days.dayofweek < 5).astype(float), index=periods)
+    targets = targets.groupby(level=0, sort=False).sum() * (weekly_target / 5)
+    
+    hours_df = hours_df.dropna(subset=["writer", "date"])
+    matrix = pd.pivot_table(
+        hours_df.assign(period=_timesheet_periods(pd.to_datetime(hours_df["date"], errors="coerce"), freq)),
+        index="writer",
+        columns="period",
+        values="hours",
+        aggfunc="sum",
+        fill_value=0.0
+    )
+    
+    writers = list(staff or []) + sorted(set(matrix.index) - set(staff or []))
+    matrix = matrix.reindex(index=writers, columns=targets.index, fill_value=0.0).astype(float)
+    matrix.index.name = "작성자"
+    matrix.columns.name = None
+    return matrix, targets
+
+def timesheet_flags(matrix, targets):
+    """목표 대비 미달(-1)/초과(1)/정상(0) 표시 행렬 (목표가 0인 기간은 초과만 표시)"""
+    target_values = targets.reindex(matrix.columns).to_numpy()
+    values = matrix.to_numpy()
+    flags = np.where(values > target_values, 1, np.where((values < target_values) & (target_values > 0), -1, 0))
+    return pd.DataFrame(flags, index=matrix.index, columns=matrix.columns)
+
+def format_timesheet(matrix, flags):
+    """근무시간 행렬에 미달(🔻)/초과(🔺) 기호를 붙인 표시용 문자열 행렬"""
+    marks = np.array(["🔻", "", "🔺"])[flags.to_numpy() + 1]
+    text = np.char.mod("%.1f", matrix.to_numpy())
+    return pd.DataFrame(np.char.add(text, marks), index=matrix.index, columns=matrix.columns)
+
+@metrics.timed(metrics.EXPORT_SECONDS, kind="timesheet_excel")
+def create_timesheet_excel(matrix, targets):
+    """근무시간 행렬을 목표 시간 행과 미달/초과 조건부 서식이 포함된 Excel 파일로 출력"""
+    output = io.BytesIO()
+    
+    sheet = pd.concat([targets.to_frame("목표").T, matrix])
+    sheet.index.name = "작성자"
+    
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        sheet.to_excel(writer, sheet_name='근무시간')
+        
+        workbook = writer.book
+        worksheet = writer.sheets['근무시간']
+        worksheet.set_column(0, 0, 12)
+        worksheet.set_column(1, len(sheet.columns), 10)
+        worksheet.freeze_panes(2, 1)
+        
+        # 2행(목표)을 기준으로 직원별 셀에 미달/초과 서식 적용
+        if len(matrix) > 0 and len(matrix.columns) > 0:
+            first_row, last_row = 2, len(matrix) + 1
+            last_col = len(matrix.columns)
+            cell_range = (first_row, 1, last_row, last_col)
+            worksheet.conditional_format(*cell_range, {
+                'type': 'formula',
+                'criteria': '=AND(B$2>0,B3<B$2)',
+                'format': workbook.add_format({'bg_color': '#F8CBAD'})
+            })
+            worksheet.conditional_format(*cell_range, {
+                'type': 'formula',
+                'criteria': '=B3>B$2',
+                'format': workbook.add_format({'bg_color': '#BDD7EE'})
+            })
+    
+    output.seek(0)
+    return output.getvalue()
+
+def build_submission_matrix(submissions, start_date, end_date, staff, holidays=None):
+    """
+    직원 × 영업일 일일 업무 제출 여부 행렬 생성
+    
+    주말과 holidays(YYYY-MM-DD 목록)를 제외한 영업일만 열로 만들고,
+    제출 건수 집계 결과를 한 번에 pivot합니다.
+    
+    Args:
+        submissions: date, name, count 컬럼의 DataFrame
+        staff: 행으로 표시할 직원 목록 (목록에 없는 작성자는 제외)
+    
+    Returns:
+        DataFrame: 작성자 × 날짜(YYYY-MM-DD) bool 행렬 (True = 제출)
+    """
+    business_days = pd.bdate_range(start_date, end_date, freq="C", holidays=list(holidays or []))
+    days = business_days.strftime("%Y-%m-%d")
+    
+    counts = submissions.pivot_table(index="name", columns="date", values="count", aggfunc="sum", fill_value=0)
+    matrix = counts.reindex(index=list(staff), columns=days, fill_value=0) > 0
+    matrix.index.name = "작성자"
+    matrix.columns.name = None
+    return matrix
+
+def summarize_submissions(matrix):
+    """직원별 제출일/미제출일/제출률 요약"""
+    business_days = matrix.shape[1]
+    submitted = matrix.sum(axis=1)
+    return pd.DataFrame({
+        "영업일": business_days,
+        "제출": submitted,
+        "미제출": business_days - submitted,
+        "제출률(%)": (submitted / business_days * 100).round(1) if business_days else 0.0
+    })
+
+def format_submission_matrix(matrix):
+    """제출 여부 행렬을 ✅/❌ 표시용 문자열 행렬로 변환"""
+    marks = np.where(matrix.to_numpy(), "✅", "❌")
+    return pd.DataFrame(marks, index=matrix.index, columns=matrix.columns)
+
+@metrics.timed(metrics.EXPORT_SECONDS, kind="submission_excel")
+def create_submission_excel(matrix):
+    """제출 현황(요약 + 날짜별 행렬)을 Excel 파일로 출력"""
+    output = io.BytesIO()
+    
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        summarize_submissions(matrix).to_excel(writer, sheet_name='요약')
+        format_submission_matrix(matrix).to_excel(writer, sheet_name='제출 현황')
+        
+        worksheet = writer.sheets['제출 현황']
+        worksheet.set_column(0, 0, 12)
+        worksheet.set_column(1, matrix.shape[1], 11)
+        worksheet.freeze_panes(1, 1)
+        writer.sheets['요약'].set_column(0, 4, 12)
+    
+    output.seek(0)
+    return output.getvalue()
+
+def _iso_week_label(date_text):
+    """YYYY-MM-DD 문자열을 ISO 주 라벨(YYYY-Www)로 변환"""
+    year, week, _ = datetime.strptime(date_text, "%Y-%m-%d").isocalendar()
+    return f"{year}-W{week:02d}"
+
+_INVALID_SHEET_CHARS = str.maketrans({c: "_" for c in '[]:*?/\\'})
+
+def _unique_sheet_name(name, used_names):
+    """
+    Excel 시트 이름 규칙에 맞게 변환 ([]:*?/\\ 제거, 31자 이하, 대소문자 무시 중복 시 ~2, ~3 ...)
+    
+    used_names(소문자 집합)에 결과를 추가합니다.
+    """
+    base = str(name).translate(_INVALID_SHEET_CHARS).strip("'")[:31] or "(없음)"
+    candidate, suffix = base, 2
+    while candidate.lower() in used_names:
+        tail = f"~{suffix}"
+        candidate = base[:31 - len(tail)] + tail
+        suffix += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+@metrics.timed(metrics.EXPORT_SECONDS, kind="daily_rollup")
+def create_daily_rollup(rows, group_by="name"):
+    """
+    기간 일일 업무를 한 번 순회하며 복사용 텍스트와 그룹별 시트 Excel 파일을 함께 생성
+    
+    rows는 그룹 순서대로 정렬되어 있어야 합니다
+    (group_by="name"이면 작성자·날짜 순, "week"이면 날짜·작성자 순).
+    
+    Args:
+        rows: (date, name, content) 튜플 이터러블 (db.iter_daily_works 결과)
+        group_by: "name"(작성자별 시트) 또는 "week"(ISO 주별 시트)
+    
+    Returns:
+        (text, excel_bytes, row_count)
+    """
+    import xlsxwriter
+    
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    header_format = workbook.add_format({'bold': True, 'fg_color': '#D7E4BC', 'border': 1})
+    wrap_format = workbook.add_format({'text_wrap': True, 'valign': 'top'})
+    
+    txt_lines = []
+    worksheet = None
+    current_group = None
+    current_heading = None
+    sheet_row = 0
+    row_count = 0
+    sheet_names = set()
+    
+    for date, name, content in rows:
+        group = name if group_by == "name" else _iso_week_label(date)
+        
+        # 그룹이 바뀌면 새 시트와 텍스트 구역 시작
+        if group != current_group:
+            current_group = group
+            current_heading = None
+            worksheet = workbook.add_worksheet(_unique_sheet_name(group, sheet_names))
+            worksheet.write_row(0, 0, ["날짜", "작성자", "업무 내용"], header_format)
+            worksheet.set_column(0, 0, 12)
+            worksheet.set_column(1, 1, 10)
+            worksheet.set_column(2, 2, 80)
+            worksheet.freeze_panes(1, 0)
+            sheet_row = 1
+            if txt_lines:
+                txt_lines.append("")
+            txt_lines.append(f"[{group}]" if group_by == "name" else f"■ {group}")
+        
+        heading = date if group_by == "name" else f"[{name}] {date}"
+        if heading != current_heading:
+            current_heading = heading
+            txt_lines.append(heading)
+        txt_lines.append(content)
+        
+        worksheet.write_string(sheet_row, 0, date)
+        worksheet.write_string(sheet_row, 1, name)
+        worksheet.write_string(sheet_row, 2, content, wrap_format)
+        sheet_row += 1
+        row_count += 1
+    
+    if worksheet is None:
+        workbook.add_worksheet("취합").write_string(0, 0, "해당 기간에 입력된 업무가 없습니다.")
+    workbook.close()
+    
+    return "\n".join(txt_lines), output.getvalue(), row_count
+
 def get_date_ymd(date_text):
     """날짜 문자열을 년-월-일 형식으로 반환"""
     try: